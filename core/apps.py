@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Keeps the DeveloperDailyActivity rollup in sync with single-row writes
+        from . import signals  # noqa: F401
+        from . import checks  # noqa: F401
+
+        # Production workers load the models before taking traffic; everything else
+        # (migrate, seed_data, tests) imports the ML stack only when it first scores
+        from django.conf import settings
+        if getattr(settings, 'TEAMPULSE_WARM_UP', False):
+            from .ml_services import warm_up
+            warm_up()
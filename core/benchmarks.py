@@ -0,0 +1,171 @@
+# core/benchmarks.py
+import math
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from io import StringIO
+
+import django
+from django.core.management import call_command
+from django.db import connection, reset_queries
+from django.conf import settings
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from core.models import Developer
+from core.ml_services import (
+    calculate_single_developer_features, calculate_productivity_features, calculate_collaboration_features,
+    new_inference_batcher, predict_unbatched, score_developers,
+)
+
+DEFAULT_SCALES = [10, 1000, 50000]
+DEFAULT_SAMPLES = 50  # Developers each per-developer benchmark is timed for
+TEAM_PAGE_SIZE = 100  # Developers scored per score_developers call (one /scores/ page)
+
+# seed_data densities matching what we see in production (per developer per day)
+SEED_OPTIONS = {
+    'days': 30,
+    'commits_per_day': 5.0,
+    'tickets_per_day': 0.35,
+    'messages_per_day': 6.0,
+}
+
+
+# (benchmark, model, features function) of the single-developer predictors
+PREDICTORS = [
+    ('get_burnout_risk', 'burnout', calculate_single_developer_features),
+    ('get_productivity_score', 'productivity', calculate_productivity_features),
+    ('get_collaboration_score', 'collaboration', calculate_collaboration_features),
+]
+
+
+def build_benchmarks():
+    """Returns [(name, setup, func)]: setup(developer_id) returns the args func is timed with."""
+    def developer(developer_id):
+        return (developer_id,)
+
+    def team(developer_id):
+        ids = list(Developer.objects.filter(id__gte=developer_id).order_by('id').values_list('id', flat=True)[:TEAM_PAGE_SIZE])
+        return (ids,)
+
+    benchmarks = [
+        ('calculate_single_developer_features', developer, calculate_single_developer_features),
+        ('calculate_productivity_features', developer, calculate_productivity_features),
+        ('calculate_collaboration_features', developer, calculate_collaboration_features),
+    ]
+    # The get_* predictors time the inference itself (as served with batching off), whatever
+    # TEAMPULSE_INFERENCE_BATCHING says; the [batched] variants add a lone caller's trip
+    # through an InferenceBatcher
+    for name, model, features in PREDICTORS:
+        setup = lambda pk, features=features: (features(pk),)
+        batcher = new_inference_batcher(model)
+        benchmarks += [
+            (name, setup, lambda row, model=model: predict_unbatched(model, row)),
+            (f'{name}[batched]', setup, batcher.predict),
+        ]
+    benchmarks.append((f'score_developers[{TEAM_PAGE_SIZE}]', team, score_developers))
+    return benchmarks
+
+
+def isolated_score_cache():
+    """Swaps the shared score cache for a local one: seeding invalidates every cached score,
+    which must not reach the live workers' cache.
+    """
+    alias = getattr(settings, 'TEAMPULSE_SCORE_CACHE', 'default')
+    return override_settings(CACHES={
+        **settings.CACHES,
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'teampulse-benchmark'},
+    })
+
+
+def seed(developers, seed_value, **options):
+    """Fills the current database with a synthetic data set of `developers` developers."""
+    call_command('seed_data', developers=developers, seed=seed_value, stdout=StringIO(), **{**SEED_OPTIONS, **options})
+    reset_queries()
+
+
+def measure(func, arg_sets):
+    """Times `func` once per argument tuple; returns wall-time, query and peak-memory statistics."""
+    func(*arg_sets[0])  # Warm up (model loading, connection setup)
+
+    timings = []
+    queries = []
+    for args in arg_sets:
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            func(*args)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context.captured_queries))
+
+    # Peak memory in a separate pass: tracing slows everything down and would skew timings
+    tracemalloc.start()
+    peaks = []
+    for args in arg_sets[:10]:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        'calls': len(timings),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[math.ceil(0.95 * len(timings)) - 1], 3),  # Nearest rank
+        'queries': max(queries),
+        'peak_kib': round(max(peaks) / 1024, 1),
+    }
+
+
+def run_scale(developers, samples=DEFAULT_SAMPLES, seed_value=0, log=None, **seed_options):
+    """Seeds a data set of the given size and runs every benchmark on it."""
+    started = time.perf_counter()
+    seed(developers, seed_value, **seed_options)
+    seeded_in = time.perf_counter() - started
+    if log:
+        log(f"Seeded {developers} developers in {seeded_in:.1f}s")
+
+    developer_ids = list(Developer.objects.order_by('id').values_list('id', flat=True))
+    sample_ids = random.Random(seed_value).sample(developer_ids, min(samples, len(developer_ids)))
+
+    results = {}
+    for name, setup, func in build_benchmarks():
+        results[name] = measure(func, [setup(pk) for pk in sample_ids])
+        if log:
+            log(f"  {name}: median {results[name]['median_ms']} ms, {results[name]['queries']} queries")
+    return {'seeded_in_s': round(seeded_in, 1), 'benchmarks': results}
+
+
+def environment():
+    return {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Compares two result files; returns a list of (scale, benchmark, metric, old, new) regressions.
+
+    Timings regress when the median is more than `threshold` (a fraction) slower than the
+    baseline; query counts regress on any increase.
+    """
+    regressions = []
+    for scale, run in results['scales'].items():
+        old_run = baseline.get('scales', {}).get(scale)
+        if old_run is None:
+            continue
+        for name, new in run['benchmarks'].items():
+            old = old_run['benchmarks'].get(name)
+            if old is None:
+                continue
+            if new['median_ms'] > old['median_ms'] * (1 + threshold):
+                regressions.append((scale, name, 'median_ms', old['median_ms'], new['median_ms']))
+            if new['queries'] > old['queries']:
+                regressions.append((scale, name, 'queries', old['queries'], new['queries']))
+    return regressions
@@ -0,0 +1,281 @@
+# core/bulk_ingest.py
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.ingest import DeveloperResolver
+from core.models import Commit, JiraTicket, ChatData
+from core.rollups import event_rollup_keys, event_developer_ids, refresh_for_keys
+from core.score_cache import invalidate_developers
+
+MAX_BATCH_SIZE = 10000  # Records accepted per request
+
+
+# --- Field validators: return the cleaned value or raise ValueError ---
+
+def string(max_length):
+    def clean(value):
+        if not isinstance(value, str):
+            raise ValueError('Must be a string.')
+        if len(value) > max_length:
+            raise ValueError(f'At most {max_length} characters.')
+        return value
+    return clean
+
+
+def text(value):
+    if not isinstance(value, str):
+        raise ValueError('Must be a string.')
+    return value
+
+
+def email(value):
+    value = string(254)(value)
+    if '@' not in value:
+        raise ValueError('Must be an email address.')
+    return value
+
+
+def integer(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('Must be an integer.')
+    return value
+
+
+def non_negative(value):
+    value = integer(value)
+    if value < 0:
+        raise ValueError('Must not be negative.')
+    return value
+
+
+def boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError('Must be true or false.')
+    return value
+
+
+def aware_datetime(value):
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise ValueError('Must be an ISO 8601 datetime.')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def decimal(max_digits, decimal_places):
+    limit = Decimal(10) ** (max_digits - decimal_places)
+
+    def clean(value):
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError('Must be a number.')
+        try:
+            number = Decimal(str(value)).quantize(Decimal(1).scaleb(-decimal_places))
+        except InvalidOperation:
+            raise ValueError('Must be a number.')
+        if abs(number) >= limit:
+            raise ValueError(f'Must be less than {limit}.')
+        return number
+    return clean
+
+
+def nullable(clean):
+    return lambda value: None if value is None else clean(value)
+
+
+# field -> (validator, required, default). Developer emails are resolved to IDs afterwards.
+SCHEMAS = {
+    'commits': {
+        'hash_id': (string(40), True, None),
+        'email': (email, True, None),
+        'name': (string(100), False, None),
+        'message': (text, False, ''),
+        'lines_added': (non_negative, False, 0),
+        'lines_removed': (non_negative, False, 0),
+        'timestamp': (aware_datetime, True, None),
+        'is_merge': (boolean, False, False),
+        'repository': (string(255), False, ''),
+    },
+    'tickets': {
+        'ticket_key': (string(20), True, None),
+        'title': (string(255), True, None),
+        'assignee_email': (nullable(email), False, None),
+        'assignee_name': (string(100), False, None),
+        'status': (string(50), True, None),
+        'story_points': (nullable(integer), False, None),
+        'created_at': (aware_datetime, True, None),
+        'closed_at': (nullable(aware_datetime), False, None),
+        'time_spent_hours': (decimal(5, 2), False, Decimal('0.00')),
+    },
+    'chat': {
+        'sender_email': (email, True, None),
+        'sender_name': (string(100), False, None),
+        'recipient_email': (nullable(email), False, None),
+        'recipient_name': (string(100), False, None),
+        'timestamp': (aware_datetime, True, None),
+        'message_length': (non_negative, False, 0),
+        'sentiment_score': (nullable(decimal(3, 2)), False, None),
+        'is_quick_response': (boolean, False, False),
+    },
+}
+
+
+def validate(schema, record):
+    """Returns (cleaned, errors) for one record; unknown fields are errors too."""
+    if not isinstance(record, dict):
+        return None, {'non_field_errors': ['Must be an object.']}
+
+    cleaned, errors = {}, {}
+    for field in record.keys() - schema.keys():
+        errors[field] = ['Unknown field.']
+    for field, (clean, required, default) in schema.items():
+        if field not in record:
+            if required:
+                errors[field] = ['This field is required.']
+            else:
+                cleaned[field] = default
+            continue
+        try:
+            cleaned[field] = clean(record[field])
+        except ValueError as e:
+            errors[field] = [str(e)]
+    return cleaned, errors
+
+
+def _developer_name(name, address):
+    return name or address.split('@')[0]
+
+
+class BatchResult:
+    """Collects one status entry per input record, in input order."""
+
+    def __init__(self, size):
+        self.results = [None] * size
+
+    def set(self, index, status, **details):
+        self.results[index] = {'index': index, 'status': status, **details}
+
+    def as_dict(self):
+        counts = {}
+        for result in self.results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+        return {'counts': counts, 'results': self.results}
+
+
+def ingest_batch(kind, records):
+    """Validates and upserts a batch of `kind` records; returns per-record statuses.
+
+    Invalid records are reported and skipped, valid ones are written together in one
+    transaction. Commits and tickets are upserted on hash_id/ticket_key (the last
+    occurrence in a batch wins); chat messages have no natural key and are always inserted.
+    """
+    schema = SCHEMAS[kind]
+    batch = BatchResult(len(records))
+    valid = []
+    for index, record in enumerate(records):
+        cleaned, errors = validate(schema, record)
+        if errors:
+            batch.set(index, 'error', errors=errors)
+        else:
+            valid.append((index, cleaned))
+
+    if valid:
+        writer = {'commits': _upsert_commits, 'tickets': _upsert_tickets, 'chat': _insert_messages}[kind]
+        with transaction.atomic():
+            touched_keys = writer(valid, batch, DeveloperResolver(preload=False))
+        # bulk_create bypasses the signals that keep the rollup current
+        refresh_for_keys(touched_keys)
+    return batch.as_dict()
+
+
+def _dedupe(valid, key, batch):
+    """Keeps the last record per natural key; earlier ones are reported as superseded."""
+    last = {}
+    for index, cleaned in valid:
+        if cleaned[key] in last:
+            batch.set(last[cleaned[key]][0], 'superseded', key=cleaned[key])
+        last[cleaned[key]] = (index, cleaned)
+    return list(last.values())
+
+
+def _upsert_commits(valid, batch, developers):
+    valid = _dedupe(valid, 'hash_id', batch)
+    developer_ids = developers.resolve({
+        cleaned['email']: _developer_name(cleaned['name'], cleaned['email']) for _, cleaned in valid
+    })
+
+    # Existing rows: tells created from updated, and which rollup days an update moves away from
+    existing = {commit.hash_id: commit for commit in Commit.objects.filter(
+        hash_id__in=[cleaned['hash_id'] for _, cleaned in valid]
+    ).only('hash_id', 'developer_id', 'timestamp')}
+    touched_keys = set().union(*(event_rollup_keys(commit) for commit in existing.values()))
+
+    commits = []
+    for index, cleaned in valid:
+        fields = {key: value for key, value in cleaned.items() if key not in ('email', 'name')}
+        commit = Commit(developer_id=developer_ids[cleaned['email']], **fields)
+        commits.append(commit)
+        touched_keys |= event_rollup_keys(commit)
+        batch.set(index, 'updated' if commit.hash_id in existing else 'created', key=commit.hash_id)
+
+    update_fields = ['developer', 'message', 'lines_added', 'lines_removed', 'timestamp', 'is_merge', 'repository']
+    Commit.objects.bulk_create(commits, update_conflicts=True, unique_fields=['hash_id'], update_fields=update_fields)
+    return touched_keys
+
+
+def _upsert_tickets(valid, batch, developers):
+    valid = _dedupe(valid, 'ticket_key', batch)
+    developer_ids = developers.resolve({
+        cleaned['assignee_email']: _developer_name(cleaned['assignee_name'], cleaned['assignee_email'])
+        for _, cleaned in valid if cleaned['assignee_email']
+    })
+
+    existing = {ticket.ticket_key: ticket for ticket in JiraTicket.objects.filter(
+        ticket_key__in=[cleaned['ticket_key'] for _, cleaned in valid]
+    ).only('ticket_key', 'assignee_id', 'status', 'closed_at')}
+    touched_keys = set().union(*(event_rollup_keys(ticket) for ticket in existing.values()))
+
+    tickets = []
+    for index, cleaned in valid:
+        fields = {key: value for key, value in cleaned.items() if key not in ('assignee_email', 'assignee_name')}
+        ticket = JiraTicket(assignee_id=developer_ids.get(cleaned['assignee_email']), **fields)
+        tickets.append(ticket)
+        touched_keys |= event_rollup_keys(ticket)
+        batch.set(index, 'updated' if ticket.ticket_key in existing else 'created', key=ticket.ticket_key)
+
+    update_fields = ['title', 'assignee', 'status', 'story_points', 'created_at', 'closed_at', 'time_spent_hours']
+    JiraTicket.objects.bulk_create(tickets, update_conflicts=True, unique_fields=['ticket_key'], update_fields=update_fields)
+
+    # Open tickets count towards the assignee's load without reaching the rollup
+    assignees = set().union(*(event_developer_ids(ticket) for ticket in [*existing.values(), *tickets]))
+    transaction.on_commit(lambda: invalidate_developers(assignees))
+    return touched_keys
+
+
+def _insert_messages(valid, batch, developers):
+    names_by_email = {}
+    for _, cleaned in valid:
+        names_by_email[cleaned['sender_email']] = _developer_name(cleaned['sender_name'], cleaned['sender_email'])
+        if cleaned['recipient_email']:
+            names_by_email.setdefault(
+                cleaned['recipient_email'], _developer_name(cleaned['recipient_name'], cleaned['recipient_email'])
+            )
+    developer_ids = developers.resolve(names_by_email)
+
+    messages = []
+    touched_keys = set()
+    for _, cleaned in valid:
+        fields = {key: value for key, value in cleaned.items() if not key.startswith(('sender_', 'recipient_'))}
+        message = ChatData(
+            sender_id=developer_ids[cleaned['sender_email']],
+            recipient_id=developer_ids.get(cleaned['recipient_email']),
+            **fields,
+        )
+        messages.append(message)
+        touched_keys |= event_rollup_keys(message)
+
+    ChatData.objects.bulk_create(messages)
+    for (index, _), message in zip(valid, messages):
+        batch.set(index, 'created', id=message.pk)
+    return touched_keys
@@ -0,0 +1,22 @@
+# core/checks.py
+import os
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+
+@register()
+def check_score_cache_is_shared(app_configs, **kwargs):
+    """Score invalidations only reach the worker processes that share the score cache."""
+    alias = getattr(settings, 'TEAMPULSE_SCORE_CACHE', 'default')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    workers = os.environ.get('WEB_CONCURRENCY', '')
+    if backend.endswith('.LocMemCache') and workers.isdigit() and int(workers) > 1:
+        return [Error(
+            f"The '{alias}' cache is a per-process LocMemCache, but WEB_CONCURRENCY runs {workers} workers: "
+            "a score invalidated in one worker would stay cached in the others.",
+            hint='Use a shared backend (FileBasedCache on one host, RedisCache across hosts).',
+            obj='CACHES',
+            id='core.E001',
+        )]
+    return []
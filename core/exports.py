@@ -0,0 +1,132 @@
+# core/exports.py
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core.models import Commit, JiraTicket, ChatData
+
+ITERATOR_CHUNK_SIZE = 2000  # Rows fetched from the database at a time
+LINES_PER_WRITE = 500  # Rows encoded into each chunk handed to the response/file
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# kind -> (queryset, time column filtered and ordered on, developer column, exported columns)
+EXPORTS = {
+    'commits': (
+        Commit.objects.annotate(developer_name=F('developer__name')),
+        'timestamp',
+        'developer_id',
+        ['id', 'developer_id', 'developer_name', 'hash_id', 'message', 'lines_added', 'lines_removed',
+         'timestamp', 'is_merge', 'repository', 'ticket_id'],
+    ),
+    'tickets': (
+        JiraTicket.objects.annotate(assignee_name=F('assignee__name')),
+        'created_at',
+        'assignee_id',
+        ['id', 'ticket_key', 'title', 'assignee_id', 'assignee_name', 'status', 'story_points',
+         'created_at', 'closed_at', 'time_spent_hours'],
+    ),
+    'chat': (
+        ChatData.objects.annotate(sender_name=F('sender__name')),
+        'timestamp',
+        'sender_id',
+        ['id', 'sender_id', 'sender_name', 'recipient_id', 'timestamp', 'message_length',
+         'sentiment_score', 'is_quick_response'],
+    ),
+}
+
+
+def parse_time_bound(value):
+    """Parses an ISO date or datetime query value into an aware datetime (dates mean midnight).
+
+    Raises ValueError for anything else.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"'{value}' is not an ISO date or datetime.")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def export_rows(kind, since=None, until=None, developer_id=None):
+    """Returns (columns, rows): rows streams dicts for `kind` in time order with constant memory.
+
+    `since` is inclusive, `until` exclusive; `developer_id` filters on the commit author,
+    ticket assignee or message sender.
+    """
+    queryset, time_field, developer_field, columns = EXPORTS[kind]
+    if since is not None:
+        queryset = queryset.filter(**{f'{time_field}__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{f'{time_field}__lt': until})
+    if developer_id is not None:
+        queryset = queryset.filter(**{developer_field: developer_id})
+
+    rows = queryset.order_by(time_field, 'id').values(*columns).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    return columns, rows
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= LINES_PER_WRITE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+class _Echo:
+    """A file-like object whose write() returns the line instead of storing it (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def encode_ndjson(columns, rows):
+    """Yields NDJSON text chunks (one JSON object per line)."""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    return _batched(encoder.encode(row) + '\n' for row in rows)
+
+
+def encode_csv(columns, rows):
+    """Yields CSV text chunks, starting with a header row."""
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([_csv_value(row[column]) for column in columns])
+
+    return _batched(lines())
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+ENCODERS = {
+    'ndjson': encode_ndjson,
+    'csv': encode_csv,
+}
+
+
+def stream_export(kind, fmt, **filters):
+    """Yields the export of `kind` in format `fmt` as text chunks."""
+    columns, rows = export_rows(kind, **filters)
+    return ENCODERS[fmt](columns, rows)
@@ -0,0 +1,184 @@
+# core/feature_cache.py
+"""On-disk cache of the feature matrix, as memory-mappable .npy files.
+
+An entry is keyed by the analysis window and the watermark (highest id) of the commits
+and chat messages it includes. Both are treated as append-only: if the rows up to the
+stored watermark still add up to the same count and checksums, only the events past it
+are read and added to the stored per-developer totals. Tickets change state, so their
+(few) totals are always recomputed. A new window, or edited or deleted events, rebuild
+the entry from scratch; so does `rebuild=True`, for edits the checksums cannot see.
+
+Entries are written to a temporary directory and renamed into place, and `current.json`
+is replaced atomically to point at the newest one, so readers never see a partial entry.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db.models import Count, F, Max, Sum
+
+from core.feature_matrix import (
+    ALL_FEATURES, COMMIT_TOTALS, CHAT_TOTALS, commit_totals, chat_totals, ticket_totals,
+    developer_index, features_from_totals_frame, window_start,
+)
+from core.models import Commit, ChatData
+
+CACHE_DIR = str(getattr(settings, 'TEAMPULSE_FEATURE_CACHE_DIR', os.path.join(settings.BASE_DIR, 'var', 'feature_cache')))
+POINTER = 'current.json'
+KEEP_ENTRIES = 2  # Older entries are removed (readers that still map them keep their data)
+
+# Append-only sources: name -> (model, totals function, totals columns, checksum aggregates).
+# The checksums catch deleted rows and the edits that matter most (re-assigned authors,
+# corrected line counts and sentiment).
+APPEND_ONLY = {
+    'commits': (Commit, commit_totals, COMMIT_TOTALS, {
+        'rows': Count('id'),
+        'developers': Sum('developer_id'),
+        'lines': Sum(F('lines_added') + F('lines_removed')),
+    }),
+    'chat': (ChatData, chat_totals, CHAT_TOTALS, {
+        'rows': Count('id'),
+        'senders': Sum('sender_id'),
+        'recipients': Sum('recipient_id'),
+        'sentiment': Sum('sentiment_score'),
+    }),
+}
+
+
+def _checksum(model, checksums, since, max_id):
+    values = model.objects.filter(timestamp__gte=since, id__lte=max_id).aggregate(**checksums)
+    # Decimals and None as strings, so they compare exactly after a JSON round trip
+    return {key: str(value) for key, value in values.items()}
+
+
+def _entry_path(name):
+    return os.path.join(CACHE_DIR, name)
+
+
+def current_entry():
+    """Returns (entry path, meta) of the newest entry, or (None, None)."""
+    try:
+        with open(os.path.join(CACHE_DIR, POINTER)) as f:
+            name = json.load(f)['entry']
+        with open(os.path.join(_entry_path(name), 'meta.json')) as f:
+            return _entry_path(name), json.load(f)
+    except (FileNotFoundError, KeyError, ValueError):
+        return None, None
+
+
+def _load_totals(path, source, index):
+    stored = np.load(os.path.join(path, f'{source}_totals.npy'))
+    ids = np.load(os.path.join(path, 'developer_ids.npy'))
+    return pd.DataFrame(stored, index=ids, columns=APPEND_ONLY[source][2]).reindex(index).fillna(0)
+
+
+def update_feature_cache(start_day=None, rebuild=False):
+    """Brings the cache up to date; returns (entry path, 'hit' | 'incremental' | 'rebuilt')."""
+    since = window_start(start_day)
+    path, meta = current_entry()
+    # Incremental only within the same window, and only if nothing up to the watermarks changed
+    incremental = not rebuild and meta is not None and meta['window_start'] == since.isoformat() and all(
+        _checksum(model, aggregates, since, meta['sources'][source]['max_id']) == meta['sources'][source]['checksum']
+        for source, (model, _, _, aggregates) in APPEND_ONLY.items()
+    )
+
+    index = developer_index()
+    watermarks, checksums, totals = {}, {}, {}
+    for source, (model, compute, _, aggregates) in APPEND_ONLY.items():
+        watermarks[source] = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        rows = model.objects.filter(timestamp__gte=since, id__lte=watermarks[source])
+        if incremental:
+            rows = rows.filter(id__gt=meta['sources'][source]['max_id'])
+        totals[source] = compute(rows).reindex(index).fillna(0)
+        if incremental:
+            totals[source] += _load_totals(path, source, index)
+        checksums[source] = _checksum(model, aggregates, since, watermarks[source])
+    tickets = ticket_totals(since).reindex(index).fillna(0)
+
+    if incremental and all(watermarks[source] == meta['sources'][source]['max_id'] for source in APPEND_ONLY):
+        stored_ids = np.load(os.path.join(path, 'developer_ids.npy'))
+        stored_tickets = np.load(os.path.join(path, 'ticket_totals.npy'))
+        if np.array_equal(stored_ids, index.to_numpy()) and np.array_equal(stored_tickets, tickets.to_numpy(dtype=float)):
+            return path, 'hit'
+
+    features = features_from_totals_frame(pd.concat([totals['commits'], tickets, totals['chat']], axis=1))
+    arrays = {
+        'developer_ids': index.to_numpy(dtype=np.int64),
+        'commits_totals': totals['commits'].to_numpy(dtype=float),
+        'chat_totals': totals['chat'].to_numpy(dtype=float),
+        'ticket_totals': tickets.to_numpy(dtype=float),
+        'features': features.to_numpy(dtype=float),
+    }
+    meta = {
+        'window_start': since.isoformat(),
+        'columns': ALL_FEATURES,
+        'sources': {
+            source: {'max_id': watermarks[source], 'checksum': checksums[source]} for source in APPEND_ONLY
+        },
+    }
+    name = f"{since.date().isoformat()}-c{watermarks['commits']}-m{watermarks['chat']}"
+    return _write_entry(name, arrays, meta), 'incremental' if incremental else 'rebuilt'
+
+
+def _write_entry(name, arrays, meta):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=CACHE_DIR, prefix=f'.{name}.')
+    for key, array in arrays.items():
+        np.save(os.path.join(temp_dir, f'{key}.npy'), array)
+    with open(os.path.join(temp_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.chmod(temp_dir, 0o755)
+
+    path = _entry_path(name)
+    try:
+        os.rename(temp_dir, path)
+    except OSError:
+        # Same key already built (by another process, or before a ticket-only change): replace it
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(temp_dir, path)
+
+    handle, pointer = tempfile.mkstemp(dir=CACHE_DIR, prefix='.current.')
+    with os.fdopen(handle, 'w') as f:
+        json.dump({'entry': name}, f)
+    os.chmod(pointer, 0o644)
+    os.replace(pointer, os.path.join(CACHE_DIR, POINTER))
+    _prune(keep=name)
+    return path
+
+
+def _prune(keep):
+    entries = sorted(
+        (entry for entry in os.scandir(CACHE_DIR) if entry.is_dir() and not entry.name.startswith('.')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    for entry in [entry for entry in entries if entry.name != keep][KEEP_ENTRIES - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def load_entry(path):
+    """Returns an entry's feature matrix (as build_feature_matrix() does), backed by its memory map.
+
+    The values are read-only and shared with every other process mapping the same entry.
+    """
+    developer_ids = np.load(os.path.join(path, 'developer_ids.npy'))
+    return pd.DataFrame(load_features(path), index=pd.Index(developer_ids, name='developer_id'), columns=ALL_FEATURES, copy=False)
+
+
+def load_features(path):
+    """Returns an entry's feature values (columns ALL_FEATURES) as a read-only np.memmap."""
+    return np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+
+
+def open_feature_matrix(start_day=None, refresh=True, rebuild=False):
+    """Returns the cached feature matrix, bringing the cache up to date first.
+
+    With refresh=False the newest entry is used as-is (building one only if there is none).
+    """
+    path, _ = current_entry()
+    if refresh or rebuild or path is None:
+        path, _ = update_feature_cache(start_day, rebuild=rebuild)
+    return load_entry(path)
@@ -0,0 +1,135 @@
+# core/feature_matrix.py
+"""Builds every feature of every developer at once, for training.
+
+The raw events are read with a handful of values_list() queries streamed through
+.iterator() and aggregated with grouped pandas operations, so the cost grows with the
+number of events rather than developers x queries. The window and the work-hour rules
+are the ones the live features use (see core.ml_services and core.rollups), so a model
+is trained on exactly what it is later scored on.
+
+Features are ratios, so the work is split into per-developer *totals* (which add up,
+and can therefore be updated incrementally, see core.feature_cache) and
+features_from_totals_frame(), which turns them into features.
+"""
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+from django.utils.timezone import make_aware
+
+from core.ml_services import (
+    TIMEZONE, START_HOUR, END_HOUR, WEEKENDS, CLOSED_STATUSES, analysis_start_day,
+    BURNOUT_FEATURES, PRODUCTIVITY_FEATURES, COLLABORATION_FEATURES,
+)
+from core.models import Developer, Commit, JiraTicket, ChatData
+
+ITERATOR_CHUNK_SIZE = 5000  # Rows fetched from the database at a time
+ALL_FEATURES = BURNOUT_FEATURES + PRODUCTIVITY_FEATURES + COLLABORATION_FEATURES
+
+COMMIT_TOTALS = ['total_commits', 'after_hours_commits', 'weekend_commits', 'total_lines_changed']
+TICKET_TOTALS = ['tickets_closed', 'high_value_tickets_closed', 'closed_ticket_hours', 'open_tickets']
+CHAT_TOTALS = ['sentiment_sum', 'sentiment_count', 'messages_received', 'quick_responses_received']
+
+
+def _read(queryset, columns):
+    """Streams `columns` of a queryset into a DataFrame."""
+    rows = queryset.values_list(*columns).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, or 0 where the denominator is 0 (as in features_from_totals)."""
+    return (numerator / denominator.where(denominator > 0)).fillna(0.0)
+
+
+def window_start(start_day=None):
+    """First instant of the analysis window: midnight (in TIMEZONE) of its first day."""
+    return make_aware(datetime.combine(start_day or analysis_start_day(), time.min), TIMEZONE)
+
+
+def developer_index():
+    return pd.Index(list(Developer.objects.order_by('id').values_list('id', flat=True)), name='developer_id')
+
+
+def commit_totals(commits):
+    """Per-author COMMIT_TOTALS of a Commit queryset: volume and work-hour distribution."""
+    commits = _read(commits, ['developer_id', 'timestamp', 'lines_added', 'lines_removed'])
+    local_time = pd.to_datetime(commits['timestamp'], utc=True).dt.tz_convert(TIMEZONE.key)
+    commits['after_hours'] = (local_time.dt.hour < START_HOUR) | (local_time.dt.hour >= END_HOUR)
+    commits['weekend'] = local_time.dt.weekday.isin(WEEKENDS)
+    commits['lines_changed'] = commits['lines_added'] + commits['lines_removed']
+    by_author = commits.groupby('developer_id')
+    return pd.DataFrame({
+        'total_commits': by_author.size(),
+        'after_hours_commits': by_author['after_hours'].sum(),
+        'weekend_commits': by_author['weekend'].sum(),
+        'total_lines_changed': by_author['lines_changed'].sum(),
+    }, columns=COMMIT_TOTALS)
+
+
+def ticket_totals(since):
+    """Per-assignee TICKET_TOTALS: tickets closed since `since`, and tickets open right now."""
+    closed = _read(
+        JiraTicket.objects.filter(status__in=CLOSED_STATUSES, assignee__isnull=False, closed_at__gte=since),
+        ['assignee_id', 'story_points', 'time_spent_hours'],
+    )
+    closed['high_value'] = closed['story_points'] > 5
+    closed['hours'] = closed['time_spent_hours'].astype(float)
+    by_assignee = closed.groupby('assignee_id')
+
+    open_tickets = _read(
+        JiraTicket.objects.filter(assignee__isnull=False).exclude(status__in=CLOSED_STATUSES), ['assignee_id'],
+    )
+    return pd.DataFrame({
+        'tickets_closed': by_assignee.size(),
+        'high_value_tickets_closed': by_assignee['high_value'].sum(),
+        'closed_ticket_hours': by_assignee['hours'].sum(),
+        'open_tickets': open_tickets.groupby('assignee_id').size(),
+    }, columns=TICKET_TOTALS)
+
+
+def chat_totals(messages):
+    """Per-developer CHAT_TOTALS of a ChatData queryset: sentiment of sent messages,
+    quick responses among received ones.
+    """
+    messages = _read(messages, ['sender_id', 'recipient_id', 'sentiment_score', 'is_quick_response'])
+    messages['sentiment'] = messages['sentiment_score'].astype(float)
+    by_sender = messages.groupby('sender_id')['sentiment']
+    by_recipient = messages.dropna(subset=['recipient_id']).groupby('recipient_id')['is_quick_response']
+    return pd.DataFrame({
+        'sentiment_sum': by_sender.sum(),
+        'sentiment_count': by_sender.count(),
+        'messages_received': by_recipient.size().rename(index=int),
+        'quick_responses_received': by_recipient.sum().rename(index=int),
+    }, columns=CHAT_TOTALS)
+
+
+def features_from_totals_frame(totals):
+    """Vectorized features_from_totals(): one row of ALL_FEATURES per row of totals."""
+    totals = totals.fillna(0)
+    features = pd.DataFrame({
+        'after_hours_ratio': _ratio(totals['after_hours_commits'], totals['total_commits']),
+        'weekend_ratio': _ratio(totals['weekend_commits'], totals['total_commits']),
+        'open_tickets': totals['open_tickets'].astype(np.int64),
+        'avg_time_spent': _ratio(totals['closed_ticket_hours'], totals['tickets_closed']),
+        'total_lines_changed': totals['total_lines_changed'].astype(np.int64),
+        'high_value_tickets_closed': totals['high_value_tickets_closed'].astype(np.int64),
+        'avg_sentiment': _ratio(totals['sentiment_sum'], totals['sentiment_count']),
+        'response_ratio': _ratio(totals['quick_responses_received'], totals['messages_received']),
+    }, index=totals.index)
+    return features[ALL_FEATURES]
+
+
+def build_feature_matrix(start_day=None):
+    """Returns a DataFrame of every developer's features (index developer_id, columns ALL_FEATURES).
+
+    Events count from the first day of the analysis window (in TIMEZONE), exactly like the
+    daily rollup the live features read; open tickets are counted regardless of the window.
+    """
+    since = window_start(start_day)
+    totals = pd.concat([
+        commit_totals(Commit.objects.filter(timestamp__gte=since)),
+        ticket_totals(since),
+        chat_totals(ChatData.objects.filter(timestamp__gte=since)),
+    ], axis=1).reindex(developer_index())
+    return features_from_totals_frame(totals)
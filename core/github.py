@@ -0,0 +1,231 @@
+# core/github.py
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_URL = 'https://api.github.com'
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30  # seconds
+PER_PAGE = 100  # GitHub's maximum page size
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds, doubled on every retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+LINK_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+def parse_link_header(value):
+    """Parses an RFC 5988 Link header into {rel: url}."""
+    return {rel: url for url, rel in LINK_PATTERN.findall(value or '')}
+
+
+def _with_page(url, page):
+    """Returns `url` with its `page` query parameter set to `page`."""
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query['page'] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def _page_number(url):
+    try:
+        return int(parse_qs(urlparse(url).query)['page'][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+class RateLimitScheduler:
+    """Paces requests from many threads using GitHub's X-RateLimit-* response headers.
+
+    While plenty of quota is left, requests go out immediately. Below `pace_below`
+    remaining requests, they are spread evenly over the time left until the window
+    resets (keeping `reserve` requests back), and once the quota is spent every
+    caller waits for the reset.
+    """
+
+    def __init__(self, pace_below=500, reserve=10):
+        self.pace_below = pace_below
+        self.reserve = reserve
+        self.remaining = None
+        self.reset_at = None
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Blocks until the calling thread may send its next request."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None or self.reset_at is None or now >= self.reset_at:
+                return
+            if self.remaining >= self.pace_below:
+                return
+
+            budget = self.remaining - self.reserve
+            if budget <= 0:
+                slot = self.reset_at
+            else:
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + (self.reset_at - now) / budget
+                self.remaining -= 1  # Count our own request until the response tells us better
+        if slot > now:
+            time.sleep(slot - now)
+
+    def update(self, response):
+        """Records the quota reported by a response."""
+        try:
+            remaining = int(response.headers['X-RateLimit-Remaining'])
+            reset_at = float(response.headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        with self._lock:
+            if self.reset_at is None or reset_at > self.reset_at:
+                # A new window started
+                self.reset_at = reset_at
+                self.remaining = remaining
+                self._next_slot = 0.0
+            elif reset_at == self.reset_at:
+                # Responses arrive out of order from several threads: the lowest count is the latest
+                self.remaining = min(self.remaining, remaining)
+
+    @staticmethod
+    def is_rate_limited(response):
+        return response.status_code in (403, 429) and response.headers.get('X-RateLimit-Remaining') == '0'
+
+
+class GitHubClient:
+    """A small GitHub REST client with a pooled, thread-safe session.
+
+    Every request goes through a shared RateLimitScheduler and is retried with exponential
+    backoff on connection errors, 5xx responses and rate limiting.
+    `api_url` can point at any server speaking the same protocol (e.g. a local stub in tests).
+    """
+
+    def __init__(self, token=None, api_url=GITHUB_API_URL, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE):
+        self.api_url = api_url.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.rate_limiter = RateLimitScheduler()
+
+        self.session = requests.Session()
+        # One pooled keep-alive connection per worker thread
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept'] = 'application/vnd.github.v3+json'
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+    def close(self):
+        self.session.close()
+
+    def get(self, url, params=None, headers=None):
+        """GETs an absolute URL or an API path, retrying transient failures.
+
+        Raises for 4xx/5xx responses once retries are exhausted.
+        """
+        if not url.startswith(('http://', 'https://')):
+            url = f'{self.api_url}/{url.lstrip("/")}'
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._backoff(attempt)
+                continue
+
+            self.rate_limiter.update(response)
+            if attempt < self.max_retries:
+                if self.rate_limiter.is_rate_limited(response):
+                    # The scheduler now holds everyone back until the window resets
+                    logger.warning('GitHub rate limit reached; waiting for the reset.')
+                    continue
+                if response.status_code in RETRY_STATUSES:
+                    self._backoff(attempt, response.headers.get('Retry-After'))
+                    continue
+
+            response.raise_for_status()
+            return response
+
+    def _backoff(self, attempt, retry_after=None):
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff_base * 2 ** attempt
+            delay += random.uniform(0, delay / 2)  # Jitter so threads don't retry in lockstep
+        time.sleep(delay)
+
+    def open_listing(self, path, params=None, etag=None):
+        """Fetches the first page of a paginated listing, conditionally if `etag` is given.
+
+        Returns (first_response, pages): `pages` yields the JSON body of every page in order
+        (nothing at all when the server answered 304 Not Modified).
+
+        If the first page's Link header names the last page, the remaining pages are fetched
+        concurrently (at most `max_workers * 2` in flight, so memory stays bounded); otherwise
+        `rel="next"` links are followed one by one.
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        first = self.get(path, params=params, headers=headers)
+        if first.status_code == 304:
+            return first, iter(())
+        return first, self._iter_pages_after(first)
+
+    def iter_pages(self, path, params=None):
+        """Yields the JSON body of every page of a paginated listing, in order."""
+        _, pages = self.open_listing(path, params=params)
+        yield from pages
+
+    def _iter_pages_after(self, first):
+        yield first.json()
+
+        links = parse_link_header(first.headers.get('Link'))
+        last_page = _page_number(links['last']) if 'last' in links else None
+
+        if last_page is None:
+            next_url = links.get('next')
+            while next_url:
+                response = self.get(next_url)
+                yield response.json()
+                next_url = parse_link_header(response.headers.get('Link')).get('next')
+            return
+
+        page_urls = (_with_page(links['last'], page) for page in range(2, last_page + 1))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = deque()
+            for url in page_urls:
+                in_flight.append(executor.submit(self.get, url))
+                if len(in_flight) >= self.max_workers * 2:
+                    yield in_flight.popleft().result().json()
+            while in_flight:
+                yield in_flight.popleft().result().json()
+
+    def list_commits(self, owner, repo, since=None, etag=None):
+        """Lists GET /repos/{owner}/{repo}/commits (newest first).
+
+        Returns (first_response, commits) where `commits` iterates commit objects across all pages.
+        """
+        params = {'per_page': PER_PAGE}
+        if since is not None:
+            params['since'] = since
+        first, pages = self.open_listing(f'repos/{owner}/{repo}/commits', params=params, etag=etag)
+        return first, (commit for page in pages for commit in page)
+
+    def get_commit(self, owner, repo, sha):
+        """Returns GET /repos/{owner}/{repo}/commits/{sha} (includes `stats`)."""
+        return self.get(f'repos/{owner}/{repo}/commits/{sha}').json()
@@ -0,0 +1,97 @@
+# core/gitlog.py
+import os
+import subprocess
+import tempfile
+from collections import namedtuple
+from datetime import datetime
+
+# Each commit header starts with a record separator; fields are split by unit separators
+RECORD_START = '\x1e'
+FIELD_SEP = '\x1f'
+LOG_FORMAT = RECORD_START + FIELD_SEP.join(['%H', '%P', '%an', '%ae', '%aI', '%s'])
+
+GitCommit = namedtuple('GitCommit', ['sha', 'parents', 'name', 'email', 'timestamp', 'message', 'lines_added', 'lines_removed'])
+
+
+class GitError(Exception):
+    pass
+
+
+def parse_git_log(lines):
+    """Parses `git log --numstat --format=LOG_FORMAT` output line by line into GitCommit tuples.
+
+    Only the commit being parsed is held in memory, so any amount of history streams through.
+    Binary files ('-' in the numstat columns) count as zero lines.
+    """
+    header = None
+    added = removed = 0
+
+    def build():
+        sha, parents, name, email, date, message = header
+        return GitCommit(sha, parents.split(), name, email, datetime.fromisoformat(date), message, added, removed)
+
+    for line in lines:
+        line = line.rstrip('\n')
+        if line.startswith(RECORD_START):
+            if header is not None:
+                yield build()
+            header = line[1:].split(FIELD_SEP, 5)
+            added = removed = 0
+        elif line and header is not None:
+            plus, minus, _ = line.split('\t', 2)
+            added += int(plus) if plus != '-' else 0
+            removed += int(minus) if minus != '-' else 0
+    if header is not None:
+        yield build()
+
+
+def _git(path, *args):
+    result = subprocess.run(['git', '-C', path, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"git {args[0]} failed in {path}")
+    return result.stdout.strip()
+
+
+def is_ancestor(path, sha, head):
+    return subprocess.run(['git', '-C', path, 'merge-base', '--is-ancestor', sha, head], capture_output=True).returncode == 0
+
+
+def iter_git_log(path, revisions, since=None):
+    """Streams GitCommit tuples for `revisions` (newest first) from the repository at `path`."""
+    args = ['git', '-C', path, 'log', '--numstat', f'--format={LOG_FORMAT}']
+    if since is not None:
+        args.append(f'--since={since.isoformat()}')
+    args += [*revisions, '--']
+
+    # stderr goes to a file: a pipe nobody reads until stdout ends would block git (and us)
+    # as soon as it filled up with warnings
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8', errors='replace') as stderr:
+        process = subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=stderr, text=True, encoding='utf-8', errors='replace',
+        )
+        try:
+            yield from parse_git_log(process.stdout)
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+            stderr.seek(0)
+            if returncode != 0:
+                raise GitError(stderr.read().strip() or f"git log failed in {path}")
+
+
+def head_commit(path, rev='HEAD'):
+    return _git(path, 'rev-parse', '--verify', f'{rev}^{{commit}}')
+
+
+def commit_time(path, sha):
+    """Returns the committer date of `sha` as an aware datetime."""
+    return datetime.fromisoformat(_git(path, 'show', '-s', '--format=%cI', sha))
+
+
+# --- Process pool entry points ---
+# This module deliberately imports nothing from Django at the top, so spawned (not forked)
+# workers can unpickle these functions before django.setup() has run (see core.processes).
+
+def ingest_worker(path, options):
+    from core.ingest import ingest_repository
+    return ingest_repository(path, **options)
@@ -0,0 +1,91 @@
+# core/inference_batcher.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from core.metrics import INFERENCE_BATCH_SIZE
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.005  # seconds
+
+
+class InferenceBatcher:
+    """Coalesces concurrent single-row predictions into one vectorized call.
+
+    submit() queues a row and returns a Future. A worker thread takes the first waiting row;
+    if other rows are already queued behind it, it keeps collecting for up to `max_wait`
+    seconds (or until `max_batch_size` rows), otherwise it predicts right away, so a lone
+    caller is never held back. It then calls `predict_many(rows)` once and resolves each
+    caller's Future with its own (result, status) pair. Rows that arrive while a batch is
+    running queue up for the next one, so the latency added to any request is bounded by
+    `max_wait` plus one batch.
+
+    `predict_many` follows the get_*_scores() convention: (list of results, 200) or
+    (error, status_code), an error being handed to every caller of the batch.
+    """
+
+    def __init__(self, name, predict_many, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT):
+        self.name = name
+        self.predict_many = predict_many
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def submit(self, row):
+        """Queues one row for prediction; the Future resolves to (result, status_code)."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def predict(self, row):
+        """Blocking submit(): returns (result, status_code)."""
+        return self.submit(row).result()
+
+    def _ensure_worker(self):
+        # Started lazily, and again in a forked child (threads do not survive fork)
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                threading.Thread(target=self._run, name=f'inference-batcher-{self.name}', daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        if self._queue.empty():
+            return batch  # Nobody to batch with: waiting would only add latency
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            rows = [row for row, _ in batch]
+            INFERENCE_BATCH_SIZE.observe(len(rows), model=self.name)
+            try:
+                results, status_code = self.predict_many(rows)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            if status_code != 200:
+                for _, future in batch:
+                    future.set_result((results, status_code))
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result((result, status_code))
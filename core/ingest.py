@@ -0,0 +1,239 @@
+# core/ingest.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import transaction
+
+from core.gitlog import GitError, commit_time, head_commit, is_ancestor, iter_git_log
+from core.models import Developer, Commit, SyncState
+from core.rollups import activity_day, refresh_for_keys
+
+DEFAULT_BATCH_SIZE = 1000
+STATS_CHUNK_SIZE = 200  # Pending commits handed to the worker pool (and saved) at a time
+
+logger = logging.getLogger(__name__)
+
+
+class DeveloperResolver:
+    """Maps author emails to Developer IDs, creating missing developers in bulk.
+
+    By default all known developers are loaded once up front, so resolving a batch costs at
+    most one INSERT and one SELECT for the emails seen for the first time. With
+    preload=False (short-lived resolvers, e.g. one per API request) each batch instead
+    looks up just its own unknown emails with one SELECT.
+    """
+
+    def __init__(self, preload=True):
+        self.ids_by_email = dict(Developer.objects.values_list('email', 'id')) if preload else {}
+        self.preload = preload
+        self.created = 0
+
+    def resolve(self, names_by_email):
+        """Returns {email: developer_id} for every email in `names_by_email` ({email: name})."""
+        missing = {email: name for email, name in names_by_email.items() if email not in self.ids_by_email}
+        if missing and not self.preload:
+            known = dict(Developer.objects.filter(email__in=list(missing)).values_list('email', 'id'))
+            self.ids_by_email.update(known)
+            missing = {email: name for email, name in missing.items() if email not in known}
+        if missing:
+            Developer.objects.bulk_create(
+                [Developer(email=email, name=name[:100]) for email, name in missing.items()],
+                ignore_conflicts=True,
+            )
+            new_ids = dict(Developer.objects.filter(email__in=list(missing)).values_list('email', 'id'))
+            self.ids_by_email.update(new_ids)
+            self.created += len(new_ids)
+        return {email: self.ids_by_email[email] for email in names_by_email}
+
+
+class CommitWriter:
+    """Buffers commits and writes them with bulk_create(ignore_conflicts=True) in batches.
+
+    Commits whose hash is already stored are skipped (checked once per batch against the
+    unique hash index). The DeveloperDailyActivity rollup is refreshed once, on close(),
+    for every developer-day that received new commits.
+
+        with CommitWriter() as writer:
+            writer.add(email=..., name=..., hash_id=..., timestamp=..., message=...)
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, developers=None):
+        self.batch_size = batch_size
+        self.developers = developers or DeveloperResolver()
+        self.created = 0
+        self.skipped = 0
+        self._buffer = []
+        self._touched_keys = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep what was already written consistent with the rollup
+            self._refresh_rollup()
+
+    def add(self, *, email, name, hash_id, timestamp, message='', lines_added=0, lines_removed=0, is_merge=False, **extra):
+        self._buffer.append({
+            'email': email,
+            'name': name,
+            'hash_id': hash_id,
+            'message': message,
+            'lines_added': lines_added,
+            'lines_removed': lines_removed,
+            'timestamp': timestamp,
+            'is_merge': is_merge,
+            **extra,
+        })
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+
+        # Drop commits we already have (and duplicates within the batch)
+        known_hashes = set(
+            Commit.objects.filter(hash_id__in=[row['hash_id'] for row in batch]).values_list('hash_id', flat=True)
+        )
+        new_rows = {}
+        for row in batch:
+            if row['hash_id'] not in known_hashes:
+                new_rows.setdefault(row['hash_id'], row)
+        self.skipped += len(batch) - len(new_rows)
+        if not new_rows:
+            return
+
+        developer_ids = self.developers.resolve({row['email']: row['name'] for row in new_rows.values()})
+        commits = []
+        for row in new_rows.values():
+            fields = {key: value for key, value in row.items() if key not in ('email', 'name')}
+            commit = Commit(developer_id=developer_ids[row['email']], **fields)
+            commits.append(commit)
+            self._touched_keys.add((commit.developer_id, activity_day(commit.timestamp)))
+
+        with transaction.atomic():
+            Commit.objects.bulk_create(commits, batch_size=self.batch_size, ignore_conflicts=True)
+        self.created += len(commits)
+
+    def close(self):
+        self.flush()
+        self._refresh_rollup()
+
+    def _refresh_rollup(self):
+        keys, self._touched_keys = self._touched_keys, set()
+        refresh_for_keys(keys)
+
+
+def enrich_commit_stats(client, owner, repo, chunk_size=STATS_CHUNK_SIZE, progress=None):
+    """Fills in real lines_added/lines_removed for commits of `owner/repo` still marked stats_pending.
+
+    Commit details are fetched by the client's worker pool (bounded by client.max_workers,
+    paced by its rate-limit scheduler). Results are saved chunk by chunk, so an interrupted
+    run simply resumes with the commits that are still pending. Commits whose details cannot
+    be fetched stay pending for the next run. Returns (updated, failed).
+    """
+    import requests  # Only GitHub syncs need it; keeps it out of every process that imports ingest
+
+    repository = f'{owner}/{repo}'
+    pending = Commit.objects.filter(repository=repository, stats_pending=True).order_by('id')
+    updated = failed = 0
+    touched_keys = set()
+    last_id = 0
+
+    def fetch(commit):
+        try:
+            stats = client.get_commit(owner, repo, commit.hash_id).get('stats') or {}
+        except requests.exceptions.RequestException as e:
+            logger.warning('Could not fetch stats for %s: %s', commit.hash_id[:7], e)
+            return commit, None
+        return commit, stats
+
+    try:
+        with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+            while True:
+                chunk = list(pending.filter(id__gt=last_id).only('id', 'hash_id', 'developer_id', 'timestamp')[:chunk_size])
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+
+                enriched = []
+                for commit, stats in executor.map(fetch, chunk):
+                    if stats is None:
+                        failed += 1
+                        continue
+                    commit.lines_added = stats.get('additions', 0)
+                    commit.lines_removed = stats.get('deletions', 0)
+                    commit.stats_pending = False
+                    enriched.append(commit)
+
+                Commit.objects.bulk_update(enriched, ['lines_added', 'lines_removed', 'stats_pending'])
+                touched_keys.update((commit.developer_id, activity_day(commit.timestamp)) for commit in enriched)
+                updated += len(enriched)
+                if progress:
+                    progress(updated, failed)
+    finally:
+        # Also after an interruption: the chunks already saved must reach the rollup
+        refresh_for_keys(touched_keys)
+    return updated, failed
+
+
+def ingest_repository(path, rev='HEAD', since=None, full=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Ingests new commits of the local repository at `path` and advances its SyncState.
+
+    Resumes from the last ingested commit when it is still an ancestor of `rev` (otherwise,
+    e.g. after a force-push, falls back to everything since `since`). Returns a summary dict.
+    Raises GitError if git fails or the path does not fit SyncState.repository.
+    """
+    path = os.path.abspath(path)
+    repository = path
+    max_length = SyncState._meta.get_field('repository').max_length
+    if len(repository) > max_length:
+        # Truncating could make two repositories share one sync state
+        raise GitError(f"Repository path is longer than {max_length} characters: {path}")
+    head = head_commit(path, rev)
+    state, _ = SyncState.objects.get_or_create(source='git', repository=repository)
+
+    if state.last_commit_sha == head and not full:
+        return {'path': path, 'parsed': 0, 'created': 0, 'skipped': 0, 'developers': 0, 'resumed_from': head}
+
+    resumed_from = None
+    if not full and state.last_commit_sha and is_ancestor(path, state.last_commit_sha, head):
+        resumed_from = state.last_commit_sha
+        revisions, since = [f'{resumed_from}..{head}'], None
+    else:
+        revisions = [head]
+
+    parsed = 0
+    with CommitWriter(batch_size=batch_size) as writer:
+        for commit in iter_git_log(path, revisions, since=since):
+            parsed += 1
+            writer.add(
+                email=commit.email,
+                name=commit.name,
+                hash_id=commit.sha,
+                message=commit.message,
+                lines_added=commit.lines_added,
+                lines_removed=commit.lines_removed,
+                timestamp=commit.timestamp,
+                is_merge=len(commit.parents) > 1,
+                repository=repository,
+            )
+
+    # Only persist the watermark once everything up to it has been written
+    state.last_commit_sha = head
+    state.last_commit_at = commit_time(path, head)
+    state.save()
+
+    return {
+        'path': path,
+        'parsed': parsed,
+        'created': writer.created,
+        'skipped': writer.skipped,
+        'developers': writer.developers.created,
+        'resumed_from': resumed_from,
+    }
@@ -0,0 +1,80 @@
+# core/management/commands/benchmark.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.benchmarks import (
+    DEFAULT_SCALES, DEFAULT_SAMPLES, SEED_OPTIONS, run_scale, environment, compare, isolated_score_cache,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks feature extraction and scoring on synthetic data sets in a throwaway test database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            default=','.join(str(scale) for scale in DEFAULT_SCALES),
+            help='Comma-separated developer counts to benchmark (e.g. 10,1000,50000).',
+        )
+        parser.add_argument('--days', type=int, default=SEED_OPTIONS['days'], help='Days of history seeded.')
+        parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help='Developers each benchmark is timed for.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the data sets and samples.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--compare', help='Baseline JSON file (from --output) to check the results against.')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed slowdown of the median before a benchmark counts as regressed (0.2 = 20%%).',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',') if scale.strip()]
+        except ValueError:
+            raise CommandError('--scales must be a comma-separated list of developer counts.')
+        if not scales or min(scales) < 2:
+            raise CommandError('Every scale needs at least 2 developers.')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline {options['compare']}: {e}")
+
+        self.stdout.write("--- Starting Benchmarks ---")
+        results = {**environment(), 'scales': {}}
+
+        # Never touch the real data: every scale is seeded into a fresh test database, and
+        # scores are cached in a process-local cache
+        with isolated_score_cache():
+            for scale in scales:
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    results['scales'][str(scale)] = run_scale(
+                        scale, samples=options['samples'], seed_value=options['seed'], days=options['days'],
+                        log=self.stdout.write,
+                    )
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        else:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options['threshold'])
+            for scale, name, metric, old, new in regressions:
+                self.stdout.write(self.style.ERROR(f"[{scale}] {name}: {metric} {old} -> {new}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark regressions against {options['compare']}.")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
+
+        self.stdout.write(self.style.SUCCESS("\nBenchmarks Complete."))
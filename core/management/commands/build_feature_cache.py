@@ -0,0 +1,23 @@
+# core/management/commands/build_feature_cache.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.feature_cache import update_feature_cache
+
+
+class Command(BaseCommand):
+    help = 'Brings the on-disk feature matrix cache up to date (reading only new events when it can).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute everything from the database, e.g. after editing events in place.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("--- Updating Feature Cache ---")
+        started = time.perf_counter()
+        path, state = update_feature_cache(rebuild=options['rebuild'])
+        self.stdout.write(self.style.SUCCESS(f"Feature cache {state} in {time.perf_counter() - started:.2f}s: {path}"))
@@ -0,0 +1,38 @@
+# core/management/commands/export_data.py
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import EXPORTS, FORMATS, parse_time_bound, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Streams commits, tickets or chat messages to NDJSON or CSV (memory use stays flat).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS), help='Table to export.')
+        parser.add_argument('--format', dest='fmt', choices=sorted(FORMATS), default='ndjson', help='Output format.')
+        parser.add_argument('--since', help='Only rows at or after this ISO date/datetime.')
+        parser.add_argument('--until', help='Only rows before this ISO date/datetime.')
+        parser.add_argument('--developer', type=int, help='Only rows of this developer ID (author, assignee or sender).')
+        parser.add_argument('--output', '-o', help='File to write (defaults to stdout).')
+
+    def handle(self, *args, **options):
+        filters = {}
+        try:
+            for bound in ('since', 'until'):
+                if options[bound]:
+                    filters[bound] = parse_time_bound(options[bound])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['developer'] is not None:
+            filters['developer_id'] = options['developer']
+
+        chunks = stream_export(options['kind'], options['fmt'], **filters)
+        if options['output']:
+            # newline='' so the csv module's \r\n line endings are written unchanged
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                f.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Exported {options['kind']} to {options['output']}."))
+        else:
+            sys.stdout.writelines(chunks)
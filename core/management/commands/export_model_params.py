@@ -0,0 +1,31 @@
+# core/management/commands/export_model_params.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ml_services import MODEL_PATHS, MODEL_FEATURES, params_path
+from core.numpy_models import export_model_params
+
+
+class Command(BaseCommand):
+    help = 'Exports the trained joblib models as NumPy arrays (.npz), the format served without scikit-learn.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help=f"Models to export: {', '.join(MODEL_PATHS)} (default: all).")
+
+    def handle(self, *args, **options):
+        from joblib import load
+
+        unknown = set(options['models']) - MODEL_PATHS.keys()
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}.")
+
+        for name in options['models'] or MODEL_PATHS:
+            path = MODEL_PATHS[name]
+            try:
+                model = load(path)
+            except FileNotFoundError:
+                raise CommandError(f"Model '{name}' has not been trained ({path} is missing).")
+            try:
+                export_model_params(model, MODEL_FEATURES[name], params_path(path))
+            except ValueError as e:
+                raise CommandError(f"Cannot export model '{name}': {e}")
+            self.stdout.write(self.style.SUCCESS(f"Exported {name} to {params_path(path)}."))
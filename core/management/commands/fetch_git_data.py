@@ -0,0 +1,76 @@
+# core/management/commands/fetch_git_data.py
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from core.gitlog import GitError, ingest_worker
+from core.ingest import DEFAULT_BATCH_SIZE
+from core.processes import init_worker
+
+
+class Command(BaseCommand):
+    help = 'Ingests commits (with real line counts) from local git repositories using `git log --numstat`.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Paths of local git repositories (clones or mirrors).')
+        parser.add_argument('--rev', default='HEAD', help='Branch or revision to ingest in every repository.')
+        parser.add_argument('--days', type=int, default=30, help='How many days of history to ingest on the first sync.')
+        parser.add_argument('--full', action='store_true', help='Ignore the saved sync state and reingest --days of history.')
+        parser.add_argument('--workers', type=int, default=None, help='Repositories ingested in parallel (default: one per CPU).')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Commits written per INSERT.')
+
+    def handle(self, *args, **options):
+        paths = [os.path.abspath(path) for path in options['paths']]
+        missing = [path for path in paths if not os.path.isdir(path)]
+        if missing:
+            raise CommandError(f"Not a directory: {', '.join(missing)}")
+
+        self.stdout.write("--- Starting Local Git Data Fetch ---")
+
+        ingest_options = {
+            'rev': options['rev'],
+            'since': timezone.now() - timedelta(days=options['days']),
+            'full': options['full'],
+            'batch_size': options['batch_size'],
+        }
+        workers = min(options['workers'] or os.cpu_count() or 1, len(paths))
+
+        failed = 0
+        if workers == 1:
+            for path in paths:
+                failed += not self.report(path, lambda: ingest_worker(path, ingest_options))
+        else:
+            # Workers open their own database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+                futures = {executor.submit(ingest_worker, path, ingest_options): path for path in paths}
+                for future in as_completed(futures):
+                    failed += not self.report(futures[future], future.result)
+
+        if failed:
+            raise CommandError(f"{failed} of {len(paths)} repositories could not be ingested.")
+        self.stdout.write(self.style.SUCCESS("\nLocal Git Data Fetch Complete."))
+
+    def report(self, path, get_result):
+        """Prints one repository's outcome; returns False if it failed."""
+        try:
+            result = get_result()
+        except GitError as e:
+            self.stdout.write(self.style.ERROR(f"{path}: {e}"))
+            return False
+
+        if result['resumed_from'] and not result['parsed']:
+            self.stdout.write(f"{path}: up to date.")
+            return True
+        since = f" since {result['resumed_from'][:7]}" if result['resumed_from'] else ''
+        self.stdout.write(
+            f"{path}: parsed {result['parsed']} commits{since}, saved {result['created']} new, "
+            f"skipped {result['skipped']} already stored."
+        )
+        if result['developers']:
+            self.stdout.write(self.style.SUCCESS(f"{path}: created {result['developers']} new developers."))
+        return True
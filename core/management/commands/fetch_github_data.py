@@ -1,28 +1,20 @@
 # core/management/commands/fetch_github_data.py
-import requests
-
-from datetime import datetime, timedelta
-
-from django.core.management.base import BaseCommand
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
 
+import requests
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from django.utils.timezone import make_aware
-
-from core.models import Developer, Commit
 
+from core.github import GitHubClient, GITHUB_API_URL, DEFAULT_WORKERS
+from core.ingest import CommitWriter, DEFAULT_BATCH_SIZE, enrich_commit_stats
+from core.models import SyncState
 
 
 # --- YOUR CONSTANTS ---
 
-import os
-
 # Ensure this token is secret in production environments!
-# GITHUB_TOKEN must be set as an environment variable
-
-GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
-
-if not GITHUB_TOKEN:
-    raise ValueError("GITHUB_TOKEN environment variable is required. Please set it before running this command.")
+# GITHUB_TOKEN must be set as an environment variable (or passed with --token)
 
 GITHUB_ORG_OR_USER = 'eeshaanbharadwaj'
 
@@ -30,165 +22,134 @@ GITHUB_REPO_NAME = 'TeamPulse'
 
 # ----------------------
 
+# Re-ask for commits this far behind the watermark, so commits that reach the default
+# branch with an older commit date (e.g. a merged long-lived branch) are not missed
+SYNC_OVERLAP_HOURS = 24
 
 
-class Command(BaseCommand):
-
-    help = 'Fetches real commit data from GitHub API and updates the database.'
-
-
-
-    def handle(self, *args, **options):
-
-        self.stdout.write("--- Starting GitHub Data Fetch ---")
-
-        
-
-        # Define the API endpoint URL
-
-        API_URL = f"https://api.github.com/repos/{GITHUB_ORG_OR_USER}/{GITHUB_REPO_NAME}/commits"
-
-        
-
-        # Headers for authentication and to accept JSON
-
-        headers = {
-
-            'Authorization': f'token {GITHUB_TOKEN}',
+def parse_github_timestamp(value):
+    """Parses GitHub's ISO-8601 UTC timestamps (e.g. '2025-11-04T00:15:00Z')."""
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=dt_timezone.utc)
 
-            'Accept': 'application/vnd.github.v3+json',
 
-        }
+def format_github_timestamp(value):
+    """Formats an aware datetime the way GitHub expects `since` (whole seconds, UTC)."""
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
-        
 
-        # Parameters to filter results (e.g., fetch commits from the last 30 days)
-
-        since_date = (timezone.now() - timedelta(days=30)).isoformat()
-
-        params = {
-
-            'since': since_date,
-
-            'per_page': 100 # Fetch up to 100 commits per page
+class Command(BaseCommand):
+    help = 'Fetches real commit data from GitHub API and updates the database.'
 
-        }
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', default=GITHUB_ORG_OR_USER, help='GitHub user or organization.')
+        parser.add_argument('--repo', default=GITHUB_REPO_NAME, help='Repository name.')
+        parser.add_argument('--days', type=int, default=30, help='How many days of history to fetch on the first sync.')
+        parser.add_argument('--overlap-hours', type=int, default=SYNC_OVERLAP_HOURS, help='How far behind the watermark incremental syncs start.')
+        parser.add_argument('--full', action='store_true', help='Ignore the saved sync state and refetch --days of history.')
+        parser.add_argument('--token', default=os.environ.get('GITHUB_TOKEN'), help='API token (defaults to $GITHUB_TOKEN).')
+        parser.add_argument('--api-url', default=GITHUB_API_URL, help='GitHub API base URL.')
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Pages fetched concurrently.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Commits written per INSERT.')
+        parser.add_argument('--skip-stats', action='store_true', help='Only list commits; leave line stats pending.')
+        parser.add_argument('--stats-only', action='store_true', help='Skip listing and only fetch line stats for pending commits.')
 
+    def handle(self, *args, **options):
+        if not options['token']:
+            raise CommandError("GITHUB_TOKEN environment variable is required. Please set it before running this command.")
 
+        self.stdout.write("--- Starting GitHub Data Fetch ---")
 
+        owner, repo = options['owner'], options['repo']
+        state, _ = SyncState.objects.get_or_create(source='github', repository=f'{owner}/{repo}')
+        incremental = state.last_commit_at is not None and not options['full']
+
+        if incremental:
+            # Only ask for commits since the last one we saw (and send the ETag: unchanged -> 304)
+            since_date = format_github_timestamp(state.last_commit_at - timedelta(hours=options['overlap_hours']))
+            etag = state.etag or None
+            self.stdout.write(f"Incremental sync since {state.last_commit_sha[:7]} ({state.last_commit_at:%Y-%m-%d %H:%M})")
+        else:
+            # Parameters to filter results (e.g., fetch commits from the last 30 days)
+            since_date = format_github_timestamp(timezone.now() - timedelta(days=options['days']))
+            etag = None
+
+        client = GitHubClient(token=options['token'], api_url=options['api_url'], max_workers=options['workers'])
         try:
-
-            response = requests.get(API_URL, headers=headers, params=params)
-
-            response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-
-            commits_data = response.json()
-
-            
-
-            self.stdout.write(f"Fetched {len(commits_data)} commits from GitHub.")
-
-
-
-            for commit_data in commits_data:
+            if not options['stats_only']:
+                self.sync_commits(client, owner, repo, state, since_date, etag, options)
+            if not options['skip_stats']:
+                self.sync_stats(client, owner, repo)
+        except requests.exceptions.RequestException as e:
+            self.stdout.write(self.style.ERROR(f"\nAPI Request Failed: {e}"))
+            self.stdout.write(self.style.ERROR("Check your GITHUB_TOKEN and ensure the repo exists."))
+            return
+        finally:
+            client.close()
+
+        self.stdout.write(self.style.SUCCESS("\nGitHub Data Fetch Complete."))
+
+    def sync_commits(self, client, owner, repo, state, since_date, etag, options):
+        """Stage 1: lists new commits and stores them with their line stats marked pending."""
+        fetched = 0
+        newest_sha, newest_at = state.last_commit_sha, state.last_commit_at
+
+        first_response, commits = client.list_commits(owner, repo, since=since_date, etag=etag)
+        if first_response.status_code == 304:
+            state.save(update_fields=['updated_at'])
+            self.stdout.write(self.style.SUCCESS("Repository unchanged since the last sync (304 Not Modified)."))
+            return
+
+        with CommitWriter(batch_size=options['batch_size']) as writer:
+            for commit_data in commits:
+                fetched += 1
+
+                # Advance the watermark on the commit date, which is what `since` filters on
+                committer = commit_data['commit'].get('committer') or commit_data['commit'].get('author')
+                if committer:
+                    committed_at = parse_github_timestamp(committer['date'])
+                    if newest_at is None or committed_at > newest_at:
+                        newest_sha, newest_at = commit_data['sha'], committed_at
 
                 # Skip commits without author info (e.g., if force-pushed)
-
                 if not commit_data.get('author') or not commit_data['commit'].get('author'):
-
                     continue
 
-                
-
-                # --- 1. Get or Create Developer ---
-
-                author_email = commit_data['commit']['author']['email']
-
-                author_name = commit_data['commit']['author']['name']
-
-                
-
-                # We use email as the unique identifier for Developer
-
-                developer, created = Developer.objects.get_or_create(
-
-                    email=author_email,
-
-                    defaults={'name': author_name}
-
+                author = commit_data['commit']['author']
+                message = commit_data['commit']['message']
+
+                # The list endpoint doesn't include lines_added/removed; they are filled in
+                # from the per-commit endpoint by sync_stats()
+                stats = commit_data.get('stats')
+                writer.add(
+                    email=author['email'],
+                    name=author['name'],
+                    hash_id=commit_data['sha'],
+                    message=message,
+                    lines_added=stats['additions'] if stats else 0,
+                    lines_removed=stats['deletions'] if stats else 0,
+                    timestamp=parse_github_timestamp(author['date']),
+                    is_merge="Merge pull request" in message,
+                    repository=f'{owner}/{repo}',
+                    stats_pending=not stats,
                 )
 
-                if created:
-
-                    self.stdout.write(self.style.SUCCESS(f"Created new developer: {author_name}"))
-
-
-
-                # --- 2. Create Commit Record ---
-
-                commit_hash = commit_data['sha']
-
-                
-
-                # Check if commit already exists (using hash_id as unique key)
-
-                if Commit.objects.filter(hash_id=commit_hash).exists():
-
-                    # self.stdout.write(f"Commit {commit_hash[:7]} already exists. Skipping.")
-
-                    continue
-
-
-
-                commit_timestamp_str = commit_data['commit']['author']['date']
-
-                commit_timestamp = datetime.strptime(commit_timestamp_str, '%Y-%m-%dT%H:%M:%SZ')
-
-                
-
-                # NOTE: GitHub API doesn't easily give lines_added/removed in this endpoint.
-
-                # A proper implementation would require a SECOND API call per commit to get stats, 
-
-                # but we will simplify for now by using dummy data for stats.
-
-                lines_added = commit_data.get('stats', {}).get('additions', 50) # Use a dummy value if stats not present
-
-                lines_removed = commit_data.get('stats', {}).get('deletions', 20) # Use a dummy value
-
-                
-
-                Commit.objects.create(
-
-                    developer=developer,
-
-                    hash_id=commit_hash,
-
-                    message=commit_data['commit']['message'][:500], # Truncate message
-
-                    lines_added=lines_added,
-
-                    lines_removed=lines_removed,
-
-                    timestamp=make_aware(commit_timestamp),
-
-                    is_merge="Merge pull request" in commit_data['commit']['message']
-
-                )
-
-                self.stdout.write(f"  > Saved commit {commit_hash[:7]}")
-
-
-
-
-            self.stdout.write(self.style.SUCCESS("\nGitHub Data Fetch Complete."))
-
-
-
-        except requests.exceptions.RequestException as e:
-
-            self.stdout.write(self.style.ERROR(f"\nAPI Request Failed: {e}"))
-
-            self.stdout.write(self.style.ERROR("Check your GITHUB_TOKEN and ensure the repo exists."))
-
-
+        # Only persist the watermark once everything up to it has been written
+        state.last_commit_sha = newest_sha
+        state.last_commit_at = newest_at
+        state.etag = first_response.headers.get('ETag', '')
+        state.save()
+
+        self.stdout.write(f"Fetched {fetched} commits from GitHub.")
+        if writer.developers.created:
+            self.stdout.write(self.style.SUCCESS(f"Created {writer.developers.created} new developers."))
+        self.stdout.write(f"Saved {writer.created} new commits, skipped {writer.skipped} already stored.")
+
+    def sync_stats(self, client, owner, repo):
+        """Stage 2: fetches line stats for every commit still pending (resumes where a previous run stopped)."""
+        def progress(updated, failed):
+            self.stdout.write(f"  ...{updated} commits enriched")
+
+        updated, failed = enrich_commit_stats(client, owner, repo, progress=progress)
+        self.stdout.write(f"Fetched line stats for {updated} commits.")
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} commits could not be fetched and stay pending for the next run."))
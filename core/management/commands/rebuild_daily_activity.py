@@ -0,0 +1,34 @@
+# core/management/commands/rebuild_daily_activity.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.rollups import rebuild_daily_activity, REBUILD_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the DeveloperDailyActivity rollup from raw commits, tickets and chat data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Only rebuild days on or after this date (YYYY-MM-DD). Rebuilds everything by default.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REBUILD_CHUNK_SIZE,
+            help='Number of developers aggregated per batch.',
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format.')
+
+        self.stdout.write("--- Rebuilding Daily Activity Rollup ---")
+        rows = rebuild_daily_activity(since=since, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} developer-day rows."))
@@ -1,112 +1,177 @@
 # core/management/commands/seed_data.py
 import random
-from datetime import timedelta, datetime
-from django.core.management.base import BaseCommand
-from core.models import Developer, Commit, JiraTicket, ChatData
+import time
+from datetime import date, datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from core.models import Developer, Commit, JiraTicket, ChatData, DeveloperDailyActivity, SyncState
+from core.rollups import rebuild_daily_activity
+from core.score_cache import invalidate_all
 from django.utils import timezone
 
+DEV_NAMES = ['Alice Johnson', 'Bob Smith', 'Charlie Brown', 'Eve Davis', 'Dave Lee']
+CHUNK_SIZE = 10000  # Rows generated (and written in one transaction) at a time
+
+
 class Command(BaseCommand):
     help = 'Seeds the database with sample data for TeamPulse analysis.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--developers', type=int, default=len(DEV_NAMES), help='Number of developers.')
+        parser.add_argument('--days', type=int, default=30, help='Days of commit and chat history.')
+        parser.add_argument('--commits-per-day', type=float, default=5.0, help='Average commits per developer per weekday.')
+        parser.add_argument('--tickets-per-day', type=float, default=0.35, help='Average tickets per developer per day.')
+        parser.add_argument('--messages-per-day', type=float, default=1.3, help='Average chat messages per developer per day.')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for reproducible data sets.')
+        parser.add_argument(
+            '--end-date',
+            help='Day (YYYY-MM-DD) the history ends at, exclusive; default: today. '
+                 'With --seed, the same end date always gives the same rows.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows written per transaction.')
+
     def handle(self, *args, **options):
+        if options['developers'] < 2:
+            raise CommandError('--developers must be at least 2 (direct messages need a recipient).')
+        end_date = timezone.localdate()
+        if options['end_date']:
+            try:
+                end_date = date.fromisoformat(options['end_date'])
+            except ValueError:
+                raise CommandError('--end-date must be a date in YYYY-MM-DD format.')
+
         self.stdout.write("--- Starting Data Seeding ---")
-        
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        # Every timestamp is an offset from this midnight (not from the wall clock)
+        self.today = timezone.make_aware(datetime.combine(end_date, datetime.min.time()))
+        started = time.monotonic()
+
         # 1. Clear existing data (optional, but good for clean tests)
-        Developer.objects.all().delete()
-        Commit.objects.all().delete()
-        JiraTicket.objects.all().delete()
-        ChatData.objects.all().delete()
+        self.reset()
         self.stdout.write(self.style.WARNING("Existing data cleared."))
 
         # --- 2. Create Developers ---
-        dev_names = ['Alice Johnson', 'Bob Smith', 'Charlie Brown', 'Eve Davis', 'Dave Lee']
-        developers = []
-        for name in dev_names:
-            dev = Developer.objects.create(
-                name=name, 
-                email=f"{name.replace(' ', '.').lower()}@teampulse.com"
-            )
-            developers.append(dev)
-        self.stdout.write(self.style.SUCCESS(f"Created {len(developers)} Developers."))
-
-        # --- 3. Generate Commits (Simulating 30 days of activity) ---
-        today = timezone.now()
-        commit_count = 0
-        
-        for dev in developers:
-            for day in range(30):
-                # Simulate more work on weekdays, less on weekends
-                num_commits = random.randint(2, 8) if datetime.now().weekday() < 5 else random.randint(0, 3) 
-                
-                for _ in range(num_commits):
-                    # Random time of day, some commits will be late at night (Burnout feature!)
-                    time_offset = timedelta(hours=random.randint(9, 23), minutes=random.randint(0, 59))
-                    commit_time = today - timedelta(days=day) - time_offset
-                    
-                    Commit.objects.create(
-                        developer=dev,
-                        hash_id=f'{random.getrandbits(32):08x}',
-                        message=f"Feature: Added login functionality. ({_})",
-                        lines_added=random.randint(10, 200),
-                        lines_removed=random.randint(5, 100),
-                        timestamp=commit_time,
-                        is_merge=random.random() < 0.1 # 10% are merge commits
-                    )
-                    commit_count += 1
+        developer_ids = self.create_developers(options['developers'])
+        self.stdout.write(self.style.SUCCESS(f"Created {len(developer_ids)} Developers."))
+
+        # --- 3. Generate Commits ---
+        commit_count = self.write(Commit, self.generate_commits(developer_ids, options['days'], options['commits_per_day']))
         self.stdout.write(self.style.SUCCESS(f"Created {commit_count} Sample Commits."))
 
         # --- 4. Generate Jira Tickets ---
-        ticket_count = 0
-        for i in range(50):
-            status = random.choice(['Done', 'In Progress', 'To Do', 'Review'])
-            assignee = random.choice(developers)
-            created = today - timedelta(days=random.randint(5, 60))
-            closed = created + timedelta(days=random.randint(1, 15)) if status == 'Done' else None
-            
-            JiraTicket.objects.create(
-                ticket_key=f"PROD-{100 + i}",
-                title=f"Bug fix for component {i}",
-                assignee=assignee,
-                status=status,
-                story_points=random.choice([1, 2, 3, 5, 8]),
-                created_at=created,
-                closed_at=closed,
-                time_spent_hours=random.uniform(2.0, 40.0)
-            )
-            ticket_count += 1
+        ticket_count = self.write(JiraTicket, self.generate_tickets(developer_ids, options['days'], options['tickets_per_day']))
         self.stdout.write(self.style.SUCCESS(f"Created {ticket_count} Sample Jira Tickets."))
 
         # --- 5. Generate Chat Data ---
-        chat_count = 0
-        for i in range(200): # Create 200 random chat messages
-            sender = random.choice(developers)
-            
-            # 70% of messages are channel messages (recipient=None)
-            if random.random() < 0.7:
-                recipient = None
-            else:
-                # 30% are direct messages, must be to a different person
-                recipient = random.choice([d for d in developers if d != sender])
-
-            chat_time = today - timedelta(days=random.randint(1, 30), hours=random.randint(9, 23))
-
-            # Simulate ML Features
-            
-            # Sentiment Score: Randomly assign a positive, neutral, or negative score
-            sentiment_score = random.uniform(0.1, 0.99) # Score between 0.1 and 0.99
-            
-            # Quick Response: Simulate 60% of messages being quick responses
-            is_quick_response = random.random() < 0.6 
-            
-            ChatData.objects.create(
-                sender=sender,
-                recipient=recipient,
-                timestamp=chat_time,
-                message_length=random.randint(5, 50),
-                sentiment_score=sentiment_score, # <-- NEW
-                is_quick_response=is_quick_response, # <-- NEW
-            )
-            chat_count += 1
+        chat_count = self.write(ChatData, self.generate_messages(developer_ids, options['days'], options['messages_per_day']))
         self.stdout.write(self.style.SUCCESS(f"Created {chat_count} Sample Chat Messages."))
 
-        self.stdout.write("--- Data Seeding Complete ---")
\ No newline at end of file
+        # --- 6. Rollup (bulk_create bypasses the signals that keep it current) ---
+        rows = rebuild_daily_activity()
+        self.stdout.write(self.style.SUCCESS(f"Built {rows} daily activity rows."))
+
+        self.stdout.write(f"--- Data Seeding Complete ({time.monotonic() - started:.1f}s) ---")
+
+    def reset(self):
+        """Empties the seeded tables with one flush (TRUNCATE/DELETE per table) instead of a cascading ORM delete."""
+        models = [DeveloperDailyActivity, ChatData, Commit, JiraTicket, Developer, SyncState]
+        sql = connection.ops.sql_flush(no_style(), [model._meta.db_table for model in models], reset_sequences=True)
+        connection.ops.execute_sql_flush(sql)
+        # IDs start over, so cached scores would be served for the wrong developers
+        invalidate_all()
+
+    def write(self, model, objects):
+        """Bulk-inserts generated objects in chunks, one transaction per chunk. Returns the row count."""
+        count = 0
+        chunk = []
+        for obj in objects:
+            chunk.append(obj)
+            if len(chunk) >= self.chunk_size:
+                count += self.write_chunk(model, chunk)
+                chunk = []
+        if chunk:
+            count += self.write_chunk(model, chunk)
+        return count
+
+    def write_chunk(self, model, chunk):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, batch_size=self.chunk_size)
+        return len(chunk)
+
+    def daily_count(self, density):
+        """A random per-day event count averaging `density`."""
+        return int(self.rng.uniform(0, 2 * density) + self.rng.random())
+
+    def create_developers(self, count):
+        names = DEV_NAMES[:count] + [f"Developer {i}" for i in range(len(DEV_NAMES) + 1, count + 1)]
+        self.write(Developer, (
+            Developer(name=name, email=f"{name.replace(' ', '.').lower()}@teampulse.com") for name in names
+        ))
+        return list(Developer.objects.order_by('id').values_list('id', flat=True))
+
+    def generate_commits(self, developer_ids, days, density):
+        rng = self.rng
+        for developer_id in developer_ids:
+            for day in range(days):
+                # Simulate more work on weekdays, less on weekends
+                date = self.today - timedelta(days=day)
+                num_commits = self.daily_count(density if date.weekday() < 5 else density / 4)
+
+                for n in range(num_commits):
+                    # Random time of day, some commits will be late at night (Burnout feature!)
+                    time_offset = timedelta(hours=rng.randint(9, 23), minutes=rng.randint(0, 59))
+                    yield Commit(
+                        developer_id=developer_id,
+                        hash_id=f'{rng.getrandbits(160):040x}',
+                        message=f"Feature: Added login functionality. ({n})",
+                        lines_added=rng.randint(10, 200),
+                        lines_removed=rng.randint(5, 100),
+                        timestamp=date - time_offset,
+                        is_merge=rng.random() < 0.1  # 10% are merge commits
+                    )
+
+    def generate_tickets(self, developer_ids, days, density):
+        rng = self.rng
+        # Tickets are created up to 30 days before the window, so some close inside it
+        per_developer = days + 30
+        key = 100
+        for developer_id in developer_ids:
+            for _ in range(self.daily_count(density * per_developer)):
+                status = rng.choice(['Done', 'In Progress', 'To Do', 'Review'])
+                created = self.today - timedelta(days=rng.randint(5, per_developer), hours=rng.randint(0, 23))
+                closed = min(created + timedelta(days=rng.randint(1, 15)), self.today) if status == 'Done' else None
+                yield JiraTicket(
+                    ticket_key=f"PROD-{key}",
+                    title=f"Bug fix for component {key - 100}",
+                    assignee_id=developer_id,
+                    status=status,
+                    story_points=rng.choice([1, 2, 3, 5, 8]),
+                    created_at=created,
+                    closed_at=closed,
+                    time_spent_hours=round(rng.uniform(2.0, 40.0), 2)
+                )
+                key += 1
+
+    def generate_messages(self, developer_ids, days, density):
+        rng = self.rng
+        for index, sender_id in enumerate(developer_ids):
+            for day in range(days):
+                for _ in range(self.daily_count(density)):
+                    # 70% of messages are channel messages (recipient=None)
+                    if rng.random() < 0.7:
+                        recipient_id = None
+                    else:
+                        # 30% are direct messages, must be to a different person
+                        other = rng.randrange(len(developer_ids) - 1)
+                        recipient_id = developer_ids[other + (other >= index)]
+
+                    yield ChatData(
+                        sender_id=sender_id,
+                        recipient_id=recipient_id,
+                        timestamp=self.today - timedelta(days=day, hours=rng.randint(9, 23), minutes=rng.randint(0, 59)),
+                        message_length=rng.randint(5, 50),
+                        sentiment_score=round(rng.uniform(0.1, 0.99), 2),  # Score between 0.1 and 0.99
+                        is_quick_response=rng.random() < 0.6,  # Simulate 60% of messages being quick responses
+                    )
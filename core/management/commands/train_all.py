@@ -0,0 +1,50 @@
+# core/management/commands/train_all.py
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ml_services import MODEL_RELEASES_DIR
+from core.training import MODELS, TrainingError, train_all
+
+
+class Command(BaseCommand):
+    help = 'Trains the burnout, productivity and collaboration models in parallel from one shared feature matrix.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help=f"Models to train: {', '.join(MODELS)} (default: all).")
+        parser.add_argument('--workers', type=int, default=None, help='Models trained in parallel (default: one per CPU).')
+        parser.add_argument(
+            '--no-feature-cache', action='store_true',
+            help='Build the features straight from the database instead of the on-disk feature cache.',
+        )
+        parser.add_argument(
+            '--search', action='store_true',
+            help="Pick each model's hyperparameters by a cross-validated grid search on every core first "
+                 "(skipped while the data is unchanged).",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['models']) - MODELS.keys()
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}.")
+
+        self.stdout.write("--- Starting Model Training ---")
+        try:
+            manifest = train_all(
+                options['models'], workers=options['workers'], progress=self.stdout.write,
+                use_cache=not options['no_feature_cache'], search=options['search'],
+            )
+        except (TrainingError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for name in options['models'] or MODELS:
+            report = manifest['models'][name]
+            score_name = MODELS[name][2]
+            self.stdout.write(
+                f"{name}: {score_name} {report[score_name]:.2f} on {report['rows']} developers, "
+                f"fitted in {report['fit_seconds']:.2f}s ({report['seconds']:.2f}s with export)."
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"\nModels {manifest['version']} published in {manifest['total_seconds']:.2f}s: "
+            f"{os.path.join(MODEL_RELEASES_DIR, manifest['release'])}"
+        ))
@@ -0,0 +1,169 @@
+# core/metrics.py
+"""In-process metrics (counters and histograms) exposed in the Prometheus text format at /metrics.
+
+Metrics are kept per process: behind a multi-process server every worker reports its own
+numbers, and Prometheus should scrape each of them (or sum them with a recording rule).
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds; covers sub-millisecond ORM hits up to multi-second cold starts
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count, one series per combination of label values."""
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f'{self.name}_total{_format_labels(self.labelnames, key)} {_format_number(value)}'
+
+
+class Histogram:
+    """Observations counted into fixed buckets, one series per combination of label values."""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the wall time spent in the `with` block, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels):
+        """Decorator version of time()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float('inf')), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [('le', _format_number(bound))])
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_number(total)}'
+            yield f'{self.name}_count{labels} {count}'
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# --- HTTP (recorded by core.middleware.MetricsMiddleware) ---
+REQUEST_SECONDS = registry.histogram(
+    'teampulse_http_request_duration_seconds', 'Time spent handling a request, by URL route.',
+    ['route', 'method', 'status'],
+)
+REQUEST_QUERIES = registry.histogram(
+    'teampulse_http_request_queries', 'SQL queries executed per request.', ['route'], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_QUERY_SECONDS = registry.histogram(
+    'teampulse_http_request_query_duration_seconds', 'Total time spent in SQL per request.', ['route'],
+)
+
+# --- ML (recorded by core.ml_services and core.model_registry) ---
+ML_STAGE_SECONDS = registry.histogram(
+    'teampulse_ml_stage_duration_seconds', 'Time spent per scoring stage (features = ORM, inference = model).',
+    ['model', 'stage'],
+)
+MODEL_LOAD_SECONDS = registry.histogram(
+    'teampulse_model_load_duration_seconds', 'Time spent reading and deserializing a model artifact.', ['model'],
+)
+PREDICTIONS = registry.counter(
+    'teampulse_ml_predictions', 'Developers scored, by model.', ['model'],
+)
+INFERENCE_BATCH_SIZE = registry.histogram(
+    'teampulse_ml_inference_batch_size', 'Rows per prediction call of the inference batcher.', ['model'],
+    buckets=BATCH_SIZE_BUCKETS,
+)
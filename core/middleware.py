@@ -0,0 +1,73 @@
+# core/middleware.py
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from core.metrics import REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_QUERY_SECONDS
+
+
+class QueryStats:
+    """A connection.execute_wrapper that counts queries and sums up their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """Records latency, SQL query count and SQL time of every request, labelled by URL route.
+
+    The route is the URL pattern (e.g. 'api/v1/burnout/<int:pk>/'), not the path, so the
+    number of series stays bounded. Under ASGI the middleware stays async, so async views are
+    not pushed onto a thread; their queries run on sync_to_async's thread with its own
+    connections, so for them only latency is recorded.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(stats))
+            # View exceptions are already turned into 500 responses further down the chain
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        route = self.route(request)
+        REQUEST_SECONDS.observe(elapsed, route=route, method=request.method, status=response.status_code)
+        REQUEST_QUERIES.observe(stats.count, route=route)
+        REQUEST_QUERY_SECONDS.observe(stats.duration, route=route)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        REQUEST_SECONDS.observe(elapsed, route=self.route(request), method=request.method, status=response.status_code)
+        return response
+
+    @staticmethod
+    def route(request):
+        match = getattr(request, 'resolver_match', None)
+        return match.route if match is not None else '<unmatched>'
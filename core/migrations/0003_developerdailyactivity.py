@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_chatdata_jiraticket_commit_ticket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeveloperDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('commit_count', models.IntegerField(default=0)),
+                ('after_hours_commit_count', models.IntegerField(default=0)),
+                ('weekend_commit_count', models.IntegerField(default=0)),
+                ('lines_added', models.IntegerField(default=0)),
+                ('lines_removed', models.IntegerField(default=0)),
+                ('tickets_closed', models.IntegerField(default=0)),
+                ('high_value_tickets_closed', models.IntegerField(default=0)),
+                ('closed_ticket_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('messages_sent', models.IntegerField(default=0)),
+                ('sentiment_sum', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sentiment_count', models.IntegerField(default=0)),
+                ('messages_received', models.IntegerField(default=0)),
+                ('quick_responses_received', models.IntegerField(default=0)),
+                ('developer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to='core.developer')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('developer', 'date'), name='unique_developer_daily_activity')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_developerdailyactivity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chatdata',
+            name='recipient',
+            field=models.ForeignKey(blank=True, db_index=False, help_text='Null for channel messages.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='received_messages', to='core.developer'),
+        ),
+        migrations.AlterField(
+            model_name='chatdata',
+            name='sender',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sent_messages', to='core.developer'),
+        ),
+        migrations.AlterField(
+            model_name='commit',
+            name='developer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='core.developer'),
+        ),
+        migrations.AlterField(
+            model_name='jiraticket',
+            name='assignee',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tickets', to='core.developer'),
+        ),
+        migrations.AddIndex(
+            model_name='chatdata',
+            index=models.Index(fields=['sender', 'timestamp'], name='chat_sender_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatdata',
+            index=models.Index(fields=['recipient', 'timestamp'], name='chat_recipient_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commit',
+            index=models.Index(fields=['developer', 'timestamp'], name='commit_developer_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jiraticket',
+            index=models.Index(fields=['assignee', 'status'], name='ticket_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jiraticket',
+            index=models.Index(condition=models.Q(('status__in', ['Done', 'Closed'])), fields=['assignee', 'closed_at'], name='ticket_assignee_closed_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_feature_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('github', 'GitHub API'), ('git', 'Local git repository')], max_length=20)),
+                ('repository', models.CharField(max_length=255)),
+                ('last_commit_sha', models.CharField(blank=True, max_length=40)),
+                ('last_commit_at', models.DateTimeField(blank=True, null=True)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'repository'), name='unique_sync_state_repository')],
+            },
+        ),
+    ]
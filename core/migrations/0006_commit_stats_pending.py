@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_syncstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commit',
+            name='repository',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='commit',
+            name='stats_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='commit',
+            index=models.Index(condition=models.Q(('stats_pending', True)), fields=['repository', 'id'], name='commit_stats_pending_idx'),
+        ),
+    ]
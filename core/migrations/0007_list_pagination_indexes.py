@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_commit_stats_pending'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatdata',
+            index=models.Index(fields=['timestamp', 'id'], name='chat_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commit',
+            index=models.Index(fields=['timestamp', 'id'], name='commit_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jiraticket',
+            index=models.Index(fields=['created_at', 'id'], name='ticket_created_idx'),
+        ),
+    ]
@@ -1,213 +1,324 @@
 # core/ml_services.py
+import asyncio
 import os
-from joblib import load
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from core.models import Developer, Commit, JiraTicket, ChatData
+from django.db import connections
+from core.models import Developer, JiraTicket, DeveloperDailyActivity
+from core.model_registry import ModelRegistry, DEFAULT_CHECK_INTERVAL
+from core.metrics import ML_STAGE_SECONDS, PREDICTIONS
+from core.inference_batcher import InferenceBatcher, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT
 from datetime import datetime, timedelta
-import pytz
-from django.db.models import Avg, Sum, Q, Count
+from zoneinfo import ZoneInfo
+from django.db.models import Sum, Q, Count
+from django.db.models.functions import ExtractHour, ExtractWeekDay
 
 # Path to the saved model file
 MODEL_PATH = os.path.join(settings.BASE_DIR, 'ml_scripts/burnout_risk_model.joblib')
 PROD_MODEL_PATH = os.path.join(settings.BASE_DIR, 'ml_scripts/productivity_score_model.joblib')
 COLLAB_MODEL_PATH = os.path.join(settings.BASE_DIR, 'ml_scripts/collaboration_score_model.joblib')
 
+# Retrained models (see core.training) are published as a whole under `current`
+MODEL_RELEASES_DIR = str(getattr(settings, 'TEAMPULSE_MODEL_RELEASES_DIR', os.path.join(settings.BASE_DIR, 'var', 'models')))
+CURRENT_RELEASE = os.path.join(MODEL_RELEASES_DIR, 'current')
+
+
+# --- NumPy inference ---
+# The trained models are exported as plain arrays (.npz, see core.numpy_models) next to their
+# joblib file, so serving needs neither scikit-learn nor pandas (and their import time).
+# NumPy itself is only imported when the first model is loaded.
+
+def params_path(model_path):
+    """Path of the .npz export that goes with a .joblib artifact."""
+    return os.path.splitext(model_path)[0] + '.npz'
+
+
+def release_path(model_path, release=CURRENT_RELEASE):
+    """Path of a model artifact within a release directory."""
+    return os.path.join(release, os.path.basename(model_path))
+
+
+def load_numpy_model(payload):
+    # Imported on first load, so processes that never score don't pay for NumPy
+    from core.numpy_models import NumpyModel
+    return NumpyModel.from_bytes(payload)
+
+
+def feature_matrix(rows, feature_names, model):
+    """Stacks feature dicts into the input `model` expects (raises KeyError for a missing feature)."""
+    import numpy as np
+
+    X = np.array([[row[feature] for feature in feature_names] for row in rows], dtype=float)
+    if hasattr(model, 'feature_names_in_'):
+        # A scikit-learn model fitted on a DataFrame (no .npz export yet) wants its column names back
+        import pandas as pd
+        return pd.DataFrame(X, columns=feature_names)
+    return X
+
+
+# Models are loaded once per process and hot-reloaded when the artifact changes on disk;
+# the current release is preferred over the shipped artifacts, and within each the NumPy
+# export over the joblib file
+model_registry = ModelRegistry(
+    check_interval=getattr(settings, 'TEAMPULSE_MODEL_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL),
+    loaders={'.npz': load_numpy_model},
+)
+MODEL_PATHS = {
+    'burnout': MODEL_PATH,
+    'productivity': PROD_MODEL_PATH,
+    'collaboration': COLLAB_MODEL_PATH,
+}
+for name, path in MODEL_PATHS.items():
+    model_registry.register(name, release_path(params_path(path)), release_path(path), params_path(path), path)
+
 # Define standard work hours for features
-TIMEZONE = pytz.timezone('UTC')  # Adjust this to your local timezone if needed
+TIMEZONE = ZoneInfo('UTC')  # Adjust this to your local timezone if needed
 START_HOUR = 9
 END_HOUR = 18
 WEEKENDS = [5, 6]  # 5=Saturday, 6=Sunday
 
+# Rolling window (in days) that features are computed over, and ticket statuses counting as closed
+ANALYSIS_WINDOW_DAYS = 30
+CLOSED_STATUSES = ['Done', 'Closed']
+
+# Feature columns in the exact order each model was trained on
+BURNOUT_FEATURES = ['after_hours_ratio', 'weekend_ratio', 'open_tickets', 'avg_time_spent']
+PRODUCTIVITY_FEATURES = ['total_lines_changed', 'high_value_tickets_closed']
+COLLABORATION_FEATURES = ['avg_sentiment', 'response_ratio']
+MODEL_FEATURES = {
+    'burnout': BURNOUT_FEATURES,
+    'productivity': PRODUCTIVITY_FEATURES,
+    'collaboration': COLLABORATION_FEATURES,
+}
+
+# Bounded pool for model inference from async views: predict() is CPU-bound, so it must not
+# run on the event loop, and an unbounded pool would let a burst of requests oversubscribe the CPU
+INFERENCE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'TEAMPULSE_INFERENCE_WORKERS', 4), thread_name_prefix='inference'
+)
+
+
+def with_work_hour_fields(commits):
+    """Annotates a Commit queryset with the local hour and weekday of each commit.
+
+    Hours and weekdays are extracted by the database in TIMEZONE. ExtractWeekDay counts
+    1=Sunday .. 7=Saturday, unlike Python's weekday() (0=Monday .. 6=Sunday).
+    """
+    return commits.annotate(
+        commit_hour=ExtractHour('timestamp', tzinfo=TIMEZONE),
+        commit_weekday=ExtractWeekDay('timestamp', tzinfo=TIMEZONE),
+    )
+
+
+def work_hour_aggregates():
+    """Conditional aggregates counting all, after-hours and weekend commits in one pass."""
+    sql_weekends = [(day + 1) % 7 + 1 for day in WEEKENDS]
+    return {
+        'total_commits': Count('id'),
+        'after_hours_commits': Count('id', filter=Q(commit_hour__lt=START_HOUR) | Q(commit_hour__gte=END_HOUR)),
+        'weekend_commits': Count('id', filter=Q(commit_weekday__in=sql_weekends)),
+    }
+
+
+def analysis_start_day(days=ANALYSIS_WINDOW_DAYS):
+    """Returns the first day (in TIMEZONE) of the rolling analysis window."""
+    return (datetime.now(TIMEZONE) - timedelta(days=days)).date()
+
+
+def window_activity(activity_rows):
+    """Restricts DeveloperDailyActivity rows to the analysis window."""
+    return activity_rows.filter(date__gte=analysis_start_day())
+
+
+def activity_totals():
+    """Aggregates needed to turn daily rollup rows into features."""
+    return {
+        'total_commits': Sum('commit_count'),
+        'after_hours_commits': Sum('after_hours_commit_count'),
+        'weekend_commits': Sum('weekend_commit_count'),
+        'total_added': Sum('lines_added'),
+        'total_removed': Sum('lines_removed'),
+        'tickets_closed': Sum('tickets_closed'),
+        'high_value_tickets_closed': Sum('high_value_tickets_closed'),
+        'closed_ticket_hours': Sum('closed_ticket_hours'),
+        'sentiment_sum': Sum('sentiment_sum'),
+        'sentiment_count': Sum('sentiment_count'),
+        'messages_received': Sum('messages_received'),
+        'quick_responses_received': Sum('quick_responses_received'),
+    }
+
 
+def features_from_totals(totals, open_tickets=0):
+    """Builds the burnout, productivity and collaboration features from summed rollup rows.
+
+    Missing or None totals (no activity in the window) count as zero.
+    """
+    totals = {key: totals.get(key) or 0 for key in activity_totals()}
+    total_commits = totals['total_commits']
+    tickets_closed = totals['tickets_closed']
+
+    return {
+        # Burnout
+        'after_hours_ratio': totals['after_hours_commits'] / total_commits if total_commits > 0 else 0,
+        'weekend_ratio': totals['weekend_commits'] / total_commits if total_commits > 0 else 0,
+        'open_tickets': open_tickets,
+        'avg_time_spent': float(totals['closed_ticket_hours']) / tickets_closed if tickets_closed > 0 else 0.0,
+        # Productivity
+        'total_lines_changed': totals['total_added'] + totals['total_removed'],
+        'high_value_tickets_closed': totals['high_value_tickets_closed'],
+        # Collaboration
+        'avg_sentiment': float(totals['sentiment_sum']) / totals['sentiment_count'] if totals['sentiment_count'] > 0 else 0.0,
+        'response_ratio': totals['quick_responses_received'] / totals['messages_received'] if totals['messages_received'] > 0 else 0.0,
+    }
+
+
+def _developer_window_totals(developer_id):
+    """Sums a developer's rolled-up activity over the analysis window (None if not found)."""
+    if not Developer.objects.filter(pk=developer_id).exists():
+        return None
+    return window_activity(DeveloperDailyActivity.objects.filter(developer_id=developer_id)).aggregate(**activity_totals())
+
+
+@ML_STAGE_SECONDS.timed(model='burnout', stage='features')
 def calculate_single_developer_features(developer_id):
     """Calculates all ML features for a specific developer."""
-    try:
-        dev = Developer.objects.get(pk=developer_id)
-    except Developer.DoesNotExist:
+    # --- FEATURES 1 & 3: WORK-LIFE BALANCE and TIME ON CLOSED TICKETS (from the daily rollup) ---
+    totals = _developer_window_totals(developer_id)
+    if totals is None:
         return None  # Return None if developer isn't found
 
-    analysis_start_date = datetime.now(TIMEZONE) - timedelta(days=30)
-    
-    # --- FEATURE 1: WORK-LIFE BALANCE (Commits outside work hours) ---
-    recent_commits = dev.commit_set.filter(timestamp__gte=analysis_start_date)
-    after_hours_commits = 0
-    weekend_commits = 0
-    total_commits = recent_commits.count()
-
-    for commit in recent_commits:
-        commit_hour = commit.timestamp.astimezone(TIMEZONE).hour
-        commit_day = commit.timestamp.astimezone(TIMEZONE).weekday()
-
-        if commit_hour < START_HOUR or commit_hour >= END_HOUR:
-            after_hours_commits += 1
-        
-        if commit_day in WEEKENDS:
-            weekend_commits += 1
-
-    after_hours_ratio = after_hours_commits / total_commits if total_commits > 0 else 0
-    weekend_ratio = weekend_commits / total_commits if total_commits > 0 else 0
-
-    # --- FEATURE 2: CURRENT LOAD (Open Tickets & Avg Time) ---
-    open_tickets = dev.assigned_tickets.exclude(status__in=['Done', 'Closed']).count()
-    
-    closed_tickets = dev.assigned_tickets.filter(status__in=['Done', 'Closed'], closed_at__gte=analysis_start_date)
-    # Use Django's Avg aggregation here (requires models.py import)
-    avg_time_spent = closed_tickets.aggregate(Avg('time_spent_hours'))['time_spent_hours__avg'] or 0.0
-
-    # Ensure avg_time_spent is a float, not Decimal or None
-    if avg_time_spent is None:
-        avg_time_spent = 0.0
-    avg_time_spent = float(avg_time_spent)
-    
+    # --- FEATURE 2: CURRENT LOAD (Open Tickets) ---
+    # Current state rather than a window, so it is read from the tickets themselves
+    open_tickets = JiraTicket.objects.filter(assignee_id=developer_id).exclude(status__in=CLOSED_STATUSES).count()
+
+    features = features_from_totals(totals, open_tickets)
+
     # Return features dictionary
-    return {
-        'after_hours_ratio': after_hours_ratio,
-        'weekend_ratio': weekend_ratio,
-        'open_tickets': open_tickets,
-        'avg_time_spent': avg_time_spent,
-    }
+    return {feature: features[feature] for feature in BURNOUT_FEATURES}
 
 def get_burnout_risk(developer_data_dict):
     """Loads the model and predicts the burnout risk for a single developer."""
+    return predict_one('burnout', developer_data_dict)
+
+
+def get_burnout_risks(developer_data_list):
+    """Predicts the burnout risk for many developers in one call."""
 
     try:
-        # 1. Load the model
-        model = load(MODEL_PATH)
+        # 1. Get the model (loaded once per process by the registry)
+        model = model_registry.get('burnout')
     except FileNotFoundError:
         return {'error': 'ML model not found. Run the training script first.'}, 500
 
     # 2. Prepare the input data (must match the features used for training!)
-    # The input data should be a dictionary from the developer view
+    # One row per developer, columns in training order
     try:
-        input_df = pd.DataFrame([developer_data_dict])
-
-        # Ensure columns are in the exact order the model expects
-        features = ['after_hours_ratio', 'weekend_ratio', 'open_tickets', 'avg_time_spent']
-
-        # Select and reorder the required columns
-        X_predict = input_df[features]
-
+        X_predict = feature_matrix(developer_data_list, BURNOUT_FEATURES, model)
     except KeyError as e:
         return {'error': f'Missing feature in input data: {e}'}, 400
 
 
-    # 3. Predict the result
-    prediction = model.predict(X_predict)[0]
-    # Get the probability (optional, but gives a score)
-    probability = model.predict_proba(X_predict)[0][1] # Probability of risk (class 1)
+    # 3. Predict the results (one vectorized call per method)
+    with ML_STAGE_SECONDS.time(model='burnout', stage='inference'):
+        predictions = model.predict(X_predict)
+        # Get the probability (optional, but gives a score)
+        probabilities = model.predict_proba(X_predict)[:, 1] # Probability of risk (class 1)
+    PREDICTIONS.inc(len(predictions), model='burnout')
 
     # 4. Return the results
-    return {
-        'risk_level': 'High' if prediction == 1 else 'Low',
-        'risk_score': round(float(probability) * 100, 2)
-    }, 200
+    return [
+        {
+            'risk_level': 'High' if prediction == 1 else 'Low',
+            'risk_score': round(float(probability) * 100, 2)
+        }
+        for prediction, probability in zip(predictions, probabilities)
+    ], 200
 
 
+@ML_STAGE_SECONDS.timed(model='productivity', stage='features')
 def calculate_productivity_features(developer_id):
     """Calculates all ML features for a specific developer for Productivity."""
-    try:
-        dev = Developer.objects.get(pk=developer_id)
-    except Developer.DoesNotExist:
+    # --- COMMIT VOLUME and HIGH-VALUE TICKET THROUGHPUT (from the daily rollup) ---
+    totals = _developer_window_totals(developer_id)
+    if totals is None:
         return None
 
-    analysis_start_date = datetime.now(TIMEZONE) - timedelta(days=30) 
-    
-    # --- FEATURE 1: COMMIT VOLUME ---
-    commit_metrics = dev.commit_set.filter(timestamp__gte=analysis_start_date).aggregate(
-        total_added=Sum('lines_added'), 
-        total_removed=Sum('lines_removed')
-    )
-    total_lines_changed = (commit_metrics.get('total_added') or 0) + \
-                          (commit_metrics.get('total_removed') or 0)
-
-    # --- FEATURE 2: TICKET THROUGHPUT (High-Value) ---
-    high_value_tickets_closed = dev.assigned_tickets.filter(
-        Q(status='Done') | Q(status='Closed'), 
-        closed_at__gte=analysis_start_date,
-        story_points__gt=5  # Focus on high-value tickets
-    ).count()
+    features = features_from_totals(totals)
 
     # Return features dictionary
-    return {
-        'total_lines_changed': total_lines_changed,
-        'high_value_tickets_closed': high_value_tickets_closed,
-    }
+    return {feature: features[feature] for feature in PRODUCTIVITY_FEATURES}
 
 
 def get_productivity_score(developer_data_dict):
     """Loads the productivity model and predicts the score."""
+    return predict_one('productivity', developer_data_dict)
+
+
+def get_productivity_scores(developer_data_list):
+    """Predicts the productivity scores for many developers in one call."""
     try:
-        model = load(PROD_MODEL_PATH)
+        model = model_registry.get('productivity')
     except FileNotFoundError:
         return {'error': 'Productivity model not found. Run training script.'}, 500
 
     try:
-        input_df = pd.DataFrame([developer_data_dict])
-        features = ['total_lines_changed', 'high_value_tickets_closed']
-        X_predict = input_df[features]
+        X_predict = feature_matrix(developer_data_list, PRODUCTIVITY_FEATURES, model)
     except KeyError as e:
         return {'error': f'Missing feature: {e}'}, 400
 
-    # Prediction returns a raw value
-    raw_prediction = model.predict(X_predict)[0]
-    
-    # Normalize the score to a 0-100 scale (simple clipping for demo)
-    normalized_score = max(0, min(100, int(raw_prediction / 100)))  # Divide by 100 to keep it manageable
+    # Prediction returns a raw value per developer
+    with ML_STAGE_SECONDS.time(model='productivity', stage='inference'):
+        raw_predictions = model.predict(X_predict)
+    PREDICTIONS.inc(len(raw_predictions), model='productivity')
 
-    return {
-        'score': normalized_score,
-        'status': 'High' if normalized_score >= 80 else 'Medium' if normalized_score >= 50 else 'Low'
-    }, 200
+    results = []
+    for raw_prediction in raw_predictions:
+        # Normalize the score to a 0-100 scale (simple clipping for demo)
+        normalized_score = max(0, min(100, int(raw_prediction / 100)))  # Divide by 100 to keep it manageable
+        results.append({
+            'score': normalized_score,
+            'status': 'High' if normalized_score >= 80 else 'Medium' if normalized_score >= 50 else 'Low'
+        })
+
+    return results, 200
 
 
+@ML_STAGE_SECONDS.timed(model='collaboration', stage='features')
 def calculate_collaboration_features(developer_id):
     """Calculates all ML features for a specific developer for Collaboration."""
-    try:
-        dev = Developer.objects.get(pk=developer_id)
-    except Developer.DoesNotExist:
+    # --- AVERAGE SENTIMENT and RESPONSE RATIO (from the daily rollup) ---
+    totals = _developer_window_totals(developer_id)
+    if totals is None:
         return None
 
-    analysis_start_date = datetime.now(TIMEZONE) - timedelta(days=30) 
-    
-    # --- FEATURE 1: AVERAGE SENTIMENT ---
-    sent_messages = dev.sent_messages.filter(timestamp__gte=analysis_start_date)
-    
-    # FIX: Use get() and set a default of 0.0 before casting
-    avg_sentiment_value = sent_messages.aggregate(Avg('sentiment_score'))['sentiment_score__avg']
-    avg_sentiment = float(avg_sentiment_value) if avg_sentiment_value is not None else 0.0
+    features = features_from_totals(totals)
 
-    # --- FEATURE 2: RESPONSE RATIO ---
-    received_messages = dev.received_messages.filter(timestamp__gte=analysis_start_date)
-    
-    total_received = received_messages.count()
-    quick_responses = received_messages.filter(is_quick_response=True).count()
-    
-    response_ratio = quick_responses / total_received if total_received > 0 else 0.0
-    
     # Return features dictionary
-    return {
-        'avg_sentiment': avg_sentiment, # Now guaranteed to be float
-        'response_ratio': response_ratio,
-    }
+    return {feature: features[feature] for feature in COLLABORATION_FEATURES}
 
 
 def get_collaboration_score(developer_data_dict):
     """Loads the collaboration model and predicts the score."""
+    return predict_one('collaboration', developer_data_dict)
+
+
+def get_collaboration_scores(developer_data_list):
+    """Predicts the collaboration scores for many developers in one call."""
     try:
-        model = load(COLLAB_MODEL_PATH)
+        model = model_registry.get('collaboration')
     except FileNotFoundError:
         return {'error': 'Collaboration model not found. Run training script.'}, 500
 
     try:
-        input_df = pd.DataFrame([developer_data_dict])
-        features = ['avg_sentiment', 'response_ratio']
-        X_predict = input_df[features]
+        X_predict = feature_matrix(developer_data_list, COLLABORATION_FEATURES, model)
     except KeyError as e:
         return {'error': f'Missing feature: {e}'}, 400
 
-    # Prediction returns a class (0, 1, or 2)
-    prediction_class = model.predict(X_predict)[0]
+    # Prediction returns a class (0, 1, or 2) per developer
+    with ML_STAGE_SECONDS.time(model='collaboration', stage='inference'):
+        prediction_classes = model.predict(X_predict)
+    PREDICTIONS.inc(len(prediction_classes), model='collaboration')
     
     # Map class index to a meaningful label and score
     label_map = {
@@ -216,6 +327,169 @@ def get_collaboration_score(developer_data_dict):
         0: {'status': 'Low', 'score': 30},
     }
     
-    result = label_map.get(prediction_class, {'status': 'Error', 'score': 0})
+    results = [
+        dict(label_map.get(prediction_class, {'status': 'Error', 'score': 0}))
+        for prediction_class in prediction_classes
+    ]
     
-    return result, 200
\ No newline at end of file
+    return results, 200
+
+
+@ML_STAGE_SECONDS.timed(model='team', stage='features')
+def calculate_team_features(developer_ids):
+    """Calculates burnout, productivity and collaboration features for many developers at once.
+
+    Uses one grouped query over the daily rollup plus one for open tickets, however many
+    developers are requested. Returns a dict mapping developer_id -> features dictionary
+    (all three models' features).
+    """
+    developer_ids = list(developer_ids)
+    if not developer_ids:
+        return {}
+
+    totals_by_developer = {
+        row.pop('developer_id'): row
+        for row in window_activity(DeveloperDailyActivity.objects.filter(developer_id__in=developer_ids))
+        .values('developer_id').annotate(**activity_totals()).order_by()
+    }
+
+    # Current load is a point-in-time count, not part of the rollup
+    open_tickets = dict(
+        JiraTicket.objects.filter(assignee_id__in=developer_ids).exclude(status__in=CLOSED_STATUSES)
+        .values('assignee_id').annotate(open_tickets=Count('id')).values_list('assignee_id', 'open_tickets').order_by()
+    )
+
+    return {
+        dev_id: features_from_totals(totals_by_developer.get(dev_id, {}), open_tickets.get(dev_id, 0))
+        for dev_id in developer_ids
+    }
+
+
+# --- Single-row predictions (micro-batched) ---
+
+# model -> vectorized predictor
+BATCH_PREDICTORS = {
+    'burnout': get_burnout_risks,
+    'productivity': get_productivity_scores,
+    'collaboration': get_collaboration_scores,
+}
+
+def new_inference_batcher(model):
+    """An InferenceBatcher for `model` with the configured batch size and wait."""
+    return InferenceBatcher(
+        model, BATCH_PREDICTORS[model],
+        max_batch_size=getattr(settings, 'TEAMPULSE_INFERENCE_BATCH_SIZE', DEFAULT_MAX_BATCH_SIZE),
+        max_wait=getattr(settings, 'TEAMPULSE_INFERENCE_BATCH_WAIT', DEFAULT_MAX_WAIT),
+    )
+
+
+# Concurrent single-row predictions are coalesced into one vectorized call per model
+inference_batchers = {
+    model: new_inference_batcher(model) for model in BATCH_PREDICTORS
+} if getattr(settings, 'TEAMPULSE_INFERENCE_BATCHING', False) else {}
+
+
+def predict_one(model, features):
+    """Predicts one developer's `model` score, through the model's batcher when batching is on."""
+    batcher = inference_batchers.get(model)
+    if batcher is not None:
+        return batcher.predict(features)
+    return predict_unbatched(model, features)
+
+
+def predict_unbatched(model, features):
+    """Predicts one developer's `model` score with a one-row vectorized call."""
+    results, status_code = BATCH_PREDICTORS[model]([features])
+    if status_code != 200:
+        return results, status_code
+    return results[0], status_code
+
+
+def warm_up():
+    """Loads every trained model and runs one prediction through it, so the first request
+    doesn't pay for imports and deserialization. Returns the models that are not trained yet.
+    """
+    untrained = []
+    for name, features in MODEL_FEATURES.items():
+        try:
+            model = model_registry.get(name)
+        except FileNotFoundError:
+            untrained.append(name)
+            continue
+        model.predict(feature_matrix([dict.fromkeys(features, 0)], features, model))
+    return untrained
+
+
+def score_developers(developer_ids):
+    """Scores many developers with all three models.
+
+    Returns a dict mapping developer_id -> {'burnout', 'productivity', 'collaboration'} results,
+    making one vectorized prediction per model.
+    """
+    team_features = calculate_team_features(developer_ids)
+    developer_ids = list(team_features)
+    feature_rows = [team_features[dev_id] for dev_id in developer_ids]
+
+    scores = {dev_id: {} for dev_id in developer_ids}
+    if not feature_rows:
+        return scores, 200
+
+    scorers = [
+        ('burnout', get_burnout_risks, BURNOUT_FEATURES),
+        ('productivity', get_productivity_scores, PRODUCTIVITY_FEATURES),
+        ('collaboration', get_collaboration_scores, COLLABORATION_FEATURES),
+    ]
+    for name, scorer, feature_names in scorers:
+        results, status_code = scorer(feature_rows)
+        if status_code != 200:
+            return results, status_code
+
+        for dev_id, dev_features, result in zip(developer_ids, feature_rows, results):
+            result['features'] = {feature: dev_features[feature] for feature in feature_names}
+            scores[dev_id][name] = result
+
+    return scores, 200
+
+
+# --- Async variants (for the ASGI views) ---
+
+def _query_on_own_connection(query):
+    """Runs a sync ORM query and closes the calling thread's connections afterwards."""
+    try:
+        return query()
+    finally:
+        connections.close_all()
+
+
+async def acalculate_features(model, developer_id):
+    """Async calculate_*_features(): the independent queries (developer lookup, rollup sums and,
+    for burnout, the open-ticket count) run at the same time, each on a thread and database
+    connection of its own (the async ORM would run them one by one on its single sync thread).
+
+    Returns the features of `model`, or None if the developer isn't found.
+    """
+    queries = [
+        Developer.objects.filter(pk=developer_id).exists,
+        lambda: window_activity(DeveloperDailyActivity.objects.filter(developer_id=developer_id)).aggregate(**activity_totals()),
+    ]
+    if 'open_tickets' in MODEL_FEATURES[model]:
+        queries.append(JiraTicket.objects.filter(assignee_id=developer_id).exclude(status__in=CLOSED_STATUSES).count)
+
+    with ML_STAGE_SECONDS.time(model=model, stage='features'):
+        run = sync_to_async(_query_on_own_connection, thread_sensitive=False)
+        exists, totals, *open_tickets = await asyncio.gather(*(run(query) for query in queries))
+
+    if not exists:
+        return None
+    features = features_from_totals(totals, *open_tickets)
+    return {feature: features[feature] for feature in MODEL_FEATURES[model]}
+
+
+async def apredict(model, features):
+    """Async predict_one(): awaits the batcher, or runs the prediction in INFERENCE_EXECUTOR,
+    without blocking the event loop.
+    """
+    batcher = inference_batchers.get(model)
+    if batcher is not None:
+        return await asyncio.wrap_future(batcher.submit(features))
+    return await asyncio.get_running_loop().run_in_executor(INFERENCE_EXECUTOR, predict_one, model, features)
@@ -0,0 +1,140 @@
+# core/model_registry.py
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+from core.metrics import MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# How often (in seconds) a request may stat() an artifact to look for a retrained model
+DEFAULT_CHECK_INTERVAL = 2.0
+
+
+def load_joblib(payload):
+    # Imported here: only needed for scikit-learn artifacts, and joblib pulls in a lot at import time
+    from joblib import load
+    return load(io.BytesIO(payload))
+
+
+LoadedModel = namedtuple('LoadedModel', ['model', 'version', 'path', 'mtime_ns', 'size', 'loaded_at'])
+
+
+class ModelRegistry:
+    """Keeps each model artifact loaded once per process and hot-reloads it when the file changes.
+
+    Requests only pay a cheap (and rate-limited) os.stat(); the artifact is read from disk
+    once at first use and again only when its mtime/size changes *and* its content hash differs.
+    The new model is fully deserialized before it replaces the old one, so readers always see
+    a complete model.
+
+    `loaders` maps a file extension to a function turning the artifact's bytes into a model;
+    anything else is read with joblib.
+    """
+
+    def __init__(self, check_interval=DEFAULT_CHECK_INTERVAL, loaders=None):
+        self.check_interval = check_interval
+        self.loaders = loaders or {}
+        self._paths = {}
+        self._entries = {}
+        self._last_checked = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, *paths):
+        """Registers a model artifact under a short name (e.g. 'burnout').
+
+        Given several paths, the first one that exists is served (e.g. a compact export
+        ahead of the original joblib file).
+        """
+        self._paths[name] = [str(path) for path in paths]
+
+    def get(self, name):
+        """Returns the loaded model, loading or reloading it if needed.
+
+        Raises FileNotFoundError if the artifact has never been trained.
+        """
+        return self._get_entry(name).model
+
+    def version(self, name):
+        """Returns the content-hash version of the loaded model."""
+        return self._get_entry(name).version
+
+    def status(self):
+        """Describes every registered model (loaded or not) for reporting."""
+        report = {}
+        for name, paths in self._paths.items():
+            entry = self._entries.get(name)
+            report[name] = {
+                'path': entry.path if entry else paths[0],
+                'loaded': entry is not None,
+                'version': entry.version if entry else None,
+                'loaded_at': entry.loaded_at if entry else None,
+            }
+        return report
+
+    def _get_entry(self, name):
+        entry = self._entries.get(name)
+        now = time.monotonic()
+
+        if entry is not None and now - self._last_checked.get(name, 0.0) < self.check_interval:
+            return entry
+
+        try:
+            path, stat = self._find_artifact(name)
+        except FileNotFoundError:
+            if entry is not None:
+                # Artifact is being replaced (or was removed): keep serving what we have
+                return entry
+            raise
+        self._last_checked[name] = now
+
+        if entry is not None and (path, stat.st_mtime_ns, stat.st_size) == (entry.path, entry.mtime_ns, entry.size):
+            return entry
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            entry = self._entries.get(name)
+            if entry is not None and (path, stat.st_mtime_ns, stat.st_size) == (entry.path, entry.mtime_ns, entry.size):
+                return entry
+            with MODEL_LOAD_SECONDS.time(model=name):
+                return self._load(name, path, entry)
+
+    def _find_artifact(self, name):
+        """Returns (path, stat) of the first registered path that exists."""
+        for path in self._paths[name]:
+            try:
+                return path, os.stat(path)
+            except FileNotFoundError:
+                continue
+        raise FileNotFoundError(f"No artifact for model '{name}' at {', '.join(self._paths[name])}.")
+
+    def _load(self, name, path, previous):
+        with open(path, 'rb') as artifact:
+            stat = os.fstat(artifact.fileno())
+            payload = artifact.read()
+        version = hashlib.sha256(payload).hexdigest()[:12]
+
+        if previous is not None and previous.version == version:
+            # File was touched but the content is unchanged: no need to deserialize again
+            entry = previous._replace(path=path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            loader = self.loaders.get(os.path.splitext(path)[1], load_joblib)
+            try:
+                model = loader(payload)
+            except Exception:
+                if previous is None:
+                    raise
+                # A half-written artifact must never take down a serving model
+                logger.exception("Failed to reload model '%s' from %s; keeping version %s.", name, path, previous.version)
+                return previous
+            entry = LoadedModel(model, version, path, stat.st_mtime_ns, stat.st_size, time.time())
+            if previous is not None:
+                logger.info("Reloaded model '%s': %s -> %s", name, previous.version, version)
+
+        # Swapping the dict entry is atomic, so concurrent readers see either the old or the new model
+        self._entries[name] = entry
+        return entry
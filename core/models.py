@@ -12,7 +12,8 @@ class Developer(models.Model):
 
 class Commit(models.Model):
     """A model to store a code commit."""
-    developer = models.ForeignKey(Developer, on_delete=models.CASCADE)
+    # Indexed by commit_developer_time_idx (leading column), so no separate FK index
+    developer = models.ForeignKey(Developer, on_delete=models.CASCADE, db_index=False)
     hash_id = models.CharField(max_length=40, unique=True)
     message = models.TextField()
     lines_added = models.IntegerField(default=0)
@@ -22,9 +23,28 @@ class Commit(models.Model):
     # Simple flags for ML feature engineering later
     is_merge = models.BooleanField(default=False) 
 
+    # Where the commit was ingested from (e.g. 'owner/name' on GitHub), blank if unknown
+    repository = models.CharField(max_length=255, blank=True, default='')
+    # True while lines_added/lines_removed still await a per-commit stats lookup
+    stats_pending = models.BooleanField(default=False)
+
     # Link to Jira ticket
     ticket = models.ForeignKey('JiraTicket', on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Feature/rollup queries: one developer's commits in a time range
+            models.Index(fields=['developer', 'timestamp'], name='commit_developer_time_idx'),
+            # Commit list: newest first, keyset-paginated on (timestamp, id)
+            models.Index(fields=['timestamp', 'id'], name='commit_time_idx'),
+            # Stats enrichment: the (few) commits of a repository still missing line counts
+            models.Index(
+                fields=['repository', 'id'],
+                name='commit_stats_pending_idx',
+                condition=models.Q(stats_pending=True),
+            ),
+        ]
+
     def __str__(self):
         return f"Commit {self.hash_id[:7]} by {self.developer.name}"
 
@@ -37,7 +57,8 @@ class JiraTicket(models.Model):
         'Developer', 
         on_delete=models.SET_NULL, 
         null=True, 
-        related_name='assigned_tickets'
+        related_name='assigned_tickets',
+        db_index=False,  # Covered by ticket_assignee_status_idx
     )
     status = models.CharField(max_length=50)  # e.g., 'To Do', 'In Progress', 'Done'
     story_points = models.IntegerField(null=True, blank=True)
@@ -47,6 +68,20 @@ class JiraTicket(models.Model):
     # Track the time spent actively working on it (for burnout/load)
     time_spent_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
 
+    class Meta:
+        indexes = [
+            # Current load: a developer's tickets by status (open = not Done/Closed)
+            models.Index(fields=['assignee', 'status'], name='ticket_assignee_status_idx'),
+            # Ticket list: newest first, keyset-paginated on (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='ticket_created_idx'),
+            # Throughput: only closed tickets, by assignee and close date
+            models.Index(
+                fields=['assignee', 'closed_at'],
+                name='ticket_assignee_closed_idx',
+                condition=models.Q(status__in=['Done', 'Closed']),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.ticket_key}: {self.title}"
 
@@ -56,7 +91,8 @@ class ChatData(models.Model):
     sender = models.ForeignKey(
         'Developer', 
         on_delete=models.CASCADE, 
-        related_name='sent_messages'
+        related_name='sent_messages',
+        db_index=False,  # Covered by chat_sender_time_idx
     )
     recipient = models.ForeignKey(
         'Developer', 
@@ -64,7 +100,8 @@ class ChatData(models.Model):
         null=True, 
         blank=True,
         related_name='received_messages',
-        help_text="Null for channel messages."
+        help_text="Null for channel messages.",
+        db_index=False,  # Covered by chat_recipient_time_idx
     )
     timestamp = models.DateTimeField()
     # Length of the message (a simple proxy for communication style)
@@ -75,5 +112,77 @@ class ChatData(models.Model):
     # A simple indicator of whether the message was a quick reply
     is_quick_response = models.BooleanField(default=False) 
 
+    class Meta:
+        indexes = [
+            # Sentiment: messages a developer sent in a time range
+            models.Index(fields=['sender', 'timestamp'], name='chat_sender_time_idx'),
+            # Chat list: newest first, keyset-paginated on (timestamp, id)
+            models.Index(fields=['timestamp', 'id'], name='chat_time_idx'),
+            # Response ratio: messages a developer received in a time range (and the quick replies among them)
+            models.Index(fields=['recipient', 'timestamp'], name='chat_recipient_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Chat from {self.sender.name} at {self.timestamp.time()}"
+
+
+class DeveloperDailyActivity(models.Model):
+    """A per-developer, per-day rollup of raw activity, used to compute ML features.
+
+    Rows are kept up to date incrementally by core.rollups and can be rebuilt from
+    scratch with the `rebuild_daily_activity` management command. Days are in the
+    feature TIMEZONE (see core.ml_services).
+    """
+    developer = models.ForeignKey(Developer, on_delete=models.CASCADE, related_name='daily_activity')
+    date = models.DateField()
+
+    # Commits authored that day
+    commit_count = models.IntegerField(default=0)
+    after_hours_commit_count = models.IntegerField(default=0)
+    weekend_commit_count = models.IntegerField(default=0)
+    lines_added = models.IntegerField(default=0)
+    lines_removed = models.IntegerField(default=0)
+
+    # Tickets closed ('Done'/'Closed') that day, split by story-point bucket
+    tickets_closed = models.IntegerField(default=0)
+    high_value_tickets_closed = models.IntegerField(default=0)  # story_points > 5
+    closed_ticket_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # Chat messages sent and received that day
+    messages_sent = models.IntegerField(default=0)
+    sentiment_sum = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    sentiment_count = models.IntegerField(default=0)  # Sent messages that have a sentiment score
+    messages_received = models.IntegerField(default=0)
+    quick_responses_received = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['developer', 'date'], name='unique_developer_daily_activity'),
+        ]
+
+    def __str__(self):
+        return f"Activity of {self.developer.name} on {self.date}"
+
+
+class SyncState(models.Model):
+    """Where the last ingest run for a repository stopped, so the next one only asks for what is new."""
+    SOURCE_CHOICES = [
+        ('github', 'GitHub API'),
+        ('git', 'Local git repository'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    repository = models.CharField(max_length=255)  # e.g. 'owner/name' for GitHub, a path for local repos
+    last_commit_sha = models.CharField(max_length=40, blank=True)
+    last_commit_at = models.DateTimeField(null=True, blank=True)
+    # Validator of the last listing response, sent back as If-None-Match
+    etag = models.CharField(max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'repository'], name='unique_sync_state_repository'),
+        ]
+
     def __str__(self):
-        return f"Chat from {self.sender.name} at {self.timestamp.time()}"
\ No newline at end of file
+        return f"{self.source}:{self.repository} @ {self.last_commit_sha[:7] or 'never synced'}"
@@ -0,0 +1,93 @@
+# core/numpy_models.py
+"""Scikit-learn models exported as plain NumPy arrays (.npz), and predicting from them.
+
+Serving only needs this module (and NumPy); scikit-learn is needed to export, not to predict.
+"""
+import io
+
+import numpy as np
+
+
+def export_model_params(model, feature_names, path, version=''):
+    """Writes a fitted LogisticRegression, LinearRegression or KNeighborsClassifier as NumPy arrays.
+
+    `version` is an optional training stamp stored alongside. Raises ValueError for models
+    (or options) NumpyModel cannot reproduce.
+    """
+    model_type = type(model).__name__
+    arrays = {'features': np.array(feature_names), 'version': version}
+    if model_type == 'LogisticRegression':
+        arrays.update(kind='logistic', coef=model.coef_, intercept=model.intercept_, classes=model.classes_)
+    elif model_type == 'LinearRegression':
+        arrays.update(kind='linear', coef=model.coef_, intercept=model.intercept_)
+    elif model_type == 'KNeighborsClassifier':
+        if model.weights != 'uniform' or model.effective_metric_ != 'euclidean' or model.outputs_2d_:
+            raise ValueError('Only single-output, uniform-weight, euclidean KNN classifiers can be exported.')
+        arrays.update(
+            kind='knn', fit_X=model._fit_X, fit_y=model._y, classes=model.classes_, n_neighbors=model.n_neighbors,
+        )
+    else:
+        raise ValueError(f'Cannot export a {model_type}.')
+
+    with open(path, 'wb') as artifact:
+        np.savez(artifact, **{key: np.asarray(value) for key, value in arrays.items()})
+
+
+class NumpyModel:
+    """predict()/predict_proba() of an exported model, computed with NumPy alone.
+
+    Gives the same outputs as the scikit-learn estimator it was exported from.
+    """
+
+    def __init__(self, arrays):
+        self.kind = str(arrays['kind'])
+        self.features = [str(feature) for feature in arrays['features']]
+        self.version = str(arrays['version']) if 'version' in arrays.files else ''  # Training stamp
+        self.arrays = {key: arrays[key] for key in arrays.files}
+        if self.kind == 'knn':
+            fit_X = self.arrays['fit_X'].astype(float)
+            self.arrays['fit_X'] = fit_X
+            self.arrays['fit_sq_norms'] = np.einsum('ij,ij->i', fit_X, fit_X)
+
+    @classmethod
+    def from_bytes(cls, payload):
+        with np.load(io.BytesIO(payload), allow_pickle=False) as arrays:
+            return cls(arrays)
+
+    def _decision(self, X):
+        return X @ self.arrays['coef'].T + self.arrays['intercept']
+
+    def _neighbor_votes(self, X):
+        """Per row, how many of the k nearest training points fall in each class."""
+        fit_X, k = self.arrays['fit_X'], int(self.arrays['n_neighbors'])
+        # Squared euclidean distances; ties go to the earlier training point, like sklearn's brute force
+        distances = self.arrays['fit_sq_norms'] - 2 * X @ fit_X.T + np.einsum('ij,ij->i', X, X)[:, None]
+        nearest = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        labels = self.arrays['fit_y'][nearest]
+        return (labels[:, :, None] == np.arange(len(self.arrays['classes']))).sum(axis=1)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.kind == 'linear':
+            return self._decision(X)
+        if self.kind == 'knn':
+            return self.arrays['classes'][self._neighbor_votes(X).argmax(axis=1)]
+        decision = self._decision(X)
+        if decision.shape[1] == 1:
+            return self.arrays['classes'][(decision[:, 0] > 0).astype(int)]
+        return self.arrays['classes'][decision.argmax(axis=1)]
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=float)
+        if self.kind == 'knn':
+            votes = self._neighbor_votes(X)
+            return votes / votes.sum(axis=1, keepdims=True)
+        if self.kind != 'logistic':
+            raise AttributeError('predict_proba is only available for classifiers.')
+        decision = self._decision(X)
+        if decision.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-decision[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        # Multinomial: softmax over the classes
+        exp = np.exp(decision - decision.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
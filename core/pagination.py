@@ -0,0 +1,115 @@
+# core/pagination.py
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# `position` holds the ordering fields' values of the row the page starts after
+# (None: the start of the list, or its end when reversed)
+KeysetCursor = namedtuple('KeysetCursor', ['reverse', 'position'])
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination on the whole ordering: the cursor holds every ordering field of the
+    last row seen, and a page is the rows strictly after it in that order.
+
+    DRF's CursorPagination only keys on ordering[0] and counts its way past ties, so rows
+    sharing that value can be skipped or repeated when the list changes between requests.
+    The ordering must be unique (end in the primary key) and use one direction throughout.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request) or KeysetCursor(reverse=False, position=None)
+
+        # A previous page is read backwards from the cursor, then put back in order
+        ordering = [reverse_order(field) for field in self.ordering] if self.cursor.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor.position is not None:
+            queryset = queryset.filter(after(ordering, self.cursor.position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if self.cursor.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = self.cursor.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor.position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Nothing precedes the cursor any more, so the list starts there
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(KeysetCursor(reverse=False, position=self.position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Nothing follows the cursor any more, so the list ends there
+            return self.encode_cursor(KeysetCursor(reverse=True, position=None))
+        return self.encode_cursor(KeysetCursor(reverse=True, position=self.position(self.page[0])))
+
+    def position(self, instance):
+        return [str(getattr(instance, field.lstrip('-'))) for field in self.ordering]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'))
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        position = tokens.get('p')
+        if position is not None and len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return KeysetCursor(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        if cursor.position is not None:
+            tokens['p'] = cursor.position
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+def reverse_order(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def after(ordering, position):
+    """Q for the rows after `position` in `ordering`, e.g. for ('-timestamp', '-id'):
+    timestamp <= t AND (timestamp < t OR (timestamp = t AND id < i)).
+
+    The leading bound on the first field alone lets the database range-scan its index.
+    """
+    fields = [(field.lstrip('-'), 'lt' if field.startswith('-') else 'gt') for field in ordering]
+    later = Q()
+    for i, (field, lookup) in enumerate(fields):
+        ties = {name: value for (name, _), value in zip(fields[:i], position[:i])}
+        later |= Q(**ties, **{f'{field}__{lookup}': position[i]})
+    first, lookup = fields[0]
+    return Q(**{f'{first}__{lookup}e': position[0]}) & later
@@ -0,0 +1,24 @@
+# core/parsers.py
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON (one JSON value per line) into a list."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        records = []
+        for number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line.decode(encoding)))
+            except ValueError as e:
+                raise ParseError(f'NDJSON parse error on line {number}: {e}')
+        return records
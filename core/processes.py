@@ -0,0 +1,14 @@
+# core/processes.py
+# Shared by the process pools of the ingest and training commands. This module deliberately
+# imports nothing from Django at the top, so spawned (not forked) workers can unpickle it
+# before django.setup() has run.
+
+
+def init_worker():
+    """ProcessPoolExecutor initializer: sets Django up in the worker process.
+
+    The parent must close its database connections before starting the pool, so that
+    forked workers open their own instead of sharing the parent's socket.
+    """
+    import django
+    django.setup()
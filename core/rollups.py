@@ -0,0 +1,260 @@
+# core/rollups.py
+import threading
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils.timezone import make_aware
+
+from core.models import Developer, Commit, JiraTicket, ChatData, DeveloperDailyActivity
+from core.ml_services import TIMEZONE, CLOSED_STATUSES, with_work_hour_fields, work_hour_aggregates
+from core.score_cache import invalidate_developers, invalidate_all
+
+# Numeric columns of DeveloperDailyActivity (everything except developer/date)
+ACTIVITY_FIELDS = [
+    'commit_count',
+    'after_hours_commit_count',
+    'weekend_commit_count',
+    'lines_added',
+    'lines_removed',
+    'tickets_closed',
+    'high_value_tickets_closed',
+    'closed_ticket_hours',
+    'messages_sent',
+    'sentiment_sum',
+    'sentiment_count',
+    'messages_received',
+    'quick_responses_received',
+]
+
+# Developers are rebuilt in chunks so a full rebuild never holds the whole table in memory
+REBUILD_CHUNK_SIZE = 500
+
+
+def activity_day(timestamp):
+    """Returns the rollup day (in TIMEZONE) an event timestamp belongs to."""
+    return timestamp.astimezone(TIMEZONE).date()
+
+
+def event_rollup_keys(instance):
+    """Returns the (developer_id, date) rollup rows an event contributes to."""
+    if isinstance(instance, Commit):
+        return {(instance.developer_id, activity_day(instance.timestamp))}
+    if isinstance(instance, JiraTicket):
+        if instance.assignee_id and instance.closed_at and instance.status in CLOSED_STATUSES:
+            return {(instance.assignee_id, activity_day(instance.closed_at))}
+        return set()
+    if isinstance(instance, ChatData):
+        keys = {(instance.sender_id, activity_day(instance.timestamp))}
+        if instance.recipient_id:
+            keys.add((instance.recipient_id, activity_day(instance.timestamp)))
+        return keys
+    return set()
+
+
+def event_developer_ids(instance):
+    """Returns the developers whose scores an event affects (including open-ticket load)."""
+    if isinstance(instance, Commit):
+        return {instance.developer_id}
+    if isinstance(instance, JiraTicket):
+        return {instance.assignee_id} - {None}
+    if isinstance(instance, ChatData):
+        return {instance.sender_id, instance.recipient_id} - {None}
+    return set()
+
+
+def _day_start(day):
+    return make_aware(datetime.combine(day, time.min), TIMEZONE)
+
+
+def _filter_range(queryset, developer_field, time_field, developer_ids, first_day, last_day):
+    """Restricts a raw event queryset to some developers and an inclusive day range."""
+    if developer_ids is not None:
+        queryset = queryset.filter(**{f'{developer_field}__in': developer_ids})
+    if first_day is not None:
+        queryset = queryset.filter(**{f'{time_field}__gte': _day_start(first_day)})
+    if last_day is not None:
+        queryset = queryset.filter(**{f'{time_field}__lt': _day_start(last_day + timedelta(days=1))})
+    return queryset
+
+
+def compute_daily_activity(developer_ids=None, first_day=None, last_day=None):
+    """Aggregates raw Commit/JiraTicket/ChatData rows into per-developer, per-day totals.
+
+    Uses one grouped query per event type. Returns {(developer_id, date): {field: value}}.
+    """
+    activity = {}
+
+    def add(developer_id, day, values):
+        row = activity.setdefault((developer_id, day), dict.fromkeys(ACTIVITY_FIELDS, 0))
+        for field, value in values.items():
+            row[field] += value or 0
+
+    # --- COMMITS (by author, on the commit day) ---
+    commits = _filter_range(Commit.objects.all(), 'developer_id', 'timestamp', developer_ids, first_day, last_day)
+    commit_rows = with_work_hour_fields(commits).annotate(
+        day=TruncDate('timestamp', tzinfo=TIMEZONE)
+    ).values('developer_id', 'day').annotate(
+        lines_added_sum=Sum('lines_added'), lines_removed_sum=Sum('lines_removed'), **work_hour_aggregates()
+    ).order_by()
+    for row in commit_rows:
+        add(row['developer_id'], row['day'], {
+            'commit_count': row['total_commits'],
+            'after_hours_commit_count': row['after_hours_commits'],
+            'weekend_commit_count': row['weekend_commits'],
+            'lines_added': row['lines_added_sum'],
+            'lines_removed': row['lines_removed_sum'],
+        })
+
+    # --- TICKETS (by assignee, on the day they were closed) ---
+    closed_tickets = _filter_range(
+        JiraTicket.objects.filter(status__in=CLOSED_STATUSES, assignee__isnull=False),
+        'assignee_id', 'closed_at', developer_ids, first_day, last_day,
+    )
+    ticket_rows = closed_tickets.annotate(
+        day=TruncDate('closed_at', tzinfo=TIMEZONE)
+    ).values('assignee_id', 'day').annotate(
+        closed=Count('id'),
+        high_value_closed=Count('id', filter=Q(story_points__gt=5)),
+        hours=Sum('time_spent_hours'),
+    ).order_by()
+    for row in ticket_rows:
+        add(row['assignee_id'], row['day'], {
+            'tickets_closed': row['closed'],
+            'high_value_tickets_closed': row['high_value_closed'],
+            'closed_ticket_hours': row['hours'],
+        })
+
+    # --- CHAT SENT (by sender) ---
+    sent_messages = _filter_range(ChatData.objects.all(), 'sender_id', 'timestamp', developer_ids, first_day, last_day)
+    sent_rows = sent_messages.annotate(
+        day=TruncDate('timestamp', tzinfo=TIMEZONE)
+    ).values('sender_id', 'day').annotate(
+        sent=Count('id'), sentiment_total=Sum('sentiment_score'), sentiment_scored=Count('sentiment_score'),
+    ).order_by()
+    for row in sent_rows:
+        add(row['sender_id'], row['day'], {
+            'messages_sent': row['sent'],
+            'sentiment_sum': row['sentiment_total'],
+            'sentiment_count': row['sentiment_scored'],
+        })
+
+    # --- CHAT RECEIVED (by recipient; channel messages have none) ---
+    received_messages = _filter_range(
+        ChatData.objects.filter(recipient__isnull=False), 'recipient_id', 'timestamp', developer_ids, first_day, last_day,
+    )
+    received_rows = received_messages.annotate(
+        day=TruncDate('timestamp', tzinfo=TIMEZONE)
+    ).values('recipient_id', 'day').annotate(
+        received=Count('id'), quick=Count('id', filter=Q(is_quick_response=True)),
+    ).order_by()
+    for row in received_rows:
+        add(row['recipient_id'], row['day'], {
+            'messages_received': row['received'],
+            'quick_responses_received': row['quick'],
+        })
+
+    return activity
+
+
+def refresh_daily_activity(developer_ids=None, first_day=None, last_day=None):
+    """Recomputes the rollup rows for some developers over an inclusive day range.
+
+    None means "all developers" / "unbounded". Existing rows in the range are replaced,
+    so days whose events were all deleted disappear as well.
+    """
+    stale_rows = DeveloperDailyActivity.objects.all()
+    if developer_ids is not None:
+        stale_rows = stale_rows.filter(developer_id__in=developer_ids)
+    if first_day is not None:
+        stale_rows = stale_rows.filter(date__gte=first_day)
+    if last_day is not None:
+        stale_rows = stale_rows.filter(date__lte=last_day)
+
+    with transaction.atomic():
+        activity = compute_daily_activity(developer_ids, first_day, last_day)
+        stale_rows.delete()
+        DeveloperDailyActivity.objects.bulk_create(
+            [
+                DeveloperDailyActivity(developer_id=developer_id, date=day, **values)
+                for (developer_id, day), values in activity.items()
+            ],
+            batch_size=1000,
+        )
+        # Cached scores were computed from the rows just replaced
+        if developer_ids is None:
+            transaction.on_commit(invalidate_all)
+        else:
+            transaction.on_commit(lambda: invalidate_developers(developer_ids))
+    return len(activity)
+
+
+def refresh_for_keys(keys):
+    """Recomputes the rollup for a set of (developer_id, date) pairs touched by new or changed events.
+
+    Only those pairs are recomputed: consecutive days touched by the same developers are
+    refreshed as one range, so a back-dated event (or two developers active on distant
+    days) costs a refresh of just their own days, not the whole span for everyone.
+    """
+    developers_by_day = defaultdict(set)
+    for developer_id, day in keys:
+        developers_by_day[day].add(developer_id)
+
+    runs = []  # [developer_ids, first_day, last_day]
+    for day in sorted(developers_by_day):
+        developer_ids = developers_by_day[day]
+        if runs and runs[-1][0] == developer_ids and runs[-1][2] == day - timedelta(days=1):
+            runs[-1][2] = day
+        else:
+            runs.append([developer_ids, day, day])
+
+    rows = 0
+    with transaction.atomic():
+        for developer_ids, first_day, last_day in runs:
+            rows += refresh_daily_activity(sorted(developer_ids), first_day, last_day)
+    return rows
+
+
+def rebuild_daily_activity(since=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """Rebuilds the whole rollup table (or every day from `since` onwards) from raw events."""
+    developer_ids = list(Developer.objects.order_by('id').values_list('id', flat=True))
+    if since is None:
+        # A full rebuild starts from an empty table
+        DeveloperDailyActivity.objects.all().delete()
+
+    rows = 0
+    for start in range(0, len(developer_ids), chunk_size):
+        rows += refresh_daily_activity(developer_ids[start:start + chunk_size], since, None)
+    return rows
+
+
+# --- Deferred, coalesced refreshes for signal handlers ---
+# Keys touched inside a transaction are collected and refreshed once it commits, so a
+# bulk delete (or a rolled-back write) never re-inserts rows for data that is going away.
+# Every call registers a callback, but the first one to run refreshes all pending keys
+# in one go and the rest find nothing left to do. Keys left over from a rolled-back
+# transaction are simply refreshed (harmlessly) with the next batch.
+_pending = threading.local()
+
+
+def schedule_refresh(keys):
+    """Queues (developer_id, date) pairs for a rollup refresh once the current transaction commits."""
+    keys = {(developer_id, day) for developer_id, day in keys if developer_id is not None}
+    if not keys:
+        return
+
+    pending = getattr(_pending, 'keys', None)
+    if pending is None:
+        pending = _pending.keys = set()
+    pending.update(keys)
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    keys = getattr(_pending, 'keys', None)
+    if not keys:
+        return
+    _pending.keys = set()
+    refresh_for_keys(keys)
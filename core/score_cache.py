@@ -0,0 +1,193 @@
+# core/score_cache.py
+"""Caches developer scores (features + model output) in Django's cache framework.
+
+Every key includes the developer's *generation* token, the analysis window and the model
+version(s). Invalidating a developer just deletes their generation token: the next read
+mints a new one, so every older entry of that developer becomes unreachable until it
+expires or the backend culls it (see CACHES in settings). The window start changes daily
+and the model version on every retrain, which retires stale entries the same way.
+"""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from core.ml_services import (
+    model_registry, analysis_start_day, score_developers, acalculate_features, apredict,
+    calculate_single_developer_features, get_burnout_risk,
+    calculate_productivity_features, get_productivity_score,
+    calculate_collaboration_features, get_collaboration_score,
+)
+
+KEY_PREFIX = 'teampulse'
+TEAM_MODELS = ('burnout', 'productivity', 'collaboration')
+
+# model -> (feature function, predictor)
+SCORERS = {
+    'burnout': (calculate_single_developer_features, get_burnout_risk),
+    'productivity': (calculate_productivity_features, get_productivity_score),
+    'collaboration': (calculate_collaboration_features, get_collaboration_score),
+}
+
+
+def score_cache():
+    return caches[getattr(settings, 'TEAMPULSE_SCORE_CACHE', 'default')]
+
+
+def _generation_key(developer_id):
+    return f'{KEY_PREFIX}:gen:{developer_id}'
+
+
+def generations(developer_ids):
+    """Returns {developer_id: generation token}, minting tokens for developers that have none."""
+    cache = score_cache()
+    keys = {_generation_key(dev_id): dev_id for dev_id in developer_ids}
+    found = cache.get_many(list(keys))
+    tokens = {keys[key]: token for key, token in found.items()}
+
+    missing = [dev_id for dev_id in developer_ids if dev_id not in tokens]
+    if missing:
+        token = str(time.time_ns())
+        for dev_id in missing:
+            # add() keeps a token another process minted in the meantime
+            cache.add(_generation_key(dev_id), token, timeout=None)
+        tokens.update({
+            keys[key]: value for key, value in cache.get_many([_generation_key(dev_id) for dev_id in missing]).items()
+        })
+        # A backend that dropped the token right away: use ours for this request
+        for dev_id in missing:
+            tokens.setdefault(dev_id, token)
+    return tokens
+
+
+def generation(developer_id):
+    return generations([developer_id])[developer_id]
+
+
+def invalidate_developers(developer_ids):
+    """Drops every cached score of these developers."""
+    developer_ids = {dev_id for dev_id in developer_ids if dev_id is not None}
+    if developer_ids:
+        score_cache().delete_many([_generation_key(dev_id) for dev_id in developer_ids])
+
+
+def invalidate_all():
+    score_cache().clear()
+
+
+def _score_key(model, developer_id, token, version):
+    return f'{KEY_PREFIX}:score:{model}:{developer_id}:{analysis_start_day().isoformat()}:{version}:{token}'
+
+
+def _developer_score_key(model, developer_id):
+    try:
+        return _score_key(model, developer_id, generation(developer_id), model_registry.version(model))
+    except FileNotFoundError:
+        return None  # Untrained model: let the predictor report it
+
+
+def developer_score(model, developer_id):
+    """Cached equivalent of calculate_*_features + get_* for one developer and model.
+
+    Returns (result, status_code) where a 200 result includes its 'features', or
+    (None, 404) if the developer does not exist.
+    """
+    calculate_features, predict = SCORERS[model]
+    key = _developer_score_key(model, developer_id)
+    if key is not None:
+        cached = score_cache().get(key)
+        if cached is not None:
+            return cached, 200
+
+    features = calculate_features(developer_id)
+    if features is None:
+        return None, 404
+    result, status_code = predict(features)
+    if status_code != 200:
+        return result, status_code
+
+    result['features'] = features
+    if key is not None:
+        score_cache().set(key, result)
+    return result, 200
+
+
+async def adeveloper_score(model, developer_id):
+    """Async developer_score(): features come from acalculate_features() and the prediction
+    runs in the bounded inference pool, so the event loop never waits on the database or the model.
+    """
+    # May stat (or, on first use, load) the model artifact: keep it off the event loop
+    key = await sync_to_async(_developer_score_key, thread_sensitive=False)(model, developer_id)
+    if key is not None:
+        cached = await score_cache().aget(key)
+        if cached is not None:
+            return cached, 200
+
+    features = await acalculate_features(model, developer_id)
+    if features is None:
+        return None, 404
+    result, status_code = await apredict(model, features)
+    if status_code != 200:
+        return result, status_code
+
+    result['features'] = features
+    if key is not None:
+        await score_cache().aset(key, result)
+    return result, 200
+
+
+def team_scores(developer_ids):
+    """Cached equivalent of score_developers(): only developers without a cached entry are computed."""
+    developer_ids = list(developer_ids)
+    try:
+        version = '-'.join(model_registry.version(model) for model in TEAM_MODELS)
+    except FileNotFoundError:
+        return score_developers(developer_ids)
+
+    cache = score_cache()
+    tokens = generations(developer_ids)
+    keys = {dev_id: _score_key('team', dev_id, tokens[dev_id], version) for dev_id in developer_ids}
+    found = cache.get_many(list(keys.values()))
+    scores = {dev_id: found[keys[dev_id]] for dev_id in developer_ids if keys[dev_id] in found}
+
+    missing = [dev_id for dev_id in developer_ids if dev_id not in scores]
+    if missing:
+        computed, status_code = score_developers(missing)
+        if status_code != 200:
+            return computed, status_code
+        cache.set_many({keys[dev_id]: computed[dev_id] for dev_id in missing})
+        scores.update(computed)
+    return scores, 200
+
+
+# --- ETags ---
+# Built from the same generation tokens and model versions as the cache keys, so checking
+# one costs a cache read and a (rate-limited) stat of the model file, never a feature query.
+
+def _etag(*parts):
+    return '"' + hashlib.sha256(':'.join(str(part) for part in parts).encode()).hexdigest()[:32] + '"'
+
+
+def score_etag(model, developer_id, variant=''):
+    """Strong ETag of a developer's score for `model` (None if the model is not trained).
+
+    `variant` distinguishes representations (e.g. the negotiated media type).
+    """
+    try:
+        version = model_registry.version(model)
+    except FileNotFoundError:
+        return None
+    return _etag(model, developer_id, analysis_start_day().isoformat(), version, generation(developer_id), variant)
+
+
+def team_etag(rows, total, variant=''):
+    """Strong ETag of a /scores/ page: its developers (id, name), the total count and their scores' versions."""
+    try:
+        versions = [model_registry.version(model) for model in TEAM_MODELS]
+    except FileNotFoundError:
+        return None
+    tokens = generations([row['id'] for row in rows])
+    page = [(row['id'], row['name'], tokens[row['id']]) for row in rows]
+    return _etag('team', analysis_start_day().isoformat(), *versions, total, page, variant)
@@ -0,0 +1,42 @@
+# core/signals.py
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import Commit, JiraTicket, ChatData
+from core.rollups import event_rollup_keys, event_developer_ids, schedule_refresh
+from core.score_cache import invalidate_developers
+
+
+@receiver(pre_save, sender=Commit)
+@receiver(pre_save, sender=JiraTicket)
+@receiver(pre_save, sender=ChatData)
+def remember_previous_rollup_keys(sender, instance, raw=False, **kwargs):
+    """On updates, remembers which rollup rows (and developers) the old version of the event counted towards."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    instance._previous_rollup_keys = event_rollup_keys(previous) if previous else set()
+    instance._previous_developer_ids = event_developer_ids(previous) if previous else set()
+
+
+@receiver(post_save, sender=Commit)
+@receiver(post_save, sender=JiraTicket)
+@receiver(post_save, sender=ChatData)
+def refresh_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    keys = event_rollup_keys(instance) | getattr(instance, '_previous_rollup_keys', set())
+    schedule_refresh(keys)
+    # Not every change reaches the rollup (e.g. a ticket opened or reassigned changes open_tickets)
+    developer_ids = event_developer_ids(instance) | getattr(instance, '_previous_developer_ids', set())
+    transaction.on_commit(lambda: invalidate_developers(developer_ids))
+
+
+@receiver(post_delete, sender=Commit)
+@receiver(post_delete, sender=JiraTicket)
+@receiver(post_delete, sender=ChatData)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    schedule_refresh(event_rollup_keys(instance))
+    developer_ids = event_developer_ids(instance)
+    transaction.on_commit(lambda: invalidate_developers(developer_ids))
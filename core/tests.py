@@ -1,3 +1,1556 @@
-from django.test import TestCase
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlencode, urlparse
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from teampulse_backend import settings as project_settings
+
+from . import benchmarks as benchmarks_module, checks, exports, feature_cache, ml_services, score_cache, training
+from .feature_matrix import build_feature_matrix
+from .github import GitHubClient, RateLimitScheduler
+from .gitlog import GitError, iter_git_log
+from .inference_batcher import InferenceBatcher
+from .ingest import enrich_commit_stats, ingest_repository
+from .ml_services import (
+    calculate_single_developer_features, calculate_team_features, model_registry, MODEL_PATHS, MODEL_FEATURES,
+)
+from .model_registry import ModelRegistry
+from .numpy_models import NumpyModel
+from .management.commands.fetch_github_data import format_github_timestamp
+from .models import Developer, Commit, JiraTicket, ChatData, DeveloperDailyActivity, SyncState
+from .rollups import (
+    ACTIVITY_FIELDS, compute_daily_activity, rebuild_daily_activity, refresh_daily_activity, refresh_for_keys,
+)
+from .score_cache import invalidate_all
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked against SQLite EXPLAIN QUERY PLAN output.')
+class FeatureQueryIndexTests(TestCase):
+    """Feature queries must stay index searches so their cost doesn't grow with history."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+
+    def query_plans(self, func, *args):
+        with CaptureQueriesContext(connection) as context:
+            func(*args)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plans.append(' '.join(row[3] for row in cursor.fetchall()))
+        return plans
+
+    def assert_uses_index(self, plans, table, index_name):
+        table_plans = [plan for plan in plans if f' {table} ' in f' {plan} ']
+        self.assertTrue(table_plans, f'No query touched {table}.')
+        for plan in table_plans:
+            self.assertRegex(plan, rf'USING (COVERING )?INDEX {index_name}\b')
+
+    def test_rollup_refresh_uses_composite_indexes(self):
+        today = date.today()
+        plans = self.query_plans(compute_daily_activity, [self.developer.id], today - timedelta(days=30), today)
+
+        self.assert_uses_index(plans, 'core_commit', 'commit_developer_time_idx')
+        self.assert_uses_index(plans, 'core_jiraticket', 'ticket_assignee_closed_idx')
+        sender_plan, recipient_plan = [plan for plan in plans if 'core_chatdata' in plan]
+        self.assertRegex(sender_plan, r'USING (COVERING )?INDEX chat_sender_time_idx\b')
+        self.assertRegex(recipient_plan, r'USING (COVERING )?INDEX chat_recipient_time_idx\b')
+
+    def test_features_use_rollup_and_ticket_indexes(self):
+        plans = self.query_plans(calculate_single_developer_features, self.developer.id)
+
+        self.assert_uses_index(plans, 'core_developerdailyactivity', 'sqlite_autoindex_core_developerdailyactivity_1')
+        self.assert_uses_index(plans, 'core_jiraticket', 'ticket_assignee_status_idx')
+        self.assertFalse([plan for plan in plans if plan.startswith('SCAN')], plans)
+
+
+class ListEndpointQueryTests(TestCase):
+    """Event lists are cursor-paginated and fetch related names in the same query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        developers = [Developer.objects.create(name=f'Dev {i}', email=f'dev{i}@teampulse.com') for i in range(3)]
+        now = timezone.now()
+        for i in range(30):
+            developer = developers[i % 3]
+            # Pairs of rows share a timestamp, so pages must break ties by id
+            at = now - timedelta(minutes=i // 2)
+            Commit.objects.create(developer=developer, hash_id=f'{i:040x}', message='m', timestamp=at)
+            JiraTicket.objects.create(ticket_key=f'T-{i}', title='t', assignee=developer, status='To Do', created_at=at)
+            ChatData.objects.create(sender=developer, timestamp=at)
+
+    def test_pages_cost_one_query_and_cover_every_row(self):
+        for url, model in [('/api/v1/commits/', Commit), ('/api/v1/tickets/', JiraTicket), ('/api/v1/chat/', ChatData)]:
+            seen = []
+            next_url = f'{url}?page_size=7'
+            while next_url:
+                with self.assertNumQueries(1):
+                    page = self.client.get(next_url).json()
+                seen += [row['id'] for row in page['results']]
+                next_url = page['next']
+            self.assertEqual(sorted(seen), sorted(model.objects.values_list('id', flat=True)), url)
+            self.assertEqual(len(seen), len(set(seen)), url)
+
+    def test_ties_across_a_page_boundary_survive_writes(self):
+        developer = Developer.objects.get(email='dev0@teampulse.com')
+        at = timezone.now() + timedelta(hours=1)
+        tied = [ChatData.objects.create(sender=developer, timestamp=at) for _ in range(5)]
+
+        page = self.client.get('/api/v1/chat/?page_size=3').json()
+        self.assertEqual([row['id'] for row in page['results']], [chat.id for chat in reversed(tied)][:3])
+
+        # Rows of the same timestamp come and go before the next page is fetched
+        ChatData.objects.filter(id__in=[tied[4].id, tied[3].id]).delete()
+        newest = ChatData.objects.create(sender=developer, timestamp=at)  # Sorts before the cursor
+        page = self.client.get(page['next']).json()
+        self.assertEqual([row['id'] for row in page['results']][:2], [tied[1].id, tied[0].id])
+
+        # ...and back again: the previous page is the rows before the first one shown
+        previous = self.client.get(page['previous']).json()
+        self.assertEqual([row['id'] for row in previous['results']], [newest.id, tied[2].id])
+        self.assertIsNone(previous['previous'])
+
+    def test_deep_pages_range_scan_the_time_index(self):
+        next_url = self.client.get('/api/v1/chat/?page_size=7').json()['next']
+        executed = []
+        with connection.execute_wrapper(lambda execute, sql, params, *args: executed.append((sql, params)) or execute(sql, params, *args)):
+            self.client.get(next_url)
+        (sql, params), = executed
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[3] for row in cursor.fetchall())
+        self.assertRegex(plan, r'SEARCH core_chatdata USING INDEX chat_time_idx \(timestamp<\?\)')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get('/api/v1/chat/?cursor=cD0x').status_code, 404)  # One of two fields
+
+
+class ExportTests(TestCase):
+    START = datetime(2026, 3, 2, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        cls.bob = Developer.objects.create(name='Bob Smith', email='bob@teampulse.com')
+        # Created out of time order; 'tie' shares its timestamp with 'start' and sorts after it by id
+        for name, developer, offset in (
+            ('late', cls.bob, timedelta(hours=5)),
+            ('start', cls.alice, timedelta(0)),
+            ('until', cls.alice, timedelta(days=1)),
+            ('early', cls.bob, -timedelta(seconds=1)),
+            ('tie', cls.bob, timedelta(0)),
+        ):
+            Commit.objects.create(
+                developer=developer, hash_id=name.ljust(40, '0'), message=f'Commit, "{name}"',
+                lines_added=3, timestamp=cls.START + offset,
+            )
+            ChatData.objects.create(sender=developer, timestamp=cls.START + offset, sentiment_score='0.50')
+        JiraTicket.objects.create(
+            ticket_key='T-1', title='First', assignee=cls.alice, status='Done', story_points=3,
+            created_at=cls.START, closed_at=cls.START + timedelta(days=2), time_spent_hours='4.25',
+        )
+
+    def export(self, path, **params):
+        response = self.client.get(f'/api/v1/export/{path}?{urlencode(params)}')
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def window(self):
+        return {'since': '2026-03-02', 'until': (self.START + timedelta(days=1)).isoformat()}
+
+    def test_ndjson_in_time_order_within_bounds(self):
+        response, body = self.export('commits.ndjson', **self.window())
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="commits.ndjson"')
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        # since is inclusive, until exclusive
+        self.assertEqual([row['hash_id'][:5] for row in rows], ['start', 'tie00', 'late0'])
+        self.assertEqual(list(rows[0]), exports.EXPORTS['commits'][3])
+        self.assertEqual(rows[0]['developer_name'], 'Alice Johnson')
+        self.assertEqual(rows[0]['timestamp'], '2026-03-02T00:00:00Z')
+
+    def test_csv(self):
+        response, body = self.export('tickets.csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(rows[0], exports.EXPORTS['tickets'][3])
+        self.assertEqual(rows[1:], [[
+            str(JiraTicket.objects.get().id), 'T-1', 'First', str(self.alice.id), 'Alice Johnson', 'Done', '3',
+            '2026-03-02T00:00:00+00:00', '2026-03-04T00:00:00+00:00', '4.25',
+        ]])
+
+        _, body = self.export('commits.csv', since=self.START.isoformat(), until='2026-03-02T00:00:01Z')
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row['message'] for row in rows], ['Commit, "start"', 'Commit, "tie"'])  # Quoted, round-trips
+
+    def test_developer_filter(self):
+        _, body = self.export('chat.ndjson', developer=self.bob.id)
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['sender_id'] for row in rows], [self.bob.id] * 3)
+        self.assertEqual([row['timestamp'] for row in rows], sorted(row['timestamp'] for row in rows))
+
+    def test_rejects_bad_filters(self):
+        for params in ({'since': 'last week'}, {'until': '2026-02-30'}, {'developer': 'bob'}):
+            response = self.client.get(f'/api/v1/export/commits.ndjson?{urlencode(params)}')
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('Invalid filter', response.json()['error'])
+        self.assertEqual(self.client.get('/api/v1/export/developers.ndjson').status_code, 404)
+
+    def test_command_matches_the_endpoint(self):
+        _, body = self.export('commits.csv', developer=self.alice.id, **self.window())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'commits.csv')
+            call_command(
+                'export_data', 'commits', fmt='csv', developer=self.alice.id, output=path, stderr=StringIO(),
+                **self.window(),
+            )
+            with open(path, newline='', encoding='utf-8') as f:
+                self.assertEqual(f.read(), body)
+
+        with self.assertRaisesMessage(CommandError, 'is not an ISO date or datetime'):
+            call_command('export_data', 'commits', since='soon')
+
+
+class ScoreCacheTests(TestCase):
+    """Repeated score reads are cache hits until one of the developer's events changes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        cls.other = Developer.objects.create(name='Bob Smith', email='bob@teampulse.com')
+
+    def setUp(self):
+        invalidate_all()
+
+    def open_tickets(self, developer):
+        return self.client.get(f'/api/v1/burnout/{developer.id}/').json()['features']['open_tickets']
+
+    def test_hits_until_invalidated(self):
+        self.assertEqual(self.open_tickets(self.developer), 0)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.open_tickets(self.developer), 0)
+        self.open_tickets(self.other)
+
+        # Invalidation runs once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            JiraTicket.objects.create(
+                ticket_key='T-1', title='t', assignee=self.developer, status='To Do', created_at=timezone.now(),
+            )
+        self.assertEqual(self.open_tickets(self.developer), 1)
+        with self.assertNumQueries(0):
+            self.open_tickets(self.other)
+
+    def test_conditional_get(self):
+        url = f'/api/v1/burnout/{self.developer.id}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            JiraTicket.objects.create(
+                ticket_key='T-2', title='t', assignee=self.developer, status='To Do', created_at=timezone.now(),
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class AsyncScoreViewTests(TransactionTestCase):
+    """The async score views; a TransactionTestCase, as their queries run on other connections."""
+
+    def setUp(self):
+        invalidate_all()
+        self.developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+
+    async def test_async_view_matches_sync_view(self):
+        for model in ('burnout', 'productivity', 'collaboration'):
+            expected = (await self.async_client.get(f'/api/v1/{model}/{self.developer.id}/')).json()
+            await sync_to_async(invalidate_all)()
+            response = await self.async_client.get(f'/api/v1/async/{model}/{self.developer.id}/')
+            self.assertEqual(response.json(), expected)
+        response = await self.async_client.get('/api/v1/async/burnout/0/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_feature_queries_overlap(self):
+        delay = 0.2
+        lock = threading.Lock()
+        running = peak = 0
+        execute = SQLiteCursorWrapper.execute
+
+        def slow_execute(cursor, *args, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            try:
+                time.sleep(delay)
+                return execute(cursor, *args, **kwargs)
+            finally:
+                with lock:
+                    running -= 1
+
+        # Burnout issues three queries: the developer lookup, the rollup sums and the open tickets
+        with mock.patch.object(SQLiteCursorWrapper, 'execute', slow_execute):
+            started = time.monotonic()
+            features = await ml_services.acalculate_features('burnout', self.developer.id)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(features['open_tickets'], 0)
+        self.assertEqual(peak, 3)
+        self.assertLess(elapsed, 2 * delay)
+
+
+class SharedScoreCacheTests(TestCase):
+    """Every worker process must see a developer's invalidation, so the score cache is shared."""
+
+    def test_default_backend_is_shared_between_processes(self):
+        self.assertNotIn('LocMemCache', project_settings.CACHES[settings.TEAMPULSE_SCORE_CACHE]['BACKEND'])
+
+    def test_invalidation_reaches_another_process(self):
+        developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        token = score_cache.generation(developer.id)
+        location = str(settings.CACHES[settings.TEAMPULSE_SCORE_CACHE]['LOCATION'])
+
+        def read_in_another_process():
+            script = (
+                'import sys; from django.conf import settings; settings.configure(); '
+                'from django.core.cache.backends.filebased import FileBasedCache; '
+                'print(FileBasedCache(sys.argv[1], {}).get(sys.argv[2]))'
+            )
+            return subprocess.run(
+                [sys.executable, '-c', script, location, score_cache._generation_key(developer.id)],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+
+        self.assertEqual(read_in_another_process(), token)
+        score_cache.invalidate_developers([developer.id])
+        self.assertEqual(read_in_another_process(), 'None')
+
+    def test_refuses_a_per_process_cache_with_several_workers(self):
+        locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        with override_settings(CACHES={**settings.CACHES, settings.TEAMPULSE_SCORE_CACHE: locmem}):
+            with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}):
+                self.assertEqual([error.id for error in checks.check_score_cache_is_shared(None)], ['core.E001'])
+            with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '1'}):
+                self.assertEqual(checks.check_score_cache_is_shared(None), [])
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}):
+            self.assertEqual(checks.check_score_cache_is_shared(None), [])
+
+
+class TeamScoresTests(TestCase):
+    """/api/v1/scores/ pages through every developer and agrees with the per-developer endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.developers = [
+            Developer.objects.create(name=f'Developer {n}', email=f'dev{n}@teampulse.com') for n in range(7)
+        ]
+        for n, developer in enumerate(cls.developers):
+            for k in range(n):
+                Commit.objects.create(
+                    developer=developer, hash_id=f'{n:020d}{k:020d}', message='m', lines_added=40 * k,
+                    timestamp=now - timedelta(hours=7 * k + n),
+                )
+            JiraTicket.objects.create(
+                ticket_key=f'T-{n}', title='t', assignee=developer, status='Done' if n % 2 else 'To Do',
+                story_points=n, created_at=now - timedelta(days=5), closed_at=now - timedelta(days=1) if n % 2 else None,
+                time_spent_hours=n,
+            )
+            ChatData.objects.create(
+                sender=developer, recipient=cls.developers[n - 1], timestamp=now, sentiment_score=f'0.{n}',
+                is_quick_response=bool(n % 3),
+            )
+        refresh_daily_activity()
+
+    def setUp(self):
+        invalidate_all()
+
+    def test_pages_cover_every_developer_once(self):
+        url, seen = '/api/v1/scores/?page_size=3', []
+        while url:
+            page = self.client.get(url).json()
+            self.assertEqual(page['count'], 7)
+            self.assertLessEqual(len(page['results']), 3)
+            seen += [row['developer_id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(seen, [developer.id for developer in self.developers])  # Ordered by name
+
+    def test_ids_filter(self):
+        wanted = [self.developers[1].id, self.developers[4].id]
+        page = self.client.get(f'/api/v1/scores/?ids={wanted[0]},{wanted[1]}').json()
+        self.assertEqual([row['developer_id'] for row in page['results']], wanted)
+        self.assertEqual(self.client.get('/api/v1/scores/?ids=1,x').status_code, 400)
+
+    def test_matches_single_developer_endpoints(self):
+        for row in self.client.get('/api/v1/scores/').json()['results']:
+            for model in ('burnout', 'productivity', 'collaboration'):
+                single = self.client.get(f'/api/v1/{model}/{row["developer_id"]}/').json()
+                self.assertIn('features', single)
+                self.assertEqual(row[model], single, f'{model} of {row["developer_id"]}')
+
+    def test_queries_do_not_grow_with_page_size(self):
+        counts = []
+        for page_size in (2, 7):
+            invalidate_all()
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(len(self.client.get(f'/api/v1/scores/?page_size={page_size}').json()['results']), page_size)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class WorkHourAggregationTests(TestCase):
+    """The SQL after-hours/weekend counts must equal the original per-commit Python loop."""
+
+    # DST changes, midnights and weekend edges (Fri->Sat, Sun->Mon) in the zones below
+    BOUNDARIES = [
+        datetime(2025, 3, 9, 7, tzinfo=dt_timezone.utc),   # US spring forward (a Sunday)
+        datetime(2025, 11, 2, 6, tzinfo=dt_timezone.utc),  # US fall back: 01:xx happens twice
+        datetime(2025, 10, 4, 16, tzinfo=dt_timezone.utc),  # Lord Howe's half-hour DST change
+        datetime(2025, 3, 8, 5, tzinfo=dt_timezone.utc),   # Fri/Sat midnight in New York
+        datetime(2025, 11, 3, 5, tzinfo=dt_timezone.utc),  # Sun/Mon midnight in New York
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        timestamps = {
+            boundary + timedelta(minutes=minutes)
+            for boundary in cls.BOUNDARIES
+            for minutes in [*range(-13 * 60, 13 * 60 + 1, 23), -1 / 60, 1 / 60]
+        }
+        Commit.objects.bulk_create([
+            Commit(developer=developer, hash_id=f'{n:040d}', message='m', timestamp=timestamp)
+            for n, timestamp in enumerate(sorted(timestamps))
+        ])
+
+    @staticmethod
+    def python_counts(commits):
+        """The implementation the SQL replaced: one commit at a time, in Python."""
+        after_hours_commits = weekend_commits = 0
+        for commit in commits:
+            commit_hour = commit.timestamp.astimezone(ml_services.TIMEZONE).hour
+            commit_day = commit.timestamp.astimezone(ml_services.TIMEZONE).weekday()
+            if commit_hour < ml_services.START_HOUR or commit_hour >= ml_services.END_HOUR:
+                after_hours_commits += 1
+            if commit_day in ml_services.WEEKENDS:
+                weekend_commits += 1
+        return {'total_commits': len(commits), 'after_hours_commits': after_hours_commits, 'weekend_commits': weekend_commits}
+
+    def test_sql_matches_python_loop(self):
+        configurations = [
+            ('America/New_York', 9, 18, [5, 6]),
+            ('America/New_York', 7, 16, [4, 5]),
+            ('Australia/Lord_Howe', 0, 23, [0, 6]),
+            ('Asia/Kolkata', 10, 19, [6]),
+        ]
+        commits = list(Commit.objects.all())
+        for zone, start_hour, end_hour, weekends in configurations:
+            with self.subTest(zone=zone, start_hour=start_hour, end_hour=end_hour, weekends=weekends), \
+                    mock.patch.multiple(
+                        ml_services, TIMEZONE=ZoneInfo(zone), START_HOUR=start_hour, END_HOUR=end_hour, WEEKENDS=weekends,
+                    ):
+                counts = ml_services.with_work_hour_fields(Commit.objects.all()).aggregate(
+                    **ml_services.work_hour_aggregates()
+                )
+                self.assertEqual(counts, self.python_counts(commits))
+                self.assertGreater(counts['after_hours_commits'], 0)
+                self.assertGreater(counts['weekend_commits'], 0)
+
+
+class SeedDataTests(TestCase):
+    def seed(self, **options):
+        call_command('seed_data', developers=3, days=5, seed=7, stdout=StringIO(), **options)
+        return {
+            model.__name__: list(model.objects.order_by('pk').values_list(*fields))
+            for model, fields in (
+                (Commit, ('developer__email', 'hash_id', 'lines_added', 'lines_removed', 'timestamp', 'is_merge')),
+                (JiraTicket, ('ticket_key', 'assignee__email', 'status', 'story_points', 'created_at', 'closed_at')),
+                (ChatData, ('sender__email', 'recipient__email', 'timestamp', 'sentiment_score', 'is_quick_response')),
+            )
+        }
+
+    def test_same_seed_and_end_date_give_the_same_rows(self):
+        rows = self.seed(end_date='2026-03-02')
+        self.assertTrue(all(rows.values()))
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(hours=5)):
+            self.assertEqual(self.seed(end_date='2026-03-02'), rows)
+
+        end = timezone.make_aware(datetime(2026, 3, 2))
+        self.assertTrue(all(row[4] < end for row in rows['Commit']))
+        self.assertTrue(all(row[2] < end for row in rows['ChatData']))
+
+    def test_rejects_a_bad_end_date(self):
+        with self.assertRaisesMessage(CommandError, '--end-date must be a date'):
+            self.seed(end_date='yesterday')
+
+
+class RollupAssertions:
+    """For tests whose writes must leave DeveloperDailyActivity equal to the raw events."""
+
+    def assert_rollup_matches_raw_events(self):
+        stored = {
+            (row['developer_id'], row['date']): {field: float(row[field]) for field in ACTIVITY_FIELDS}
+            for row in DeveloperDailyActivity.objects.values('developer_id', 'date', *ACTIVITY_FIELDS)
+        }
+        raw = {
+            key: {field: float(value) for field, value in values.items()}
+            for key, values in compute_daily_activity().items()
+        }
+        self.assertEqual(stored, raw)
+        # And the features read from the rollup equal the ones computed from raw events
+        matrix = build_feature_matrix()
+        live = calculate_team_features(list(matrix.index))
+        for developer_id, row in matrix.iterrows():
+            for feature, value in row.items():
+                self.assertAlmostEqual(value, live[developer_id][feature], msg=f'{developer_id}: {feature}')
+
+
+class RollupTests(RollupAssertions, TestCase):
+    """DeveloperDailyActivity must always equal an aggregation of the raw events."""
+
+    def setUp(self):
+        self.alice = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        self.bob = Developer.objects.create(name='Bob Smith', email='bob@teampulse.com')
+        self.now = timezone.now()
+
+    def create_events(self):
+        commit = Commit.objects.create(
+            developer=self.alice, hash_id='a' * 40, message='m', lines_added=10, lines_removed=2,
+            timestamp=self.now - timedelta(hours=1),
+        )
+        Commit.objects.create(
+            developer=self.alice, hash_id='b' * 40, message='m', lines_added=5, timestamp=self.now - timedelta(days=3),
+        )
+        ticket = JiraTicket.objects.create(
+            ticket_key='T-1', title='t', assignee=self.alice, status='Done', story_points=8,
+            created_at=self.now - timedelta(days=4), closed_at=self.now - timedelta(days=2), time_spent_hours='6.00',
+        )
+        message = ChatData.objects.create(
+            sender=self.bob, recipient=self.alice, timestamp=self.now, sentiment_score='0.70', is_quick_response=True,
+        )
+        return commit, ticket, message
+
+    def test_follows_creates_updates_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            commit, ticket, message = self.create_events()
+        self.assert_rollup_matches_raw_events()
+
+        # Moved to another day and another developer: both old and new rows change
+        with self.captureOnCommitCallbacks(execute=True):
+            commit.developer = self.bob
+            commit.timestamp = self.now - timedelta(days=5)
+            commit.save()
+        self.assert_rollup_matches_raw_events()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.status, ticket.closed_at = 'To Do', None
+            ticket.save()
+        self.assert_rollup_matches_raw_events()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            message.delete()
+        self.assert_rollup_matches_raw_events()
+
+    def test_refresh_waits_for_the_transaction_to_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.create_events()
+            self.assertFalse(DeveloperDailyActivity.objects.exists())
+
+        # One refresh for all the writes of the transaction
+        with mock.patch('core.rollups.refresh_for_keys', wraps=refresh_for_keys) as refresh:
+            for callback in callbacks:
+                callback()
+        self.assertEqual(refresh.call_count, 1)
+        self.assert_rollup_matches_raw_events()
+
+    def test_refreshes_only_the_touched_days(self):
+        today = self.now.date()
+        with mock.patch('core.rollups.refresh_daily_activity', wraps=refresh_daily_activity) as refresh:
+            refresh_for_keys({
+                (self.alice.id, today - timedelta(days=60)),
+                (self.bob.id, today),
+                (self.bob.id, today - timedelta(days=1)),
+            })
+        self.assertEqual(refresh.call_args_list, [
+            mock.call([self.alice.id], today - timedelta(days=60), today - timedelta(days=60)),
+            mock.call([self.bob.id], today - timedelta(days=1), today),
+        ])
+
+    def test_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_events()
+        first_day = DeveloperDailyActivity.objects.order_by('date').first()
+        DeveloperDailyActivity.objects.update(commit_count=99)
+
+        # From a day onwards: earlier rows are left alone
+        rebuild_daily_activity(since=first_day.date + timedelta(days=1), chunk_size=1)
+        self.assertEqual(DeveloperDailyActivity.objects.get(pk=first_day.pk).commit_count, 99)
+        self.assertFalse(DeveloperDailyActivity.objects.filter(date__gt=first_day.date, commit_count=99).exists())
+
+        rebuild_daily_activity(chunk_size=1)
+        self.assert_rollup_matches_raw_events()
+
+
+class BulkIngestTests(RollupAssertions, TestCase):
+    DAY = datetime(2026, 3, 2, 12, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        invalidate_all()
+
+    def ingest(self, kind, records, status=200):
+        # The rollup is refreshed once the batch commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/ingest/{kind}/', json.dumps(records), content_type='application/json')
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def commit(self, sha, email='alice@teampulse.com', when=None, **fields):
+        return {'hash_id': sha.ljust(40, '0'), 'email': email, 'timestamp': (when or self.DAY).isoformat(), **fields}
+
+    def test_reports_a_status_per_record(self):
+        self.ingest('commits', [self.commit('a', lines_added=1)])
+
+        result = self.ingest('commits', [
+            self.commit('b', lines_added=10),
+            self.commit('a', lines_added=20),
+            {'hash_id': 'c' * 40, 'timestamp': 'yesterday', 'color': 'red'},
+            self.commit('b', lines_added=30, name='Bob Smith', email='bob@teampulse.com'),
+        ])
+
+        self.assertEqual(result['counts'], {'superseded': 1, 'updated': 1, 'error': 1, 'created': 1})
+        self.assertEqual([row['status'] for row in result['results']], ['superseded', 'updated', 'error', 'created'])
+        self.assertEqual([row['index'] for row in result['results']], [0, 1, 2, 3])
+        self.assertEqual(result['results'][2]['errors'], {
+            'email': ['This field is required.'],
+            'timestamp': ['Must be an ISO 8601 datetime.'],
+            'color': ['Unknown field.'],
+        })
+        # The last occurrence in the batch wins
+        b = Commit.objects.select_related('developer').get(hash_id='b'.ljust(40, '0'))
+        self.assertEqual((b.lines_added, b.developer.name), (30, 'Bob Smith'))
+        self.assertEqual(Commit.objects.get(hash_id='a'.ljust(40, '0')).lines_added, 20)
+        self.assertFalse(Commit.objects.filter(hash_id='c' * 40).exists())
+
+    def test_tickets_and_chat(self):
+        ticket = {'ticket_key': 'T-1', 'title': 'First', 'status': 'To Do', 'created_at': self.DAY.isoformat()}
+        result = self.ingest('tickets', [
+            ticket,
+            {**ticket, 'status': 'Done', 'closed_at': self.DAY.isoformat(), 'assignee_email': 'alice@teampulse.com'},
+            {**ticket, 'ticket_key': 'T-2', 'time_spent_hours': 1000},
+        ])
+        self.assertEqual([row['status'] for row in result['results']], ['superseded', 'created', 'error'])
+        self.assertEqual(JiraTicket.objects.get().status, 'Done')
+
+        result = self.ingest('chat', [
+            {'sender_email': 'alice@teampulse.com', 'recipient_email': 'bob@teampulse.com', 'timestamp': self.DAY.isoformat()},
+            {'sender_email': 'alice@teampulse.com', 'timestamp': self.DAY.isoformat(), 'sentiment_score': 0.5},
+        ])
+        self.assertEqual(result['counts'], {'created': 2})
+        self.assertEqual(
+            sorted(row['id'] for row in result['results']), sorted(ChatData.objects.values_list('id', flat=True)),
+        )
+        self.assert_rollup_matches_raw_events()
+
+    def test_rejects_batches_above_the_limit(self):
+        with mock.patch('core.views.MAX_BATCH_SIZE', 2):
+            result = self.ingest('commits', [self.commit(sha) for sha in 'abc'], status=413)
+        self.assertEqual(result['error'], 'At most 2 records per request; got 3.')
+        self.assertFalse(Commit.objects.exists())
+        self.ingest('commits', {'hash_id': 'a'}, status=400)
+
+    def test_parses_ndjson(self):
+        body = '\n'.join(json.dumps(self.commit(sha)) for sha in 'ab') + '\n\n'
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/ingest/commits/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.json()['counts'], {'created': 2})
+
+        response = self.client.post(
+            '/api/v1/ingest/commits/', json.dumps(self.commit('c')) + '\n{"hash_id": ', content_type='application/x-ndjson',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('NDJSON parse error on line 2', response.json()['detail'])
+        self.assertEqual(Commit.objects.count(), 2)
+
+    def test_refreshes_the_days_an_update_moves_away_from(self):
+        self.ingest('commits', [self.commit('a', lines_added=5), self.commit('b')])
+        alice = Developer.objects.get(email='alice@teampulse.com')
+        self.assertEqual(DeveloperDailyActivity.objects.get(developer=alice).commit_count, 2)
+
+        # Another author, three days later
+        self.ingest('commits', [self.commit('a', email='bob@teampulse.com', when=self.DAY + timedelta(days=3), lines_added=5)])
+
+        self.assertEqual(DeveloperDailyActivity.objects.get(developer=alice).commit_count, 1)
+        self.assertEqual(DeveloperDailyActivity.objects.get(developer=alice).lines_added, 0)
+        self.assertEqual(DeveloperDailyActivity.objects.get(developer__email='bob@teampulse.com').lines_added, 5)
+        self.assert_rollup_matches_raw_events()
+
+
+class BenchmarkTests(TestCase):
+    def run_benchmark(self, **options):
+        # In this test's database rather than a throwaway one of its own
+        with mock.patch.object(connection.creation, 'create_test_db', return_value=None), \
+                mock.patch.object(connection.creation, 'destroy_test_db'):
+            call_command('benchmark', scales='3', samples=2, days=3, stdout=StringIO(), **options)
+
+    def test_writes_the_results_as_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.run_benchmark(output=os.path.join(directory, 'results.json'))
+            with open(os.path.join(directory, 'results.json')) as f:
+                results = json.load(f)
+
+        benchmarks = results['scales']['3']['benchmarks']
+        self.assertEqual(list(benchmarks), [name for name, _, _ in benchmarks_module.build_benchmarks()])
+        self.assertIn('get_burnout_risk[batched]', benchmarks)
+        for result in benchmarks.values():
+            self.assertEqual(result['calls'], 2)
+            self.assertLessEqual(result['median_ms'], result['p95_ms'])
+
+    def test_compare_fails_on_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            self.run_benchmark(output=path)
+            with open(path) as f:
+                baseline = json.load(f)
+
+            for result in baseline['scales']['3']['benchmarks'].values():
+                result['median_ms'] *= 1000
+            with open(path, 'w') as f:
+                json.dump(baseline, f)
+            self.run_benchmark(compare=path)  # Faster than the baseline: passes
+
+            baseline['scales']['3']['benchmarks']['get_burnout_risk']['queries'] = -1
+            with open(path, 'w') as f:
+                json.dump(baseline, f)
+            with self.assertRaisesMessage(CommandError, '1 benchmark regressions') as raised:
+                self.run_benchmark(compare=path)
+            self.assertEqual(raised.exception.returncode, 1)  # The exit status of manage.py
+
+    def test_leaves_the_shared_score_cache_alone(self):
+        developer = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        token = score_cache.generation(developer.id)
+        self.run_benchmark()
+        self.assertEqual(score_cache.generation(developer.id), token)
+
+    def test_compare_threshold(self):
+        def run(median_ms, queries=3):
+            return {'scales': {'10': {'benchmarks': {'f': {'median_ms': median_ms, 'queries': queries}}}}}
+
+        baseline = run(10.0)
+        self.assertEqual(benchmarks_module.compare(run(11.9), baseline, 0.2), [])
+        self.assertEqual(benchmarks_module.compare(run(12.1), baseline, 0.2), [('10', 'f', 'median_ms', 10.0, 12.1)])
+        self.assertEqual(benchmarks_module.compare(run(5.0, queries=4), baseline, 0.2), [('10', 'f', 'queries', 3, 4)])
+        self.assertEqual(benchmarks_module.compare({'scales': {'50': run(99.0)['scales']['10']}}, baseline, 0.2), [])
+
+    def test_predictors_are_timed_without_the_batcher(self):
+        Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        benchmarks = {name: (setup, func) for name, setup, func in benchmarks_module.build_benchmarks()}
+        with mock.patch.object(InferenceBatcher, 'submit', side_effect=AssertionError('batched')) as submit:
+            for name, _, _ in benchmarks_module.PREDICTORS:
+                setup, func = benchmarks[name]
+                func(*setup(Developer.objects.get().pk))
+            self.assertFalse(submit.called)
+
+
+class InferenceBatcherTests(SimpleTestCase):
+    def test_concurrent_rows_share_one_call(self):
+        calls = []
+
+        def predict_many(rows):
+            calls.append(len(rows))
+            time.sleep(0.02)  # Rows arriving meanwhile queue up for the next batch
+            return [row * 2 for row in rows], 200
+
+        batcher = InferenceBatcher('test', predict_many, max_batch_size=8, max_wait=0.05)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(batcher.predict, range(8)))
+
+        self.assertEqual(results, [(row * 2, 200) for row in range(8)])
+        self.assertLess(len(calls), 8)
+        self.assertEqual(sum(calls), 8)
+
+    def test_single_caller_is_not_delayed(self):
+        batcher = InferenceBatcher('test', lambda rows: ([row * 2 for row in rows], 200), max_wait=1.0)
+        started = time.monotonic()
+        results = [batcher.predict(row) for row in range(5)]
+        self.assertEqual(results, [(row * 2, 200) for row in range(5)])
+        self.assertLess(time.monotonic() - started, 0.5)
+
+
+class NumpyModelTests(SimpleTestCase):
+    """The .npz exports served in production must predict exactly like the scikit-learn models."""
+
+    def test_matches_joblib_models(self):
+        from joblib import load
+
+        rng = np.random.default_rng(0)
+        for name in MODEL_PATHS:
+            features = MODEL_FEATURES[name]
+            X = rng.random((200, len(features))) * 100
+            exported = model_registry.get(name)
+            self.assertIsInstance(exported, NumpyModel)
+            # The joblib file the served export came from (the current release's, if any)
+            reference = load(os.path.splitext(model_registry.status()[name]['path'])[0] + '.joblib')
+            expected = reference.predict(pd.DataFrame(X, columns=features))
+            np.testing.assert_allclose(exported.predict(X), expected)
+            if hasattr(reference, 'predict_proba'):
+                np.testing.assert_allclose(
+                    exported.predict_proba(X), reference.predict_proba(pd.DataFrame(X, columns=features)),
+                )
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'model.json')
+        self.clock = 1000.0
+        self.mtime_ns = time.time_ns()
+        patcher = mock.patch('core.model_registry.time.monotonic', lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = ModelRegistry(check_interval=60, loaders={'.json': lambda payload: json.loads(payload)})
+        self.registry.register('burnout', self.path)
+
+    def write(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+        # A new mtime on every write, even on filesystems with coarse timestamps
+        self.mtime_ns += 10 ** 9
+        os.utime(self.path, ns=(self.mtime_ns, self.mtime_ns))
+
+    def test_reloads_a_rewritten_artifact_after_the_check_interval(self):
+        self.write('{"weights": 1}')
+        self.assertEqual(self.registry.get('burnout'), {'weights': 1})
+
+        self.write('{"weights": 22}')
+        self.clock += 59
+        self.assertEqual(self.registry.get('burnout'), {'weights': 1})  # Not checked again yet
+        self.clock += 2
+        self.assertEqual(self.registry.get('burnout'), {'weights': 22})
+        self.assertEqual(self.registry.version('burnout'), hashlib.sha256(b'{"weights": 22}').hexdigest()[:12])
+
+    def test_keeps_serving_when_the_new_artifact_is_corrupt(self):
+        self.write('{"weights": 1}')
+        model = self.registry.get('burnout')
+
+        self.write('{"weights": ')
+        self.clock += 61
+        with self.assertLogs('core.model_registry', 'ERROR'):
+            self.assertIs(self.registry.get('burnout'), model)
+        self.assertEqual(self.registry.version('burnout'), hashlib.sha256(b'{"weights": 1}').hexdigest()[:12])
+
+        # A removed artifact also keeps the loaded model serving
+        os.remove(self.path)
+        self.clock += 61
+        self.assertIs(self.registry.get('burnout'), model)
+
+    def test_touched_but_unchanged_artifact_is_not_deserialized_again(self):
+        self.write('{"weights": 1}')
+        model = self.registry.get('burnout')
+        self.clock += 61
+        self.write('{"weights": 1}')
+        self.assertIs(self.registry.get('burnout'), model)
+
+    def test_status_endpoint_reports_the_content_hash(self):
+        for name in MODEL_PATHS:
+            model_registry.get(name)
+        response = self.client.get('/api/v1/models/')
+        self.assertEqual(response.status_code, 200)
+        for name, status in response.json().items():
+            with open(status['path'], 'rb') as f:
+                self.assertEqual(status['version'], hashlib.sha256(f.read()).hexdigest()[:12])
+            self.assertTrue(status['loaded'])
+        self.assertEqual(set(response.json()), set(MODEL_PATHS))
+
+
+class ReadinessTests(TestCase):
+    def test_ready_once_models_are_loaded(self):
+        response = self.client.get('/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(model['loaded'] for model in response.json()['models'].values()))
+
+    def test_startup_does_not_import_the_training_stack(self):
+        # A fresh process, as a worker starts: setup and URL routing only (warm-up off)
+        script = (
+            'import sys, django; django.setup(); '
+            'from django.urls import resolve; resolve("/api/v1/burnout/1/"); resolve("/ready"); '
+            'print(" ".join(name for name in ("pandas", "sklearn", "joblib") if name in sys.modules))'
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'teampulse_backend.settings'}
+        env.pop('TEAMPULSE_WARM_UP', None)
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+
+class MetricsTests(TestCase):
+    SAMPLE = re.compile(r'([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)')
+    LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+    SUFFIXES = {'counter': ('_total',), 'histogram': ('_bucket', '_sum', '_count')}
+
+    def setUp(self):
+        invalidate_all()
+
+    def scrape(self):
+        """GETs /metrics, checks it is well-formed exposition text and returns {(name, labels): value}."""
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        samples = {}
+        buckets = {}
+        family = kind = None
+        for line in response.content.decode().splitlines():
+            if line.startswith('# HELP '):
+                family = line.split(' ', 3)[2]
+                continue
+            if line.startswith('# TYPE '):
+                _, _, name, kind = line.split(' ')
+                self.assertEqual(name, family, line)  # HELP and TYPE of the same family, then its samples
+                self.assertIn(kind, self.SUFFIXES)
+                continue
+            name, labels, value = self.SAMPLE.fullmatch(line).groups()
+            self.assertTrue(name.startswith(family), line)
+            self.assertIn(name[len(family):], self.SUFFIXES[kind], line)
+            pairs = list(self.LABEL.finditer(labels or ''))
+            self.assertEqual(','.join(pair.group(0) for pair in pairs), labels or '', line)  # Nothing but label pairs
+            labels = dict(pair.groups() for pair in pairs)
+            value = float(value)
+            if name.endswith('_bucket'):
+                series = buckets.setdefault((family, frozenset((k, v) for k, v in labels.items() if k != 'le')), [])
+                self.assertGreaterEqual(value, series[-1] if series else 0, line)  # Cumulative
+                series.append(value)
+            samples[name, frozenset(labels.items())] = value
+
+        for (family, labels), series in buckets.items():
+            self.assertEqual(series[-1], samples[f'{family}_count', labels])  # le="+Inf" counts everything
+        return samples
+
+    def sample(self, samples, name, **labels):
+        return samples.get((name, frozenset(labels.items())), 0)
+
+    def test_renders_prometheus_text(self):
+        self.client.get('/api/v1/developers/')
+        samples = self.scrape()
+        self.assertTrue(any(name == 'teampulse_http_request_duration_seconds_bucket' for name, _ in samples))
+
+    def test_routes_are_labelled_by_url_pattern(self):
+        alice = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        bob = Developer.objects.create(name='Bob Smith', email='bob@teampulse.com')
+        series = {'route': 'api/v1/burnout/<int:pk>/', 'method': 'GET', 'status': '200'}
+        before = self.scrape()
+
+        for developer in (alice, bob):
+            self.assertEqual(self.client.get(f'/api/v1/burnout/{developer.id}/').status_code, 200)
+        self.client.get('/no/such/page/')
+        after = self.scrape()
+
+        name = 'teampulse_http_request_duration_seconds_count'
+        self.assertEqual(self.sample(after, name, **series) - self.sample(before, name, **series), 2)
+        unmatched = {'route': '<unmatched>', 'method': 'GET', 'status': '404'}
+        self.assertEqual(self.sample(after, name, **unmatched) - self.sample(before, name, **unmatched), 1)
+        routes = {dict(labels).get('route') for _, labels in after}
+        self.assertFalse([route for route in routes if route and f'/{alice.id}/' in route])
+
+    def test_records_sql_of_sync_requests(self):
+        Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        route = resolve('/api/v1/developers/').route
+        before = self.scrape()
+
+        # Counted by hand: the request_started signal resets CaptureQueriesContext's log
+        executed = []
+        with connection.execute_wrapper(lambda execute, sql, *args: executed.append(sql) or execute(sql, *args)):
+            self.assertEqual(self.client.get('/api/v1/developers/').status_code, 200)
+        after = self.scrape()
+
+        def delta(name):
+            return self.sample(after, name, route=route) - self.sample(before, name, route=route)
+
+        self.assertGreater(len(executed), 0)
+        self.assertEqual(delta('teampulse_http_request_queries_count'), 1)
+        self.assertEqual(delta('teampulse_http_request_queries_sum'), len(executed))
+        self.assertEqual(delta('teampulse_http_request_query_duration_seconds_count'), 1)
+        self.assertGreater(delta('teampulse_http_request_query_duration_seconds_sum'), 0)
+
+
+class FeatureMatrixTests(TestCase):
+    """The training features must be exactly the features the live endpoints score on."""
+
+    def test_matches_live_features(self):
+        alice = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        bob = Developer.objects.create(name='Bob Smith', email='bob@teampulse.com')
+        Developer.objects.create(name='Idle', email='idle@teampulse.com')
+        now = timezone.now()
+        # The rollup the live features read is refreshed when the writes commit
+        with self.captureOnCommitCallbacks(execute=True):
+            for hours_ago in (1, 30, 200, 24 * 40):
+                Commit.objects.create(
+                    developer=alice, hash_id=f'{hours_ago:040d}', message='m', lines_added=hours_ago, lines_removed=1,
+                    timestamp=now - timedelta(hours=hours_ago),
+                )
+            JiraTicket.objects.create(
+                ticket_key='T-1', title='t', assignee=alice, status='Done', story_points=8,
+                created_at=now - timedelta(days=3), closed_at=now - timedelta(days=1), time_spent_hours='7.50',
+            )
+            JiraTicket.objects.create(ticket_key='T-2', title='t', assignee=bob, status='To Do', created_at=now)
+            ChatData.objects.create(sender=bob, recipient=alice, timestamp=now, sentiment_score='0.80', is_quick_response=True)
+            ChatData.objects.create(sender=alice, timestamp=now, sentiment_score='0.40')
+
+        matrix = build_feature_matrix()
+        live = calculate_team_features(list(matrix.index))
+        for developer_id, row in matrix.iterrows():
+            for feature, value in row.items():
+                self.assertAlmostEqual(value, live[developer_id][feature], msg=f'{developer_id}: {feature}')
+
+    def test_cache_updates_incrementally(self):
+        alice = Developer.objects.create(name='Alice Johnson', email='alice@teampulse.com')
+        now = timezone.now()
+
+        def commit(n):
+            return Commit.objects.create(
+                developer=alice, hash_id=f'{n:040d}', message='m', lines_added=n, lines_removed=0,
+                timestamp=now - timedelta(hours=n),
+            )
+
+        commit(1)
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.object(feature_cache, 'CACHE_DIR', cache_dir):
+            self.assertEqual(feature_cache.update_feature_cache()[1], 'rebuilt')
+            self.assertEqual(feature_cache.update_feature_cache()[1], 'hit')
+
+            late = commit(2)
+            self.assertEqual(feature_cache.update_feature_cache()[1], 'incremental')
+            matrix = feature_cache.open_feature_matrix(refresh=False)
+            self.assertEqual(matrix.loc[alice.id, 'total_lines_changed'], 3)
+            self.assertTrue(np.array_equal(matrix.to_numpy(), build_feature_matrix().to_numpy()))
+
+            # Anything but new events (here a deleted commit) rebuilds the entry
+            late.delete()
+            self.assertEqual(feature_cache.update_feature_cache()[1], 'rebuilt')
+            self.assertEqual(feature_cache.open_feature_matrix(refresh=False).loc[alice.id, 'total_lines_changed'], 1)
+
+
+class HyperparameterSearchTests(SimpleTestCase):
+    def test_unchanged_data_skips_the_search(self):
+        rng = np.random.default_rng(0)
+        X = rng.random((40, len(training.MODELS['productivity'][0])))
+        y = X @ np.arange(1, X.shape[1] + 1)
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(training, 'SEARCH_CACHE_PATH', f'{cache_dir}/search.json'):
+            searched = training.search_params('productivity', X, y, n_jobs=1)
+            self.assertFalse(searched['cached'])
+            again = training.search_params('productivity', X, y, n_jobs=1)
+            self.assertTrue(again['cached'])
+            self.assertEqual(again['params'], searched['params'])
+            self.assertFalse(training.search_params('productivity', X, y + 1, n_jobs=1)['cached'])
+
+    def test_searches_a_view_of_the_cached_memory_map(self):
+        values = np.random.default_rng(0).random((10, len(training.ALL_FEATURES)))
+        with tempfile.TemporaryDirectory() as entry:
+            np.save(os.path.join(entry, 'features.npy'), values)
+            features = feature_cache.load_features(entry)
+            for name, (model_features, _, _) in training.MODELS.items():
+                X = training.shared_features(name, features)
+                # Still a memmap of the entry's file, so joblib passes workers the file name
+                self.assertIsInstance(X, np.memmap)
+                self.assertEqual(X.filename, os.path.join(entry, 'features.npy'))
+                columns = [training.ALL_FEATURES.index(feature) for feature in model_features]
+                np.testing.assert_array_equal(X, values[:, columns])
+
+
+class TrainAllTests(SimpleTestCase):
+    """train_all() publishes a complete release under a temporary MODEL_RELEASES_DIR, or nothing."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        features = sorted({feature for features in MODEL_FEATURES.values() for feature in features})
+        self.matrix = pd.DataFrame(rng.random((30, len(features))), columns=features, index=range(1, 31))
+        # Both burnout classes: late work and a high load for every other developer
+        self.matrix.loc[::2, 'after_hours_ratio'] = 0.5
+        self.matrix['open_tickets'] = np.where(self.matrix.index % 2, 12, 2)
+
+        releases = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, releases)
+        self.current = os.path.join(releases, 'current')
+        for patcher in (
+            mock.patch.multiple(training, MODEL_RELEASES_DIR=releases, CURRENT_RELEASE=self.current),
+            mock.patch('core.feature_matrix.build_feature_matrix', return_value=self.matrix),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.releases = releases
+
+    def train(self, models=None, workers=1):
+        return training.train_all(models, workers=workers, use_cache=False)
+
+    def listing(self):
+        return sorted(os.listdir(self.releases))
+
+    def test_publishes_every_artifact_and_the_manifest(self):
+        manifest = self.train(workers=3)
+
+        self.assertEqual(os.readlink(self.current), manifest['release'])
+        self.assertEqual(training.read_manifest(), manifest)
+        self.assertEqual(manifest['developers'], 30)
+        for name, path in MODEL_PATHS.items():
+            self.assertEqual(manifest['models'][name]['version'], manifest['version'])
+            with open(ml_services.release_path(ml_services.params_path(path), self.current), 'rb') as f:
+                exported = NumpyModel.from_bytes(f.read())
+            self.assertEqual(list(exported.features), MODEL_FEATURES[name])
+            self.assertTrue(os.path.exists(ml_services.release_path(path, self.current)))
+        self.assertEqual(self.listing(), sorted(['current', manifest['release']]))
+
+    def test_carries_over_models_not_retrained(self):
+        first = self.train()
+        second = self.train(['burnout'])
+
+        self.assertNotEqual(second['release'], first['release'])
+        self.assertEqual(second['models']['productivity'], first['models']['productivity'])
+        for name in ('productivity', 'collaboration'):
+            path = ml_services.params_path(MODEL_PATHS[name])
+            self.assertTrue(os.path.samefile(
+                ml_services.release_path(path, os.path.join(self.releases, first['release'])),
+                ml_services.release_path(path, self.current),
+            ))
+
+    def test_a_failing_model_replaces_nothing(self):
+        published = self.train()
+        listing = self.listing()
+
+        with mock.patch.object(training, 'new_estimator', side_effect=ValueError('cannot fit')), \
+                self.assertRaisesMessage(ValueError, 'cannot fit'):
+            self.train(['productivity'])
+
+        self.assertEqual(self.listing(), listing)  # No new release, no leftover staging directory
+        self.assertEqual(os.readlink(self.current), published['release'])
+        self.assertEqual(training.read_manifest(), published)
+
+    def test_keeps_only_the_latest_releases(self):
+        releases = [self.train()['release'] for _ in range(training.KEEP_RELEASES + 2)]
+        self.assertEqual(self.listing(), sorted(['current', *releases[-training.KEEP_RELEASES:]]))
+
+    def test_serving_switches_to_the_new_release(self):
+        registry = ModelRegistry(check_interval=0, loaders={'.npz': ml_services.load_numpy_model})
+        path = MODEL_PATHS['burnout']
+        registry.register('burnout', ml_services.release_path(ml_services.params_path(path), self.current), path)
+
+        self.train()
+        first = registry.version('burnout')
+        self.matrix['after_hours_ratio'] = self.matrix['after_hours_ratio'][::-1].to_numpy()
+        self.train(['burnout'])
+        self.assertNotEqual(registry.version('burnout'), first)
+
+
+class StubGitHub:
+    """A local stand-in for the GitHub REST API: a Link-paginated commit listing (with ETags
+    and `since`) and per-commit details, served from `commits` on a random localhost port.
+
+    Every request is recorded in `requests` as (path, query, headers); `failures` maps a
+    path (or 'path?page=N' for one listing page) to (status, headers) responses served,
+    one per request, before the real one. With `rate_limit` set to {'remaining', 'reset'},
+    responses carry X-RateLimit-* headers counting down from it.
+    """
+
+    def __init__(self, owner='acme', repo='app', per_page=2):
+        self.listing_path = f'/repos/{owner}/{repo}/commits'
+        self.per_page = per_page
+        self.commits = []  # Newest first, like GitHub
+        self.requests = []
+        self.failures = {}
+        self.rate_limit = None
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_commit(self, sha, email, when, additions=1, deletions=0):
+        date = when.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        person = {'name': email.split('@')[0].title(), 'email': email, 'date': date}
+        self.commits.append({
+            'sha': sha,
+            'author': {'login': email.split('@')[0]},
+            'commit': {'author': person, 'committer': person, 'message': f'Commit {sha[:7]}'},
+            'stats': {'additions': additions, 'deletions': deletions},
+        })
+        self.commits.sort(key=lambda commit: commit['commit']['committer']['date'], reverse=True)
+
+    def requests_to(self, path):
+        return [(query, headers) for request_path, query, headers in self.requests if request_path == path]
+
+    def handle(self, handler):
+        parts = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        with self._lock:
+            self.requests.append((parts.path, query, dict(handler.headers)))
+            failures = self.failures.get(f'{parts.path}?page={query.get("page", 1)}') or self.failures.get(parts.path)
+            failure = failures.pop(0) if failures else None
+            if self.rate_limit:
+                handler.rate_limit_headers = {
+                    'X-RateLimit-Remaining': str(self.rate_limit['remaining']),
+                    'X-RateLimit-Reset': str(self.rate_limit['reset']),
+                }
+                self.rate_limit['remaining'] = max(0, self.rate_limit['remaining'] - 1)
+        if failure:
+            status, headers = failure
+            return self._send(handler, status, {'message': 'Stub failure'}, headers)
+
+        if parts.path == self.listing_path:
+            return self._send_listing(handler, parts.path, query)
+        for commit in self.commits:
+            if parts.path == f'{self.listing_path}/{commit["sha"]}':
+                return self._send(handler, 200, commit)
+        self._send(handler, 404, {'message': 'Not Found'})
+
+    def _send_listing(self, handler, path, query):
+        commits = [
+            {key: value for key, value in commit.items() if key != 'stats'}  # The listing has no stats
+            for commit in self.commits if commit['commit']['committer']['date'] >= query.get('since', '')
+        ]
+        etag = '"' + hashlib.sha1(''.join(commit['sha'] for commit in commits).encode()).hexdigest() + '"'
+        if handler.headers.get('If-None-Match') == etag:
+            return self._send(handler, 304, None, {'ETag': etag})
+
+        page = int(query.get('page', 1))
+        last = max(1, -(-len(commits) // self.per_page))
+        headers = {'ETag': etag}
+        if page < last:
+            link = lambda number: f'{self.url}{path}?{urlencode({**query, "page": number})}'
+            headers['Link'] = f'<{link(page + 1)}>; rel="next", <{link(last)}>; rel="last"'
+        self._send(handler, 200, commits[(page - 1) * self.per_page:page * self.per_page], headers)
+
+    def _send(self, handler, status, body, headers=None):
+        payload = b'' if body is None else json.dumps(body).encode()
+        handler.send_response(status)
+        for name, value in {**getattr(handler, 'rate_limit_headers', {}), **(headers or {})}.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+class GitHubSyncTests(TestCase):
+    """fetch_github_data against a local StubGitHub."""
+
+    def setUp(self):
+        self.stub = StubGitHub(per_page=2)
+        self.addCleanup(self.stub.close)
+        now = timezone.now()
+        for n, email in enumerate(['alice@teampulse.com', 'bob@teampulse.com', 'carol@teampulse.com'] * 2 + ['alice@teampulse.com']):
+            self.stub.add_commit(f'{n:040x}', email, now - timedelta(hours=10 * n + 1), additions=n)
+
+    def sync(self, **options):
+        out = StringIO()
+        call_command(
+            'fetch_github_data', owner='acme', repo='app', token='t', api_url=self.stub.url, stdout=out, **options,
+        )
+        return out.getvalue()
+
+    def test_ingests_every_page_once(self):
+        with CaptureQueriesContext(connection) as context:
+            self.sync(skip_stats=True)
+
+        pages = sorted(int(query.get('page', 1)) for query, _ in self.stub.requests_to(self.stub.listing_path))
+        self.assertEqual(pages, [1, 2, 3, 4])
+        self.assertEqual(
+            sorted(Commit.objects.values_list('hash_id', flat=True)), sorted(commit['sha'] for commit in self.stub.commits),
+        )
+        # Three new authors, one INSERT
+        developer_inserts = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('INSERT') and 'INTO "core_developer" ' in query['sql']
+        ]
+        self.assertEqual(len(developer_inserts), 1)
+        self.assertEqual(Developer.objects.count(), 3)
+
+        output = self.sync(skip_stats=True, full=True)
+        self.assertEqual(Commit.objects.count(), 7)
+        self.assertIn('Saved 0 new commits, skipped 7 already stored.', output)
+
+    def state(self):
+        return SyncState.objects.get(source='github', repository='acme/app')
+
+    def test_incremental_sync_starts_at_the_watermark(self):
+        self.sync(skip_stats=True)
+        state = self.state()
+        newest = self.stub.commits[0]
+        self.assertEqual(state.last_commit_sha, newest['sha'])
+        self.assertEqual(format_github_timestamp(state.last_commit_at), newest['commit']['committer']['date'])
+
+        self.stub.add_commit('f' * 40, 'dave@teampulse.com', timezone.now())
+        self.stub.requests.clear()
+        self.sync(skip_stats=True)
+
+        query, headers = self.stub.requests_to(self.stub.listing_path)[0]
+        self.assertEqual(query['since'], format_github_timestamp(state.last_commit_at - timedelta(hours=24)))
+        self.assertEqual(headers['If-None-Match'], state.etag)
+        self.assertEqual(Commit.objects.count(), 8)
+        self.assertEqual(self.state().last_commit_sha, 'f' * 40)
+
+    def test_unchanged_repository_costs_one_request(self):
+        self.sync(skip_stats=True)
+        # The ETag is per listing: the first incremental run stores the one its `since` gets
+        self.sync(skip_stats=True)
+        watermark = self.state().last_commit_at
+        self.stub.requests.clear()
+
+        output = self.sync(skip_stats=True)
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertIn('304 Not Modified', output)
+        self.assertEqual(self.state().last_commit_at, watermark)
+
+    def test_full_ignores_the_sync_state(self):
+        self.sync(skip_stats=True)
+        self.stub.requests.clear()
+
+        self.sync(skip_stats=True, full=True, days=30)
+        query, headers = self.stub.requests_to(self.stub.listing_path)[0]
+        self.assertNotIn('If-None-Match', headers)
+        self.assertTrue(query['since'].startswith((timezone.now() - timedelta(days=30)).strftime('%Y-%m-%d')))
+
+    def test_failed_sync_keeps_the_watermark(self):
+        self.sync(skip_stats=True)
+        before = self.state()
+        now = timezone.now()
+        for n in range(4):
+            self.stub.add_commit(f'{n:040x}'.replace('0', 'e'), 'dave@teampulse.com', now - timedelta(minutes=n))
+
+        # Page 1 is written (one commit per INSERT), then page 2 fails
+        self.stub.failures[f'{self.stub.listing_path}?page=2'] = [(404, {})]
+        output = self.sync(skip_stats=True, batch_size=1)
+        self.assertIn('API Request Failed', output)
+        self.assertGreater(Commit.objects.count(), 7)
+        after = self.state()
+        self.assertEqual(
+            (after.last_commit_sha, after.last_commit_at, after.etag), (before.last_commit_sha, before.last_commit_at, before.etag),
+        )
+
+        # The next run starts from the old watermark again and picks up the rest
+        self.sync(skip_stats=True)
+        self.assertEqual(Commit.objects.count(), 11)
+        self.assertEqual(self.state().last_commit_sha, self.stub.commits[0]['sha'])
+
+    def test_stats_resume_after_an_interrupted_run(self):
+        self.sync(skip_stats=True)
+        self.assertEqual(Commit.objects.filter(stats_pending=True).count(), 7)
+
+        def interrupt(updated, failed):
+            raise KeyboardInterrupt
+
+        client = GitHubClient(api_url=self.stub.url)
+        self.addCleanup(client.close)
+        with self.assertRaises(KeyboardInterrupt):
+            enrich_commit_stats(client, 'acme', 'app', chunk_size=3, progress=interrupt)
+        self.assertEqual(Commit.objects.filter(stats_pending=True).count(), 4)
+
+        # One commit's details fail this time: it stays pending for the run after
+        failing = Commit.objects.filter(stats_pending=True).order_by('id').last().hash_id
+        self.stub.failures[f'{self.stub.listing_path}/{failing}'] = [(404, {})]
+        self.stub.requests.clear()
+        with self.assertLogs('core.ingest', 'WARNING'):
+            self.assertEqual(enrich_commit_stats(client, 'acme', 'app', chunk_size=3), (3, 1))
+        self.assertEqual(len(self.stub.requests), 4)  # Only the commits still pending
+        self.assertEqual(list(Commit.objects.filter(stats_pending=True).values_list('hash_id', flat=True)), [failing])
+
+        self.assertEqual(enrich_commit_stats(client, 'acme', 'app'), (1, 0))
+        additions = {commit['sha']: commit['stats']['additions'] for commit in self.stub.commits}
+        for hash_id, lines_added in Commit.objects.values_list('hash_id', 'lines_added'):
+            self.assertEqual(lines_added, additions[hash_id])
+        # The rollup saw every chunk, including the interrupted run's
+        self.assertEqual(
+            DeveloperDailyActivity.objects.aggregate(total=Sum('lines_added'))['total'], sum(additions.values()),
+        )
+
+
+class GitHubClientTests(SimpleTestCase):
+    """Retries and rate-limit pacing of GitHubClient, against a local StubGitHub."""
+
+    def setUp(self):
+        self.stub = StubGitHub()
+        self.addCleanup(self.stub.close)
+        self.client = GitHubClient(api_url=self.stub.url, backoff_base=0.01)
+        self.addCleanup(self.client.close)
+        # Record the waits instead of sleeping through them
+        patcher = mock.patch('core.github.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sleeps(self):
+        return [call.args[0] for call in self.sleep.call_args_list]
+
+    def test_retries_rate_limits_and_server_errors(self):
+        reset = time.time() + 30
+        self.stub.failures[self.stub.listing_path] = [
+            (429, {'Retry-After': '0'}),
+            (502, {}),
+            (403, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}),
+        ]
+        with self.assertLogs('core.github', 'WARNING'):
+            self.assertEqual(self.client.get(self.stub.listing_path).status_code, 200)
+        self.assertEqual(len(self.stub.requests), 4)
+
+        retry_after, backoff, until_reset = self.sleeps()
+        self.assertEqual(retry_after, 0)
+        self.assertTrue(0.02 <= backoff <= 0.03)  # Second attempt: base * 2, plus jitter
+        self.assertAlmostEqual(until_reset, 30, delta=1)  # Held back until the window resets
+
+    def test_permission_errors_are_not_retried(self):
+        self.stub.failures[self.stub.listing_path] = [(403, {})]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get(self.stub.listing_path)
+        self.assertEqual(len(self.stub.requests), 1)
+
+    def test_paces_requests_when_the_quota_runs_low(self):
+        self.stub.rate_limit = {'remaining': 5000, 'reset': time.time() + 100}
+        for _ in range(3):
+            self.client.get(self.stub.listing_path)
+        self.assertEqual(self.sleeps(), [])
+
+        # 20 left, 10 of them kept in reserve: the other 10 are spread over the 100s left
+        self.stub.rate_limit = {'remaining': 20, 'reset': time.time() + 100}
+        self.client.rate_limiter = RateLimitScheduler()
+        for _ in range(4):
+            self.client.get(self.stub.listing_path)
+        first, second = self.sleeps()
+        self.assertAlmostEqual(first, 10, delta=1)
+        self.assertAlmostEqual(second - first, 100 / 9, delta=1)
+
+
+@skipUnless(shutil.which('git'), 'Needs the git executable.')
+class GitLogTests(TestCase):
+    """iter_git_log/ingest_repository against a throwaway repository built with `git init`."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.clock = datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc)
+        self.git('init', '-q', '-b', 'main')
+
+    def git(self, *args):
+        self.clock += timedelta(minutes=10)
+        env = {
+            **os.environ, 'HOME': self.path, 'GIT_CONFIG_NOSYSTEM': '1',
+            'GIT_AUTHOR_NAME': 'Alice Johnson', 'GIT_AUTHOR_EMAIL': 'alice@teampulse.com',
+            'GIT_COMMITTER_NAME': 'Alice Johnson', 'GIT_COMMITTER_EMAIL': 'alice@teampulse.com',
+            'GIT_AUTHOR_DATE': self.clock.isoformat(), 'GIT_COMMITTER_DATE': self.clock.isoformat(),
+        }
+        subprocess.run(['git', '-C', self.path, *args], check=True, capture_output=True, env=env)
+
+    def commit(self, message, files=None):
+        for name, content in (files or {}).items():
+            mode = 'wb' if isinstance(content, bytes) else 'w'
+            with open(os.path.join(self.path, name), mode) as f:
+                f.write(content)
+        self.git('add', '-A')
+        self.git('commit', '-q', '--allow-empty', '-m', message)
+
+    def build_history(self):
+        self.commit('first', {'a.txt': 'one\ntwo\nthree\n'})
+        self.commit('binary', {'a.txt': 'one\n2\nthree\nfour\n', 'logo.bin': b'\x00\x01' * 100})
+        self.git('mv', 'a.txt', 'b.txt')
+        self.commit('rename')
+        self.commit('empty')
+        self.git('checkout', '-q', '-b', 'feature')
+        self.commit('feature', {'f.txt': 'f\n'})
+        self.git('checkout', '-q', 'main')
+        self.commit('main', {'m.txt': 'm\n'})
+        self.git('merge', '-q', '--no-ff', '-m', 'merge', 'feature')
+
+    def test_parses_numstat_renames_merges_and_empty_commits(self):
+        self.build_history()
+        commits = {commit.message: commit for commit in iter_git_log(self.path, ['HEAD'])}
+
+        self.assertEqual(set(commits), {'first', 'binary', 'rename', 'empty', 'feature', 'main', 'merge'})
+        self.assertEqual((commits['first'].lines_added, commits['first'].lines_removed), (3, 0))
+        # logo.bin is '-\t-' in numstat: only a.txt's lines count
+        self.assertEqual((commits['binary'].lines_added, commits['binary'].lines_removed), (2, 1))
+        self.assertEqual((commits['rename'].lines_added, commits['rename'].lines_removed), (0, 0))
+        self.assertEqual((commits['empty'].lines_added, commits['empty'].lines_removed), (0, 0))
+        self.assertEqual(len(commits['merge'].parents), 2)
+        self.assertEqual(len(commits['main'].parents), 1)
+        self.assertEqual(commits['first'].email, 'alice@teampulse.com')
+        self.assertEqual(commits['first'].timestamp.utcoffset(), timedelta(0))
+
+    def test_incremental_ingest_reads_only_new_commits(self):
+        self.build_history()
+        first = ingest_repository(self.path)
+        self.assertEqual((first['parsed'], first['created'], first['resumed_from']), (7, 7, None))
+        self.assertTrue(Commit.objects.get(message='merge').is_merge)
+        head = SyncState.objects.get(source='git').last_commit_sha
+
+        self.commit('later', {'l.txt': 'l\n'})
+        latest = 'latest ' + 'x' * 600  # Stored whole, as the bulk ingest path stores it
+        self.commit(latest, {'l.txt': 'l\nl\n'})
+        second = ingest_repository(self.path)
+        self.assertEqual((second['parsed'], second['created'], second['resumed_from']), (2, 2, head))
+        self.assertTrue(Commit.objects.filter(message=latest).exists())
+        self.assertEqual(ingest_repository(self.path)['parsed'], 0)
+        self.assertEqual(Commit.objects.count(), 9)
+
+    def test_rejects_paths_too_long_for_the_sync_state(self):
+        with self.assertRaises(GitError):
+            ingest_repository(os.path.join(self.path, 'x' * 255))
+
+    def test_noisy_stderr_does_not_block_the_log(self):
+        self.commit('first', {'a.txt': 'a\n'})
+        # A `git` that writes far more than a pipe buffer of warnings before its output
+        wrapper = os.path.join(self.path, 'bin')
+        os.mkdir(wrapper)
+        with open(os.path.join(wrapper, 'git'), 'w') as f:
+            f.write(f'#!/bin/sh\nhead -c 1000000 /dev/zero | tr "\\0" w >&2\nexec {shutil.which("git")} "$@"\n')
+        os.chmod(os.path.join(wrapper, 'git'), 0o755)
+
+        results = []
+        with mock.patch.dict(os.environ, {'PATH': wrapper + os.pathsep + os.environ['PATH']}):
+            reader = threading.Thread(target=lambda: results.extend(iter_git_log(self.path, ['HEAD'])), daemon=True)
+            reader.start()
+            reader.join(timeout=30)
+        self.assertFalse(reader.is_alive(), 'iter_git_log blocked on stderr')
+        self.assertEqual([commit.message for commit in results], ['first'])
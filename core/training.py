@@ -0,0 +1,371 @@
+# core/training.py
+"""Trains the burnout, productivity and collaboration models from one shared feature matrix.
+
+The matrix is read from the on-disk feature cache (see core.feature_cache), which only
+reads the events that arrived since the previous run.
+
+Each model is fitted in its own process (train_model() touches no database, so it runs
+in a plain ProcessPoolExecutor). A run writes every artifact, plus a manifest recording
+the version stamp they share, into a new release directory under MODEL_RELEASES_DIR and
+publishes them all at once by atomically repointing the `current` symlink at it. The
+serving processes' ModelRegistry picks them up through its hot reload.
+
+With search=True, each model's hyperparameters are first chosen by a k-fold grid search
+over its training split (see search_params()).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+
+from core.feature_matrix import ALL_FEATURES
+from core.ml_services import (
+    MODEL_PATHS, MODEL_RELEASES_DIR, CURRENT_RELEASE, BURNOUT_FEATURES, PRODUCTIVITY_FEATURES, COLLABORATION_FEATURES,
+    params_path, release_path,
+)
+from core.processes import init_worker
+
+MANIFEST_NAME = 'models.json'
+KEEP_RELEASES = 3  # the current release and the ones before it, for rolling back
+TEST_SIZE = 0.3
+RANDOM_STATE = 42
+ARTIFACT_MODE = 0o644
+RELEASE_MODE = 0o755
+CV_FOLDS = 5
+SEARCH_CACHE_PATH = str(getattr(settings, 'TEAMPULSE_SEARCH_CACHE_PATH', os.path.join(settings.BASE_DIR, 'var', 'search_cache.json')))
+
+
+class TrainingError(Exception):
+    pass
+
+
+# --- Placeholder targets (Y) ---
+# There is no HR data yet, so each target is derived from the features themselves.
+
+def burnout_labels(df):
+    # High risk (1) only if BOTH late work AND high load conditions are met,
+    # which keeps some developers at '0'
+    return ((df['after_hours_ratio'] > 0.3) & (df['open_tickets'] >= 10)).astype(int)
+
+
+def productivity_targets(df):
+    # Loosely based on lines changed + high-value tickets closed
+    return df['total_lines_changed'] / 50 + df['high_value_tickets_closed'] * 15
+
+
+def collaboration_classes(df):
+    # 0=Low, 1=Medium, 2=High
+    high = (df['avg_sentiment'] > 0.75) & (df['response_ratio'] > 0.6)
+    medium = (df['avg_sentiment'] > 0.5) | (df['response_ratio'] > 0.4)
+    return np.select([high, medium], [2, 1], default=0)
+
+
+def new_estimator(name):
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+
+    return {
+        'burnout': LogisticRegression,  # simple binary classification
+        'productivity': LinearRegression,
+        'collaboration': lambda: KNeighborsClassifier(n_neighbors=3),
+    }[name]()
+
+
+# model -> (features, target function, name of the test score)
+MODELS = {
+    'burnout': (BURNOUT_FEATURES, burnout_labels, 'accuracy'),
+    'productivity': (PRODUCTIVITY_FEATURES, productivity_targets, 'r2'),
+    'collaboration': (COLLABORATION_FEATURES, collaboration_classes, 'accuracy'),
+}
+
+
+# model -> grid searched with search=True (the defaults above are always among the candidates)
+PARAM_GRIDS = {
+    'burnout': {'C': [0.01, 0.1, 1.0, 10.0, 100.0], 'class_weight': [None, 'balanced']},
+    'productivity': {'fit_intercept': [True, False], 'positive': [False, True]},
+    # Uniform weights only: that is what the NumPy export serves
+    'collaboration': {'n_neighbors': [1, 3, 5, 7, 9, 15]},
+}
+
+
+def training_data(name, feature_matrix):
+    """Returns (X, y) of model `name` from build_feature_matrix()'s DataFrame."""
+    features, target, _ = MODELS[name]
+    X = feature_matrix[features]
+    return X, np.asarray(target(X))
+
+
+def shared_features(name, features):
+    """X of model `name` as a view of `features` (columns ALL_FEATURES) rather than a copy.
+
+    A slice of the feature cache's np.memmap (see load_features()) is still an np.memmap,
+    which joblib hands to its workers by file name; other large arrays it first dumps to
+    a temporary file of its own.
+    """
+    columns = [ALL_FEATURES.index(feature) for feature in MODELS[name][0]]
+    if columns == list(range(columns[0], columns[-1] + 1)):
+        return features[:, columns[0]:columns[-1] + 1]
+    return features[:, columns]  # Not adjacent: a copy
+
+
+def _split(rows):
+    """Row indices of train_model()'s train/test split (it only depends on the row count)."""
+    from sklearn.model_selection import train_test_split
+    return train_test_split(np.arange(rows), test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+
+def _search_key(name, X, y):
+    import sklearn
+
+    digest = hashlib.sha256()
+    for part in (name, sklearn.__version__, CV_FOLDS, RANDOM_STATE, TEST_SIZE, json.dumps(PARAM_GRIDS[name], sort_keys=True)):
+        digest.update(str(part).encode() + b'\0')
+    digest.update(np.ascontiguousarray(X, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def search_params(name, X, y, n_jobs=-1):
+    """Picks model `name`'s parameters by a k-fold grid search over its training split.
+
+    The folds are index sets into the full X, so X itself is never sliced (and copied)
+    before it reaches the joblib workers. The winner is cached in SEARCH_CACHE_PATH under
+    a hash of the data, the grid and the scikit-learn version: unchanged data skips the
+    search. Returns a report with 'params', 'cv_score' and 'cached'.
+    """
+    from sklearn.base import is_classifier
+    from sklearn.model_selection import GridSearchCV, KFold, StratifiedKFold
+
+    key = _search_key(name, X, y)
+    cache = _read_json(SEARCH_CACHE_PATH)
+    if cache.get(name, {}).get('key') == key:
+        return {**cache[name], 'cached': True}
+
+    started = time.perf_counter()
+    estimator = new_estimator(name)
+    train_rows, _ = _split(len(y))
+    folds = (StratifiedKFold if is_classifier(estimator) else KFold)(
+        n_splits=CV_FOLDS, shuffle=True, random_state=RANDOM_STATE,
+    )
+    cv = [(train_rows[fit], train_rows[score]) for fit, score in folds.split(train_rows, y[train_rows])]
+    # Candidates that cannot fit the data (e.g. more neighbors than rows) just score NaN and lose
+    search = GridSearchCV(estimator, PARAM_GRIDS[name], cv=cv, n_jobs=n_jobs, refit=False)
+    search.fit(X, y)
+
+    result = {
+        'key': key,
+        'params': search.best_params_,
+        'cv_score': float(search.best_score_),
+        'candidates': len(search.cv_results_['params']),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    os.makedirs(os.path.dirname(SEARCH_CACHE_PATH), exist_ok=True)
+    _write_json(SEARCH_CACHE_PATH, {**_read_json(SEARCH_CACHE_PATH), name: result})
+    return {**result, 'cached': False}
+
+
+def _temp_path(path):
+    """A new temporary file next to `path` (same filesystem, so os.replace() is atomic)."""
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(handle)
+    os.chmod(temp_path, ARTIFACT_MODE)  # mkstemp() creates it owner-only; serving may run as another user
+    return temp_path
+
+
+def train_model(name, X, y, version, release, params=None):
+    """Fits model `name` (with `params`, if given) on a train/test split and writes its
+    artifacts to the (not yet published) `release` directory.
+
+    Returns a report with the test score and the fit time.
+    """
+    from joblib import dump
+    from sklearn.model_selection import train_test_split
+    from core.numpy_models import export_model_params
+
+    started = time.perf_counter()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    model = new_estimator(name).set_params(**(params or {}))
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    test_score = float(model.score(X_test, y_test))
+
+    path = MODEL_PATHS[name]
+    dump(model, release_path(path, release))
+    export_model_params(model, MODELS[name][0], release_path(params_path(path), release), version=version)
+
+    return {
+        'model': name,
+        'rows': len(y),
+        MODELS[name][2]: test_score,
+        'params': params or {},
+        'fit_seconds': round(fit_seconds, 3),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def _write_json(path, data):
+    temp_path = _temp_path(path)
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def train_all(models=None, workers=None, progress=None, use_cache=True, search=False):
+    """Builds the feature matrix once, trains `models` (default: all) in parallel and publishes them.
+
+    With use_cache=False the matrix is built straight from the database, bypassing the cache.
+    With search=True each model's parameters come from search_params() first; the searches
+    run one model at a time, each using every core.
+
+    Models not retrained are carried over from the current release. Nothing is published
+    unless every model trained (otherwise the first error is raised), and then everything at
+    once: a crash at any point leaves the previous release serving. Returns the manifest.
+    Raises TrainingError if there is not enough data.
+    """
+    from core.feature_cache import update_feature_cache, load_entry, load_features
+    from core.feature_matrix import build_feature_matrix
+
+    models = list(models or MODELS)
+    now = datetime.now(timezone.utc)
+    version = now.strftime('%Y%m%dT%H%M%SZ')
+    release = os.path.join(MODEL_RELEASES_DIR, f'{version}-{now:%f}')  # Names sort by age
+
+    started = time.perf_counter()
+    if use_cache:
+        path, cache_state = update_feature_cache()
+        feature_matrix, features = load_entry(path), load_features(path)
+    else:
+        cache_state = 'not cached'
+        feature_matrix = build_feature_matrix()
+        features = feature_matrix.to_numpy()
+    feature_seconds = time.perf_counter() - started
+    if len(feature_matrix) < 2:
+        raise TrainingError('Not enough data to train the models. Need at least two developers.')
+    if progress:
+        progress(f'Features for {len(feature_matrix)} developers ({cache_state}) in {feature_seconds:.2f}s.')
+
+    searches = {}
+    if search:
+        for name in models:
+            _, y = training_data(name, feature_matrix)
+            searches[name] = search_params(name, shared_features(name, features), y)
+            if progress:
+                found = searches[name]
+                how = 'cached' if found['cached'] else f"{found['candidates']} candidates in {found['seconds']:.2f}s"
+                progress(f"{name}: best {found['params']}, cv {MODELS[name][2]} {found['cv_score']:.2f} ({how}).")
+
+    # A hidden directory until it is complete, then renamed to `release`
+    os.makedirs(MODEL_RELEASES_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=MODEL_RELEASES_DIR, prefix=f'.{os.path.basename(release)}.')
+    try:
+        workers = min(workers or os.cpu_count() or 1, len(models))
+        jobs = [
+            (name, *training_data(name, feature_matrix), version, staging, searches.get(name, {}).get('params'))
+            for name in models
+        ]
+        if workers == 1:
+            outcomes = [_outcome(lambda job=job: train_model(*job)) for job in jobs]
+        else:
+            # Workers open their own database connections (if they ever need one)
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+                futures = [executor.submit(train_model, *job) for job in jobs]
+                outcomes = [_outcome(future.result) for future in futures]
+
+        errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+        if errors:
+            raise errors[0]
+
+        for name in MODELS.keys() - set(models):
+            _carry_over(name, staging)
+
+        manifest = read_manifest()
+        manifest.update({
+            'version': version,
+            'release': os.path.basename(release),
+            'developers': len(feature_matrix),
+            'feature_seconds': round(feature_seconds, 3),
+            'feature_cache': cache_state,
+            'total_seconds': round(time.perf_counter() - started, 3),
+        })
+        # Models not retrained this time keep their previous entry (and version)
+        manifest.setdefault('models', {}).update({
+            report['model']: {
+                'version': version,
+                **{key: value for key, value in report.items() if key != 'model'},
+                **({'cv_score': searches[report['model']]['cv_score']} if report['model'] in searches else {}),
+            }
+            for report in outcomes
+        })
+        with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.chmod(staging, RELEASE_MODE)  # mkdtemp() creates it owner-only; serving may run as another user
+        os.rename(staging, release)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _publish(release)
+    _prune_releases()
+    return manifest
+
+
+def _outcome(get_report):
+    try:
+        return get_report()
+    except Exception as e:
+        return e
+
+
+def _carry_over(name, release):
+    """Links model `name`'s artifacts from the current release (if it has them) into `release`."""
+    for path in (MODEL_PATHS[name], params_path(MODEL_PATHS[name])):
+        try:
+            os.link(release_path(path, CURRENT_RELEASE), release_path(path, release))
+        except FileNotFoundError:
+            pass  # never trained: the registry falls back to the shipped artifact
+
+
+def _publish(release):
+    """Points CURRENT_RELEASE at `release` with one atomic rename."""
+    link = f'{CURRENT_RELEASE}.{os.getpid()}.tmp'
+    os.symlink(os.path.basename(release), link)  # relative, so the releases directory can move
+    try:
+        os.replace(link, CURRENT_RELEASE)
+    except BaseException:
+        os.remove(link)
+        raise
+
+
+def _prune_releases():
+    """Deletes all but the KEEP_RELEASES newest releases (never the current one)."""
+    current = os.path.realpath(CURRENT_RELEASE)
+    releases = sorted(
+        entry.path for entry in os.scandir(MODEL_RELEASES_DIR)
+        if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+    )
+    for release in releases[:-KEEP_RELEASES]:
+        if os.path.realpath(release) != current:
+            shutil.rmtree(release, ignore_errors=True)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def read_manifest():
+    """Returns the manifest of the current release ({} if nothing was published yet)."""
+    return _read_json(os.path.join(CURRENT_RELEASE, MANIFEST_NAME))
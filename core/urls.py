@@ -1,7 +1,7 @@
 # core/urls.py
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import DeveloperViewSet, CommitViewSet, JiraTicketViewSet, ChatDataViewSet, BurnoutRiskView, ProductivityScoreView, CollaborationScoreView
+from .views import DeveloperViewSet, CommitViewSet, JiraTicketViewSet, ChatDataViewSet, BurnoutRiskView, ProductivityScoreView, CollaborationScoreView, AsyncScoreView, TeamScoresView, ModelStatusView, ExportView, BulkIngestView
 
 router = DefaultRouter()
 router.register(r'developers', DeveloperViewSet)
@@ -16,4 +16,12 @@ urlpatterns += [
     path('burnout/<int:pk>/', BurnoutRiskView.as_view(), name='burnout-risk'),
     path('productivity/<int:pk>/', ProductivityScoreView.as_view(), name='productivity-score'),
     path('collaboration/<int:pk>/', CollaborationScoreView.as_view(), name='collaboration-score'),
+    # ASGI versions of the three score endpoints
+    path('async/burnout/<int:pk>/', AsyncScoreView.as_view(model_name='burnout'), name='async-burnout-risk'),
+    path('async/productivity/<int:pk>/', AsyncScoreView.as_view(model_name='productivity'), name='async-productivity-score'),
+    path('async/collaboration/<int:pk>/', AsyncScoreView.as_view(model_name='collaboration'), name='async-collaboration-score'),
+    path('scores/', TeamScoresView.as_view(), name='team-scores'),
+    path('models/', ModelStatusView.as_view(), name='model-status'),
+    path('export/<slug:kind>.<slug:fmt>', ExportView.as_view(), name='export'),
+    path('ingest/<slug:kind>/', BulkIngestView.as_view(), name='bulk-ingest'),
 ]
\ No newline at end of file
@@ -1,12 +1,25 @@
 # Create your views here.
 # core/views.py
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.db import DatabaseError, connection
+from django.views import View
+from django.utils.http import parse_etags
 from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from .models import Developer, Commit, JiraTicket, ChatData
 from .serializers import DeveloperSerializer, CommitSerializer, JiraTicketSerializer, ChatDataSerializer
-from .ml_services import get_burnout_risk, calculate_single_developer_features, get_productivity_score, calculate_productivity_features, get_collaboration_score, calculate_collaboration_features
+from .bulk_ingest import SCHEMAS, MAX_BATCH_SIZE, ingest_batch
+from .exports import EXPORTS, FORMATS, parse_time_bound, stream_export
+from .metrics import registry as metrics_registry
+from .pagination import KeysetPagination
+from .parsers import NDJSONParser
+from .ml_services import model_registry, warm_up
+from .score_cache import developer_score, adeveloper_score, team_scores, score_etag, team_etag
 
 class DeveloperViewSet(viewsets.ModelViewSet):
     """
@@ -15,84 +28,250 @@ class DeveloperViewSet(viewsets.ModelViewSet):
     queryset = Developer.objects.all().order_by('name')
     serializer_class = DeveloperSerializer
 
+class EventCursorPagination(KeysetPagination):
+    """Keyset pagination for the event lists: every page costs one index range scan, however deep.
+
+    The cursor holds both the time and the id of the last row, so rows sharing a timestamp are
+    neither skipped nor repeated, even when rows are added or removed between requests.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = ('-timestamp', '-id')
+
+
+class TicketCursorPagination(EventCursorPagination):
+    ordering = ('-created_at', '-id')
+
+
 class CommitViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows Commits to be viewed or edited.
     """
-    queryset = Commit.objects.all().order_by('-timestamp')
+    # developer_name is read from the join instead of one query per row
+    queryset = Commit.objects.select_related('developer').order_by('-timestamp', '-id')
     serializer_class = CommitSerializer
+    pagination_class = EventCursorPagination
 
 
 class JiraTicketViewSet(viewsets.ModelViewSet):
-    queryset = JiraTicket.objects.all().order_by('-created_at')
+    queryset = JiraTicket.objects.select_related('assignee').order_by('-created_at', '-id')
     serializer_class = JiraTicketSerializer
+    pagination_class = TicketCursorPagination
 
 
 class ChatDataViewSet(viewsets.ModelViewSet):
-    queryset = ChatData.objects.all().order_by('-timestamp')
+    queryset = ChatData.objects.select_related('sender').order_by('-timestamp', '-id')
     serializer_class = ChatDataSerializer
+    pagination_class = EventCursorPagination
+
+
+def etag_matches(request, etag):
+    """True if the request's If-None-Match names `etag` (weak comparison, as RFC 9110 asks for)."""
+    header = request.headers.get('If-None-Match')
+    if not header or etag is None:
+        return False
+    candidates = [tag.removeprefix('W/') for tag in parse_etags(header)]
+    return '*' in candidates or etag in candidates
+
 
+def with_etag(response, etag):
+    if etag is not None:
+        response['ETag'] = etag
+        # Let clients keep the payload but revalidate it on every use
+        response['Cache-Control'] = 'private, no-cache'
+    return response
 
-class BurnoutRiskView(APIView):
+
+class ScoreView(APIView):
     """
-    API endpoint that dynamically calculates features and gets the ML prediction.
-    URL: /api/v1/burnout/<int:pk>/
+    Base for the per-developer score endpoints: answers If-None-Match with 304 before
+    computing anything, otherwise serves the (cached) score with a strong ETag.
     """
+    model_name = None
+
     def get(self, request, pk, format=None):
-        
-        # 1. DYNAMICALLY AGGREGATE THE REAL FEATURES FOR THE GIVEN DEVELOPER (pk)
-        developer_features = calculate_single_developer_features(pk)
-        
-        if developer_features is None:
-            return Response({'error': f'Developer with ID {pk} not found.'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # 2. Get the prediction
-        result, status_code = get_burnout_risk(developer_features)
+        etag = score_etag(self.model_name, pk, request.accepted_media_type)
+        if etag_matches(request, etag):
+            return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+        # Features and prediction for the given developer (pk), served from the score cache
+        # until the developer's data or the model changes
+        result, status_code = developer_score(self.model_name, pk)
 
+        if status_code == 404:
+            return Response({'error': f'Developer with ID {pk} not found.'}, status=status.HTTP_404_NOT_FOUND)
         if status_code != 200:
             return Response(result, status=status_code)
-        
-        # Add the features back into the response for transparency (optional)
-        result['features'] = developer_features
-        
-        return Response(result, status=status.HTTP_200_OK)
+
+        # The result carries the features back for transparency
+        return with_etag(Response(result, status=status.HTTP_200_OK), etag)
 
 
-class ProductivityScoreView(APIView):
+class BurnoutRiskView(ScoreView):
+    """
+    API endpoint that dynamically calculates features and gets the ML prediction.
+    URL: /api/v1/burnout/<int:pk>/
+    """
+    model_name = 'burnout'
+
+
+class ProductivityScoreView(ScoreView):
     """
     API endpoint to get the productivity score for a specific developer.
     URL: /api/v1/productivity/<int:pk>/
     """
-    def get(self, request, pk, format=None):
-        developer_features = calculate_productivity_features(pk)
+    model_name = 'productivity'
+
 
-        if developer_features is None:
-             return Response({'error': f'Developer with ID {pk} not found.'}, status=status.HTTP_404_NOT_FOUND)
+class CollaborationScoreView(ScoreView):
+    """
+    API endpoint to get the collaboration score for a specific developer.
+    URL: /api/v1/collaboration/<int:pk>/
+    """
+    model_name = 'collaboration'
+
+
+class AsyncScoreView(View):
+    """
+    Async (ASGI) version of ScoreView: the feature queries run concurrently, each on its own
+    connection, and inference in a bounded thread pool, so one worker can serve many requests at once.
+    URL: /api/v1/async/<burnout|productivity|collaboration>/<int:pk>/
+    """
+    model_name = None
 
-        result, status_code = get_productivity_score(developer_features)
+    async def get(self, request, pk):
+        # Not the DRF renderer's bytes, so not the same representation (and ETag) as ScoreView's
+        etag = await sync_to_async(score_etag, thread_sensitive=False)(self.model_name, pk, 'async')
+        if etag_matches(request, etag):
+            return with_etag(HttpResponseNotModified(), etag)
 
+        result, status_code = await adeveloper_score(self.model_name, pk)
+
+        if status_code == 404:
+            return JsonResponse({'error': f'Developer with ID {pk} not found.'}, status=status.HTTP_404_NOT_FOUND)
         if status_code != 200:
-            return Response(result, status=status_code)
+            return JsonResponse(result, status=status_code)
+        return with_etag(JsonResponse(result), etag)
 
-        result['features'] = developer_features
-        return Response(result, status=status.HTTP_200_OK)
 
+class TeamScoresPagination(PageNumberPagination):
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 5000
 
-class CollaborationScoreView(APIView):
+
+class TeamScoresView(APIView):
     """
-    API endpoint to get the collaboration score for a specific developer.
-    URL: /api/v1/collaboration/<int:pk>/
+    API endpoint that scores a whole team (burnout, productivity and collaboration) in one request.
+    URL: /api/v1/scores/?ids=1,2,3&page=1&page_size=100
     """
-    def get(self, request, pk, format=None):
-        developer_features = calculate_collaboration_features(pk)
+    pagination_class = TeamScoresPagination
+
+    def get(self, request, format=None):
+        developers = Developer.objects.all().order_by('name', 'id')
+
+        # Optional filter on a comma-separated list of developer IDs
+        ids_param = request.query_params.get('ids')
+        if ids_param:
+            try:
+                developer_ids = [int(dev_id) for dev_id in ids_param.split(',') if dev_id.strip()]
+            except ValueError:
+                return Response({'error': 'ids must be a comma-separated list of integers.'}, status=status.HTTP_400_BAD_REQUEST)
+            developers = developers.filter(pk__in=developer_ids)
 
-        if developer_features is None:
-             return Response({'error': f'Developer with ID {pk} not found.'}, status=status.HTTP_404_NOT_FOUND)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(developers.values('id', 'name'), request, view=self)
 
-        result, status_code = get_collaboration_score(developer_features)
+        # The page itself is cheap (count + one page of names); the scores are what a 304 saves
+        etag = team_etag(page, paginator.page.paginator.count, request.get_full_path() + request.accepted_media_type)
+        if etag_matches(request, etag):
+            return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+        scores, status_code = team_scores([dev['id'] for dev in page])
 
         if status_code != 200:
-            return Response(result, status=status_code)
+            return Response(scores, status=status_code)
+
+        results = [
+            {'developer_id': dev['id'], 'name': dev['name'], **scores[dev['id']]}
+            for dev in page
+        ]
+        return with_etag(paginator.get_paginated_response(results), etag)
+
+
+class ModelStatusView(APIView):
+    """
+    API endpoint that reports which model versions this process has loaded.
+    URL: /api/v1/models/
+    """
+    def get(self, request, format=None):
+        return Response(model_registry.status(), status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """
+    API endpoint that streams a whole table as NDJSON or CSV, with flat memory use.
+    URL: /api/v1/export/<commits|tickets|chat>.<ndjson|csv>?since=2025-01-01&until=2025-02-01&developer=1
+    """
+    def get(self, request, kind, fmt):
+        if kind not in EXPORTS or fmt not in FORMATS:
+            return Response(
+                {'error': f"Unknown export '{kind}.{fmt}'. Use one of {sorted(EXPORTS)} as .ndjson or .csv."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        filters = {}
+        try:
+            for bound in ('since', 'until'):
+                if request.query_params.get(bound):
+                    filters[bound] = parse_time_bound(request.query_params[bound])
+            if request.query_params.get('developer'):
+                filters['developer_id'] = int(request.query_params['developer'])
+        except ValueError as e:
+            return Response({'error': f'Invalid filter: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(stream_export(kind, fmt, **filters), content_type=FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+
+class BulkIngestView(APIView):
+    """
+    API endpoint that validates and upserts thousands of events per request.
+    URL: /api/v1/ingest/<commits|tickets|chat>/ (JSON array or NDJSON body)
+    """
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request, kind, format=None):
+        if kind not in SCHEMAS:
+            return Response({'error': f"Unknown kind '{kind}'. Use one of {sorted(SCHEMAS)}."}, status=status.HTTP_404_NOT_FOUND)
+
+        records = request.data
+        if not isinstance(records, list):
+            return Response({'error': 'Body must be a JSON array or NDJSON.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(records) > MAX_BATCH_SIZE:
+            return Response(
+                {'error': f'At most {MAX_BATCH_SIZE} records per request; got {len(records)}.'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        return Response(ingest_batch(kind, records), status=status.HTTP_200_OK)
+
+def readiness_view(request):
+    """Readiness probe: 200 once the database answers and every model is loaded (loading them if needed)."""
+    checks = {'database': True, 'untrained_models': []}
+    try:
+        connection.ensure_connection()
+    except DatabaseError:
+        checks['database'] = False
+    checks['untrained_models'] = warm_up()
+
+    ready = checks['database'] and not checks['untrained_models']
+    return JsonResponse({'ready': ready, **checks, 'models': model_registry.status()}, status=200 if ready else 503)
+
 
-        result['features'] = developer_features
-        return Response(result, status=status.HTTP_200_OK)
\ No newline at end of file
+def metrics_view(request):
+    """Prometheus scrape endpoint: request, SQL and model timings of this process."""
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
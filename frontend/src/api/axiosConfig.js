@@ -9,4 +9,15 @@ const api = axios.create({
   },
 });
 
-export default api;
\ No newline at end of file
+// Fetches every developer's scores from the batch endpoint, page by page (following `next`)
+export const fetchTeamScores = async (pageSize = 1000) => {
+  let response = await api.get('/scores/', { params: { page_size: pageSize } });
+  const results = [...response.data.results];
+  while (response.data.next) {
+    response = await api.get(response.data.next);
+    results.push(...response.data.results);
+  }
+  return results;
+};
+
+export default api;
@@ -1,6 +1,6 @@
 // frontend/src/components/DeveloperList.js
 import React, { useState, useEffect } from 'react';
-import api from '../api/axiosConfig';
+import { fetchTeamScores } from '../api/axiosConfig';
 
 const DeveloperList = () => {
   const [developers, setDevelopers] = useState([]);
@@ -11,21 +11,12 @@ const DeveloperList = () => {
   useEffect(() => {
     const fetchTeamData = async () => {
       try {
-        // 1. Fetch the list of all developers
-        const devResponse = await api.get('/developers/');
-        const devList = devResponse.data;
-        setDevelopers(devList);
+        // Fetch every developer's scores from the batch endpoint (all pages)
+        const scoreResults = await fetchTeamScores();
+        setDevelopers(scoreResults.map(row => ({ id: row.developer_id, name: row.name })));
 
-        // 2. Fetch the Burnout Risk for EACH developer
-        const riskPromises = devList.map(dev => 
-          api.get(`/burnout/${dev.id}/`) // Fetch prediction from new endpoint
-            .then(res => ({ id: dev.id, risk: res.data }))
-            .catch(() => ({ id: dev.id, risk: { risk_level: 'Error', risk_score: 'N/A' } })) // Handle API errors
-        );
-        
-        const riskResults = await Promise.all(riskPromises);
-        const risksMap = riskResults.reduce((acc, curr) => {
-          acc[curr.id] = curr.risk;
+        const risksMap = scoreResults.reduce((acc, curr) => {
+          acc[curr.developer_id] = curr.burnout;
           return acc;
         }, {});
         
@@ -1,6 +1,6 @@
 // frontend/src/pages/CollaborationPage.js
 import React, { useState, useEffect } from 'react';
-import api from '../api/axiosConfig';
+import { fetchTeamScores } from '../api/axiosConfig';
 import CollaborationPie from '../components/CollaborationPie'; // <-- Import the new component
 
 const CollaborationPage = () => {
@@ -13,20 +13,12 @@ const CollaborationPage = () => {
   useEffect(() => {
     const fetchTeamData = async () => {
       try {
-        const devResponse = await api.get('/developers/');
-        const devList = devResponse.data;
-        setDevelopers(devList);
-
-        // Fetch the Collaboration Score for EACH developer
-        const scorePromises = devList.map(dev => 
-          api.get(`/collaboration/${dev.id}/`)
-            .then(res => ({ id: dev.id, scoreData: res.data }))
-            .catch(() => ({ id: dev.id, scoreData: { status: 'Error', score: 'N/A' } })) 
-        );
-
-        const scoreResults = await Promise.all(scorePromises);
+        // Fetch every developer's scores from the batch endpoint (all pages)
+        const scoreResults = await fetchTeamScores();
+        setDevelopers(scoreResults.map(row => ({ id: row.developer_id, name: row.name })));
+
         const scoresMap = scoreResults.reduce((acc, curr) => {
-          acc[curr.id] = curr.scoreData;
+          acc[curr.developer_id] = curr.collaboration;
           return acc;
         }, {});
 
@@ -35,7 +27,7 @@ const CollaborationPage = () => {
 
         // Calculate status counts for the pie chart
         const counts = scoreResults.reduce((acc, curr) => {
-          const status = curr.scoreData.status || 'Error';
+          const status = curr.collaboration.status || 'Error';
           acc[status] = (acc[status] || 0) + 1;
           return acc;
         }, {});
@@ -1,6 +1,6 @@
 // frontend/src/pages/ProductivityPage.js
 import React, { useState, useEffect } from 'react';
-import api from '../api/axiosConfig';
+import { fetchTeamScores } from '../api/axiosConfig';
 import ProductivityBar from '../components/ProductivityBar'; // <-- Import the new component
 
 const ProductivityPage = () => {
@@ -12,20 +12,12 @@ const ProductivityPage = () => {
   useEffect(() => {
     const fetchTeamData = async () => {
       try {
-        const devResponse = await api.get('/developers/');
-        const devList = devResponse.data;
-        setDevelopers(devList);
+        // Fetch every developer's scores from the batch endpoint (all pages)
+        const scoreResults = await fetchTeamScores();
+        setDevelopers(scoreResults.map(row => ({ id: row.developer_id, name: row.name })));
 
-        // Fetch the Productivity Score for EACH developer
-        const scorePromises = devList.map(dev => 
-          api.get(`/productivity/${dev.id}/`) // Fetch prediction from new endpoint
-            .then(res => ({ id: dev.id, scoreData: res.data }))
-            .catch(() => ({ id: dev.id, scoreData: { score: 'N/A', status: 'Error' } })) 
-        );
-
-        const scoreResults = await Promise.all(scorePromises);
         const scoresMap = scoreResults.reduce((acc, curr) => {
-          acc[curr.id] = curr.scoreData;
+          acc[curr.developer_id] = curr.productivity;
           return acc;
         }, {});
 
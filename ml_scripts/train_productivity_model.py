@@ -8,71 +8,33 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(PROJECT_ROOT)
 
 import django
-import pandas as pd
-from datetime import datetime, timedelta
-import pytz
 
 # --- Django Setup (Crucial for external scripts) ---
 # Set the DJANGO_SETTINGS_MODULE environment variable
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'teampulse_backend.settings')
 django.setup()
 
-# Now we can import our models
-from core.models import Developer, Commit, JiraTicket 
-from core.ml_services import calculate_productivity_features
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-from joblib import dump
-
-# Define standard work hours for features
-TIMEZONE = pytz.timezone('UTC')  # Adjust this to your local timezone if needed
+# Features, targets and training live in core.training
+# (`python manage.py train_all` trains all three models at once)
+from core.ml_services import MODEL_RELEASES_DIR
+from core.training import TrainingError, train_all
 # --- End Django Setup ---
 
 print("Django environment successfully loaded.")
 
 
-def generate_developer_productivity_data():
-    """Pulls productivity features and creates a placeholder target Y."""
-    developers = Developer.objects.all()
-    data_list = []
-    for dev in developers:
-        features = calculate_productivity_features(dev.id)
-        if features:
-            # Placeholder Y: Assign a Y value based on features for training
-            # The score is loosely based on lines changed + tickets closed * 5
-            raw_score = features['total_lines_changed'] / 50 + features['high_value_tickets_closed'] * 15
-
-            data_list.append({
-                **features,  # Spread the features into the dictionary
-                'productivity_score_target': raw_score  # Y value
-            })
-    return pd.DataFrame(data_list)
-
-
 def train_and_save_productivity_model():
-    df = generate_developer_productivity_data()
-
-    if df.empty or len(df) < 2:
-        print("Not enough data to train the productivity model.")
+    """Trains the productivity model and saves it to a joblib file."""
+    try:
+        manifest = train_all(['productivity'], workers=1)
+    except TrainingError as e:
+        print(e)
         return
 
-    features = ['total_lines_changed', 'high_value_tickets_closed']
-    X = df[features]
-    Y = df['productivity_score_target']
-
-    X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.3, random_state=42)
-
-    model = LinearRegression()  # Use Linear Regression
-    model.fit(X_train, Y_train)
-
-    model_filename = 'ml_scripts/productivity_score_model.joblib'
-    dump(model, model_filename)
-    print(f"\n✅ Productivity Score Model trained and saved to {model_filename}")
-
-    score = model.score(X_test, Y_test)
-    print(f"Model R-squared Score: {score:.2f}")
+    report = manifest['models']['productivity']
+    print(f"\n✅ Productivity Score Model trained and saved to {os.path.join(MODEL_RELEASES_DIR, manifest['release'])}")
+    print(f"Model R-squared Score: {report['r2']:.2f}")
 
 
 if __name__ == '__main__':
     train_and_save_productivity_model()
-
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',  # First, so latency covers the whole stack
     'corsheaders.middleware.CorsMiddleware',  # Add CORS middleware at the top
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -85,6 +86,64 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'scores' holds computed features and model scores (see core/score_cache.py). A write
+# invalidates its developer's scores in this cache, so every worker process must share it:
+# the file cache is shared by the processes of one host; set TEAMPULSE_REDIS_URL to share it
+# between hosts. A per-process LocMemCache is refused (see core/checks.py) once
+# WEB_CONCURRENCY asks for more than one worker.
+# Eviction is not LRU: entries expire after TIMEOUT, and once MAX_ENTRIES files exist the
+# file cache deletes a random 1/CULL_FREQUENCY (default 1/3) of them, whatever their use.
+# Size MAX_ENTRIES above one generation token per developer (they never expire) plus the
+# scores written per TIMEOUT. Redis evicts according to its own maxmemory-policy.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'scores': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['TEAMPULSE_REDIS_URL'],
+        'TIMEOUT': 300,  # seconds
+    } if os.environ.get('TEAMPULSE_REDIS_URL') else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'score_cache',
+        'TIMEOUT': 300,  # seconds
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# The tests get a score cache of their own (see teampulse_backend/test_runner.py)
+TEST_RUNNER = 'teampulse_backend.test_runner.TestRunner'
+
+TEAMPULSE_SCORE_CACHE = 'scores'
+
+# Load the ML models when the app starts instead of on the first score request
+# (set TEAMPULSE_WARM_UP=1 for serving processes)
+TEAMPULSE_WARM_UP = os.environ.get('TEAMPULSE_WARM_UP') == '1'
+
+# Threads running model inference for the async score views (per process)
+TEAMPULSE_INFERENCE_WORKERS = 4
+
+# Coalesce concurrent single-developer predictions into one vectorized call per model:
+# waits up to BATCH_WAIT seconds for up to BATCH_SIZE rows (only when others are queued).
+# Off by default; worth enabling for processes serving many concurrent score requests.
+TEAMPULSE_INFERENCE_BATCHING = os.environ.get('TEAMPULSE_INFERENCE_BATCHING') == '1'
+TEAMPULSE_INFERENCE_BATCH_SIZE = 64
+TEAMPULSE_INFERENCE_BATCH_WAIT = 0.005
+
+# Where the training feature matrix is cached as memory-mapped .npy files
+TEAMPULSE_FEATURE_CACHE_DIR = BASE_DIR / 'var' / 'feature_cache'
+
+# Winning hyperparameters of `train_all --search`, reused while the training data is unchanged
+TEAMPULSE_SEARCH_CACHE_PATH = BASE_DIR / 'var' / 'search_cache.json'
+
+# Models published by `train_all`: one directory per run, and a `current` symlink to the one
+# being served (the artifacts in ml_scripts/ are the fallback until the first run)
+TEAMPULSE_MODEL_RELEASES_DIR = BASE_DIR / 'var' / 'models'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,32 @@
+# teampulse_backend/test_runner.py
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Runs the tests against an empty score cache in a temporary directory, so scores cached
+    by a development server (for developer IDs the test database reuses) never leak in.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.score_cache_dir = tempfile.mkdtemp(prefix='teampulse-score-cache-')
+        alias = getattr(settings, 'TEAMPULSE_SCORE_CACHE', 'default')
+        self.score_cache_settings = override_settings(CACHES={
+            **settings.CACHES,
+            alias: {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.score_cache_dir,
+                'TIMEOUT': 300,
+            },
+        })
+        self.score_cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.score_cache_settings.disable()
+        shutil.rmtree(self.score_cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -18,9 +18,14 @@ Including another URLconf
 # teampulse_backend/urls.py
 from django.contrib import admin
 from django.urls import path, include 
+from core.views import metrics_view, readiness_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     # Add a primary API route for our core application
     path('api/v1/', include('core.urls')), 
+    # Prometheus metrics (latency, SQL and model timings)
+    path('metrics', metrics_view, name='metrics'),
+    # Readiness probe for load balancers (models loaded, database reachable)
+    path('ready', readiness_view, name='ready'),
 ]
\ No newline at end of file